@@ -0,0 +1,111 @@
+"""
+Connection graph backends compared on a hotel layout.
+
+For each backend of src.model.repository.connection_graph, reports:
+    - the import time of its module dependencies, measured in a fresh interpreter,
+    - the traced memory of the graph holding the connections of the hotel,
+    - the load time of HotelRepository built with that backend,
+    - the cost per operation of the calls HotelRepository makes: add_edge, degree, edges(node) and remove_edges_from.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_connection_graph [--floors 100] [--rooms-per-side 20] [--repeat 3]
+"""
+
+import argparse
+import gc
+import sqlite3
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from benchmarks.bench_hotel_load import build_hotel
+from src.model.repository.connection_graph import GRAPH_BACKENDS, create_graph
+from src.model.repository.hotel_repository import HotelRepository
+
+
+IMPORTS = {
+    "networkx": "import networkx",
+    "adjacency": "pass",
+}
+
+
+def import_time(statement: str) -> float:
+    """Seconds taken by statement in a fresh interpreter."""
+    script = f"import time\nstarted = time.perf_counter()\n{statement}\nprint(time.perf_counter() - started)"
+    return float(subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout)
+
+
+def graph_memory(backend: str, nodes: list[int], edges: list[tuple[int, int]]) -> float:
+    """Traced bytes of a graph of the backend holding the given nodes and edges."""
+    create_graph(backend)  # Imports the backend dependencies outside the traced section
+    gc.collect()
+    tracemalloc.start()
+    graph = create_graph(backend)
+    graph.add_nodes_from(nodes)
+    graph.add_edges_from(edges)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del graph
+    return current
+
+
+def per_operation(backend: str, nodes: list[int], edges: list[tuple[int, int]]) -> dict[str, float]:
+    """Nanoseconds per call of each graph operation on a graph holding the hotel connections."""
+    graph = create_graph(backend)
+    graph.add_nodes_from(nodes)
+    timings = {}
+
+    started = time.perf_counter()
+    for u, v in edges:
+        graph.add_edge(u, v)
+    timings["add_edge"] = (time.perf_counter() - started) / len(edges)
+
+    started = time.perf_counter()
+    for node in nodes:
+        graph.degree(node)
+    timings["degree"] = (time.perf_counter() - started) / len(nodes)
+
+    started = time.perf_counter()
+    node_edges = [graph.edges(node) for node in nodes]
+    timings["edges(node)"] = (time.perf_counter() - started) / len(nodes)
+
+    started = time.perf_counter()
+    for edges_of_node in node_edges:
+        graph.remove_edges_from(edges_of_node)
+    timings["remove_edges"] = (time.perf_counter() - started) / len(nodes)
+    return {name: seconds * 1e9 for name, seconds in timings.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--floors", type=int, default=100)
+    parser.add_argument("--rooms-per-side", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    connection = sqlite3.connect(":memory:")
+    elements = build_hotel(connection, args.floors, args.rooms_per_side)
+    reference = HotelRepository(connection, graph_backend="adjacency")
+    edges = reference.get_all_connections()
+    nodes = sorted({node for edge in edges for node in edge})
+    print(f"floors={args.floors} elements={elements} connections={len(edges)}")
+
+    operations = ["add_edge", "degree", "edges(node)", "remove_edges"]
+    print(f"{'backend':<11}{'import ms':>10}{'graph MiB':>11}{'load ms':>9}"
+          + "".join(f"{name + ' ns':>17}" for name in operations))
+    for backend in GRAPH_BACKENDS:
+        imported = import_time(IMPORTS[backend])
+        memory = graph_memory(backend, nodes, edges)
+        loads = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            HotelRepository(connection, graph_backend=backend)
+            loads.append(time.perf_counter() - started)
+        costs = per_operation(backend, nodes, edges)
+        print(f"{backend:<11}{imported * 1000:>10.1f}{memory / 2 ** 20:>11.2f}{min(loads) * 1000:>9.1f}"
+              + "".join(f"{costs[name]:>17.0f}" for name in operations))
+
+
+if __name__ == "__main__":
+    main()
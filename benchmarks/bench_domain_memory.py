@@ -0,0 +1,104 @@
+"""
+Memory footprint of the domain objects.
+
+Builds reservations and floor elements the way the repositories do when loading from the database, once with the
+__slots__ classes of src.model.domain and once with equivalent classes keeping a per-instance __dict__ (the previous
+layout), and reports the traced bytes per object.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_domain_memory [--reservations N] [--elements N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from datetime import date
+
+from src.model.domain.reservation import Reservation
+from src.model.domain.room import Room
+from src.utilities.date_codec import from_day
+
+
+class DictReservation:
+    """Previous layout of Reservation: name-mangled attributes stored in the instance __dict__."""
+
+    def __init__(self, db_id=None, reservation_id=None, room_id=None, guest_name=None, number_of_guests=None,
+                 check_in_date=None, check_out_date=None):
+        self.__db_id = db_id
+        self.__reservation_id = reservation_id
+        self.__room_id = room_id
+        self.__guest_name = guest_name
+        self.__number_of_guests = number_of_guests
+        self.__check_in_date = check_in_date
+        self.__check_out_date = check_out_date
+
+
+class DictRoom:
+    """Previous layout of Room: FloorElement attributes plus the room ones, stored in the instance __dict__."""
+
+    def __init__(self, db_id=None, type=None, floor_id=None, position=None, number=None, capacity=None,
+                 price_per_night=None):
+        self._db_id = db_id
+        self._type = type
+        self._floor_id = floor_id
+        self._position = position
+        self.__number = number
+        self.__capacity = capacity
+        self.__price_per_night = price_per_night
+
+
+def measure(build, count: int) -> float:
+    """Returns the traced bytes per object kept alive by build(count)."""
+    gc.collect()
+    tracemalloc.start()
+    objects = build(count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current / count
+
+
+def reservations(cls, decode_day):
+    first_day = date(2020, 1, 1).toordinal()
+
+    def build(count):
+        return [
+            cls(db_id=i, reservation_id=f"R{i:09d}", room_id=i % 500, guest_name=f"Guest {i % 50_000}",
+                number_of_guests=2, check_in_date=decode_day(first_day + i % 2_000),
+                check_out_date=decode_day(first_day + i % 2_000 + 3))
+            for i in range(count)
+        ]
+    return build
+
+
+def rooms(cls):
+    def build(count):
+        return [
+            cls(db_id=i, type="room", floor_id=i // 1_000, position=(i % 40, i // 40 % 25), number=str(i),
+                capacity=2, price_per_night=100.0)
+            for i in range(count)
+        ]
+    return build
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reservations", type=int, default=1_000_000)
+    parser.add_argument("--elements", type=int, default=100_000)
+    args = parser.parse_args()
+
+    cases = [
+        ("reservations", args.reservations, reservations(DictReservation, date.fromordinal),
+         reservations(Reservation, from_day)),
+        ("rooms", args.elements, rooms(DictRoom), rooms(Room)),
+    ]
+    print(f"{'objects':<14}{'count':>10}{'before B/obj':>15}{'after B/obj':>14}{'saved':>8}")
+    for name, count, before, after in cases:
+        before_bytes = measure(before, count)
+        after_bytes = measure(after, count)
+        print(f"{name:<14}{count:>10}{before_bytes:>15.0f}{after_bytes:>14.0f}"
+              f"{1 - after_bytes / before_bytes:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Cold start time of HotelRepository for tall hotels.
+
+Each floor gets a corridor of hallways with rooms on both sides and a staircase at each end, so the load
+exercises same-floor connections as well as staircase links between floors.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_hotel_load [--floors 100] [--rooms-per-side 20] [--repeat 3]
+"""
+
+import argparse
+import sqlite3
+import time
+
+from src.model.database import database_operations as db
+from src.model.repository.hotel_repository import HotelRepository
+
+
+def build_hotel(connection: sqlite3.Connection, floors: int, rooms_per_side: int) -> int:
+    """Writes a hotel layout straight to the database and returns the number of elements."""
+    db.create_hotel_simulator_model(connection)
+    rows = []
+    for level in range(floors):
+        floor_id = db.insert_floor(connection, f"Floor {level}", level)
+        rows.append(("staircase", floor_id, 0, 1, "", 0, 0))
+        rows.append(("staircase", floor_id, rooms_per_side + 1, 1, "", 0, 0))
+        for x in range(1, rooms_per_side + 1):
+            rows.append(("hallway", floor_id, x, 1, "", 0, 0))
+            rows.append(("room", floor_id, x, 0, f"{level}{x:03d}A", 2, 100.0))
+            rows.append(("room", floor_id, x, 2, f"{level}{x:03d}B", 3, 120.0))
+    connection.executemany("""
+        INSERT INTO elements (element_type, floor_id, x, y, number, capacity, price_per_night) VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+    connection.commit()
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--floors", type=int, default=100)
+    parser.add_argument("--rooms-per-side", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    connection = sqlite3.connect(":memory:")
+    elements = build_hotel(connection, args.floors, args.rooms_per_side)
+
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        repository = HotelRepository(connection)
+        timings.append(time.perf_counter() - started)
+
+    print(f"floors={args.floors} elements={elements} connections={len(repository.get_all_connections())}")
+    print(f"load: best {min(timings) * 1000:.1f} ms, mean {sum(timings) / len(timings) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Commit latency of the SQLite connection profiles.
+
+Every CRUD call in database_operations commits on its own, so this inserts reservations one call at a time
+under each preset, and on an untouched connection (SQLite's DELETE journal with FULL sync) as a baseline, and
+reports the per-commit latency.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_sqlite_profiles [--commits N]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from src.model.database.connection_profile import PROFILES, PROFILE_ENV_VAR
+from src.model.database.database_manager import DatabaseManager
+from src.model.database import database_operations as db
+from src.utilities.date_codec import iso_to_day
+
+
+def measure_commit_latency(profile_name: str | None, commits: int) -> list[float]:
+    """Returns the latency of each single-row insert + commit, in milliseconds. None leaves the connection as is."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = DatabaseManager(os.path.join(tmp_dir, "bench.db"), profile=profile_name)
+        manager.initialize_database()
+        conn = manager.conn
+
+        floor_id = db.insert_floor(conn, "Bench", 0)
+        room_id = db.insert_element(conn, "room", floor_id, 0, 0, "101", 2, 100.0)
+
+        check_in, check_out = iso_to_day("2024-07-01"), iso_to_day("2024-07-05")
+        latencies = []
+        for i in range(commits):
+            started = time.perf_counter()
+            db.insert_reservation(conn, f"BENCH{i:07d}", room_id, "Bench Guest", 2, check_in, check_out)
+            latencies.append((time.perf_counter() - started) * 1000)
+        conn.close()
+        return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commits", type=int, default=2_000)
+    args = parser.parse_args()
+    # The baseline row must measure an untouched connection, not the profile picked by the environment.
+    os.environ.pop(PROFILE_ENV_VAR, None)
+
+    print(f"{'profile':<12}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'commits/s':>12}")
+    for name in [None, *PROFILES]:
+        latencies = sorted(measure_commit_latency(name, args.commits))
+        mean = statistics.fmean(latencies)
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[int(len(latencies) * 0.95)]
+        print(f"{name or 'default':<12}{mean:>10.3f}{p50:>10.3f}{p95:>10.3f}{1000 / mean:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
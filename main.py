@@ -2,11 +2,14 @@ import sys
 import os
 from PyQt6.QtWidgets import QApplication
 
+from src.model.database.connection_profile import PROFILE_ENV_VAR
 from src.model.database.database_manager import DatabaseManager
 from src.model.repository.hotel_repository import HotelRepository
 from src.model.repository.reservation_repository import ReservationRepository
 from src.model.service.hotel_service import HotelService
 from src.model.service.reservation_service import ReservationService
+from src.model.service.revenue_service import RevenueService
+from src.model.service.statistics_service import StatisticsService
 from src.controller.controller import Controller
 from src.view.main_window import MainWindow
 
@@ -17,22 +20,33 @@ def main():
     base_dir = os.path.dirname(os.path.abspath(__file__))
     data_dir = os.path.join(base_dir, "data", "db")
 
-    db_manager = DatabaseManager(os.path.join(data_dir, "hotel_simulator.db"))
+    # A WAL profile, so that the background readers of the read-only pool never block the UI connection.
+    db_manager = DatabaseManager(os.path.join(data_dir, "hotel_simulator.db"),
+                                 profile=os.environ.get(PROFILE_ENV_VAR, "durable"))
     db_manager.initialize_database()
     connection = db_manager.conn
 
-    reservation_repository = ReservationRepository(connection)
-    hotel_repository = HotelRepository(connection)
+    # Only reservations within this many days of today are kept in memory, the rest are read on demand.
+    horizon_days = os.environ.get("HOTEL_SIMULATOR_RESERVATION_HORIZON_DAYS")
+    reservation_repository = ReservationRepository(
+        connection, horizon_days=int(horizon_days) if horizon_days else None, read_pool=db_manager.read_pool(),
+        columnar=True)
+    # The adjacency backend keeps the connection graph in plain sets and skips the networkx import at startup.
+    hotel_repository = HotelRepository(connection, graph_backend="adjacency")
 
     reservation_service = ReservationService(reservation_repository)
     hotel_service = HotelService(hotel_repository)
+    revenue_service = RevenueService(reservation_repository, hotel_repository)
+    statistics_service = StatisticsService(reservation_repository, hotel_repository)
 
-    controller = Controller(reservation_service, hotel_service)
+    controller = Controller(reservation_service, hotel_service, revenue_service, statistics_service)
 
     window = MainWindow(controller=controller)
     window.show()
 
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    db_manager.close()
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,7 @@
 import copy
-from datetime import datetime, date
+from datetime import date
+
+from src.utilities.date_codec import parse_iso_date, format_iso_date
 
 
 class Action:
@@ -67,39 +69,42 @@ class RemoveFloorAction(Action):
         self.reservations = []
 
     def redo(self):
-        self.floor = copy.deepcopy(self.hotel_service.get_floor(self.floor_id))
-        self.rooms = copy.deepcopy(self.hotel_service.get_elements_by_floor_id(self.floor_id))
-        self.reservations = []
-        for room in self.rooms:
-            if getattr(room, "type", None) == "room":
-                res = copy.deepcopy(self.reservation_service.get_reservations_by_room_id(room.db_id))
-                self.reservations.extend(res)
-                for r in res:
-                    self.reservation_service.delete_reservation(r.reservation_id)
-        for room in self.rooms:
-            self.hotel_service.remove_element(room.db_id, room.type, self.floor_id)
-        self.hotel_service.remove_floor(self.floor_id)
+        with self.hotel_service.transaction(), self.reservation_service.transaction():
+            self.floor = copy.deepcopy(self.hotel_service.get_floor(self.floor_id))
+            self.rooms = copy.deepcopy(self.hotel_service.get_elements_by_floor_id(self.floor_id))
+            self.reservations = []
+            for room in self.rooms:
+                if getattr(room, "type", None) == "room":
+                    res = copy.deepcopy(self.reservation_service.get_reservations_by_room_id(room.db_id))
+                    self.reservations.extend(res)
+                    for r in res:
+                        self.reservation_service.delete_reservation(r.reservation_id)
+            for room in self.rooms:
+                self.hotel_service.remove_element(room.db_id, room.type, self.floor_id)
+            self.hotel_service.remove_floor(self.floor_id)
 
     def undo(self):
-        self.floor_id = self.hotel_service.add_floor(self.floor.name, self.floor.level)
-        old_to_new_room_ids = {}
-        for room in self.rooms:
-            old_id = room.db_id
-            room.floor_id = self.floor_id
-            new_id = self.hotel_service.add_element(
-                room.type, room.floor_id, room.position,
-                getattr(room, "number", None),
-                getattr(room, "capacity", None),
-                getattr(room, "price_per_night", None)
-            )
-            old_to_new_room_ids[old_id] = new_id
-        for res in self.reservations:
-            new_room_id = old_to_new_room_ids.get(res.room_id)
-            self.reservation_service.make_reservation(
-                res.reservation_id, new_room_id,
-                res.guest_name, res.number_of_guests,
-                _format_iso_date(res.check_in_date), _format_iso_date(res.check_out_date)
-            )
+        with self.hotel_service.transaction(), self.reservation_service.transaction():
+            self.floor_id = self.hotel_service.add_floor(self.floor.name, self.floor.level)
+            old_to_new_room_ids = {}
+            for room in self.rooms:
+                old_id = room.db_id
+                room.floor_id = self.floor_id
+                new_id = self.hotel_service.add_element(
+                    room.type, room.floor_id, room.position,
+                    getattr(room, "number", None),
+                    getattr(room, "capacity", None),
+                    getattr(room, "price_per_night", None)
+                )
+                old_to_new_room_ids[old_id] = new_id
+            for res in self.reservations:
+                new_room_id = old_to_new_room_ids.get(res.room_id)
+                self.reservation_service.make_reservation(
+                    reservation_id=res.reservation_id, room_id=new_room_id,
+                    guest_name=res.guest_name, number_of_guests=res.number_of_guests,
+                    check_in_date=_format_iso_date(res.check_in_date),
+                    check_out_date=_format_iso_date(res.check_out_date)
+                )
 
 # Floor element actions
 class AddElementAction(Action):
@@ -121,10 +126,7 @@ class AddElementAction(Action):
         )
 
     def undo(self):
-        element = self.hotel_service.get_room_by_id(self.element_id) if self.type == "room" else None
-        if element is None:
-            elements = self.hotel_service.get_elements_by_floor_id(self.floor_id)
-            element = next((e for e in elements if e.db_id == self.element_id), None)
+        element = self.hotel_service.get_element_by_id(self.element_id)
         self.hotel_service.remove_element(self.element_id, element.type, self.floor_id)
 
 class EditRoomAction(Action):
@@ -153,11 +155,7 @@ class MoveElementAction(Action):
         self.element_id = request.element_id
         self.floor_id = request.floor_id
         self.new_position = request.position
-        try:
-            element = self.hotel_service.get_room_by_id(self.element_id)
-        except:
-            elements = self.hotel_service.get_elements_by_floor_id(self.floor_id)
-            element = next((e for e in elements if e.db_id == self.element_id), None)
+        element = self.hotel_service.get_element_by_id(self.element_id)
         self.old_position = element.position
 
     def redo(self):
@@ -184,27 +182,29 @@ class RemoveElementAction(Action):
             self.reservations = [copy.deepcopy(r) for r in self.reservation_service.get_reservations_by_room_id(self.element_id)]
 
     def redo(self):
-        if self.type == "room":
-            for res in self.reservations:
-                self.reservation_service.delete_reservation(res.reservation_id)
-        self.hotel_service.remove_element(self.element_id, self.type, self.floor_id)
+        with self.hotel_service.transaction(), self.reservation_service.transaction():
+            if self.type == "room":
+                for res in self.reservations:
+                    self.reservation_service.delete_reservation(res.reservation_id)
+            self.hotel_service.remove_element(self.element_id, self.type, self.floor_id)
 
     def undo(self):
-        self.element_id = self.hotel_service.add_element(
-            self.type, self.floor_id, self.position,
-            getattr(self, "number", None),
-            getattr(self, "capacity", None),
-            getattr(self, "price_per_night", None)
-        )
-        if self.type == "room":
-            for res in self.reservations:
-                res.room_id = self.element_id
-                self.reservation_service.make_reservation(
-                    res.reservation_id, res.room_id,
-                    res.guest_name, res.number_of_guests,
-                    _format_iso_date(res.check_in_date),
-                    _format_iso_date(res.check_out_date)
-                )
+        with self.hotel_service.transaction(), self.reservation_service.transaction():
+            self.element_id = self.hotel_service.add_element(
+                self.type, self.floor_id, self.position,
+                getattr(self, "number", None),
+                getattr(self, "capacity", None),
+                getattr(self, "price_per_night", None)
+            )
+            if self.type == "room":
+                for res in self.reservations:
+                    res.room_id = self.element_id
+                    self.reservation_service.make_reservation(
+                        reservation_id=res.reservation_id, room_id=res.room_id,
+                        guest_name=res.guest_name, number_of_guests=res.number_of_guests,
+                        check_in_date=_format_iso_date(res.check_in_date),
+                        check_out_date=_format_iso_date(res.check_out_date)
+                    )
 
 # Reservation actions
 class MakeReservationAction(Action):
@@ -227,6 +227,24 @@ class MakeReservationAction(Action):
     def undo(self):
         self.reservation_service.delete_reservation(self.reservation_id)
 
+class MakeReservationsBulkAction(Action):
+    """Action to make many reservations in a single write."""
+    def __init__(self, reservation_service, requests):
+        self.reservation_service = reservation_service
+        self.reservation_ids = []
+        self.bookings = [
+            dict(room_id=request.room_id, guest_name=request.guest_name, number_of_guests=request.number_of_guests,
+                 check_in_date=request.check_in_date, check_out_date=request.check_out_date)
+            for request in requests
+        ]
+
+    def redo(self):
+        self.reservation_ids = self.reservation_service.add_reservations_bulk(self.bookings)
+
+    def undo(self):
+        for reservation_id in reversed(self.reservation_ids):
+            self.reservation_service.delete_reservation(reservation_id)
+
 class EditReservationAction(Action):
     """Action to edit a reservation."""
     def __init__(self, reservation_service, request):
@@ -280,14 +298,42 @@ class DeleteReservationAction(Action):
             check_in_date=self.check_in_date, check_out_date=self.check_out_date
         )
 
+# Batch actions
+class BatchAction(Action):
+    """
+    Action running the actions of a batch of requests as one, in a single transaction: nothing is applied if any of
+    them fails, and the batch is undone and redone as a whole. Each action is built by its factory just before it
+    first runs, so that it records the state left by the earlier actions of the batch.
+    """
+    def __init__(self, hotel_service, reservation_service, factories):
+        self.hotel_service = hotel_service
+        self.reservation_service = reservation_service
+        self.factories = factories
+        self.actions = []
+
+    def redo(self):
+        with self.hotel_service.transaction(), self.reservation_service.transaction():
+            if self.actions:
+                for action in self.actions:
+                    action.redo()
+                return
+            actions = []
+            for factory in self.factories:
+                action = factory()
+                action.redo()
+                actions.append(action)
+            self.actions = actions
+
+    def undo(self):
+        with self.hotel_service.transaction(), self.reservation_service.transaction():
+            for action in reversed(self.actions):
+                action.undo()
+
 # Utility functions
 def _parse_iso_date(s : str) -> date:
     """Parse a date string in ISO format (YYYY-MM-DD) to a date object."""
-    try:
-        return datetime.strptime(s, "%Y-%m-%d").date()
-    except ValueError as e:
-        raise ValueError(f"Invalid date format, expected YYYY-MM-DD: {s}") from e
+    return parse_iso_date(s)
 
 def _format_iso_date(d : date) -> str:
     """Format a date object to a string in ISO format (YYYY-MM-DD)."""
-    return d.isoformat()
\ No newline at end of file
+    return format_iso_date(d)
\ No newline at end of file
@@ -1,27 +1,110 @@
-from datetime import datetime, date
+from datetime import date
 
-from src.controller.dto import FloorDTO, FloorElementDTO, RoomDTO, ReservationDTO
+from functools import partial
+
+from src.controller.dto import (
+    FloorDTO, FloorElementDTO, RoomDTO, ReservationDTO, HotelStatisticsDTO,
+    AddFloorRequest, RenameFloorRequest, UpdateFloorLevelRequest, RemoveFloorRequest, AddElementRequest,
+    EditRoomRequest, MoveElementRequest, RemoveElementRequest, MakeReservationRequest, EditReservationRequest,
+    DeleteReservationRequest
+)
 from src.model.service.hotel_service import HotelService
 from src.model.service.reservation_service import ReservationService
-from src.utilities.exceptions import ControllerError
+from src.model.service.revenue_service import RevenueService
+from src.model.service.statistics_service import StatisticsService
+from src.utilities.change_events import ChangeBus, EntityAdded, EntityUpdated, EntityRemoved, FLOOR, ELEMENT
+from src.utilities.exceptions import ControllerError, ElementNotFoundError
+from src.utilities.date_codec import parse_iso_date
+from src.utilities.lru_cache import LRUCache
 from src.controller.action_manager import ActionManager
 from src.controller.action import (
     AddFloorAction, RemoveFloorAction, AddElementAction, RemoveElementAction,
     EditRoomAction, MoveElementAction, MakeReservationAction, EditReservationAction, DeleteReservationAction,
-    UpdateFloorLevelAction, RenameFloorAction
-
+    UpdateFloorLevelAction, RenameFloorAction, MakeReservationsBulkAction, BatchAction
 )
 
 
+RESERVATION_DTO_CACHE_SIZE = 100_000
+
+# Request type -> action type, by the services the action needs
+_HOTEL_ACTIONS = {
+    AddFloorRequest: AddFloorAction, RenameFloorRequest: RenameFloorAction,
+    UpdateFloorLevelRequest: UpdateFloorLevelAction, AddElementRequest: AddElementAction,
+    EditRoomRequest: EditRoomAction, MoveElementRequest: MoveElementAction,
+}
+_RESERVATION_ACTIONS = {
+    MakeReservationRequest: MakeReservationAction, EditReservationRequest: EditReservationAction,
+    DeleteReservationRequest: DeleteReservationAction,
+}
+_CASCADING_ACTIONS = {RemoveFloorRequest: RemoveFloorAction, RemoveElementRequest: RemoveElementAction}
+
+
 class Controller:
     """
     Controller class that mediates between the view and the model.
+
+    Floor, room and reservation DTOs are cached along with the generation of the model objects they were built
+    from, and handed out again until that generation changes. DTOs are frozen, so views can share them.
+
+    With a revenue_service, income queries are answered from its running totals instead of a pass over every
+    reservation. Likewise, a statistics_service answers the dashboard counters.
+
+    The change events of the repositories are forwarded to the handlers registered with subscribe, with the DTO of
+    the added or updated entity in place of the model object, so views can apply deltas instead of reloading.
+    Removals carry only the entity ID.
+
+    apply_batch runs many requests as one undoable action, in a single transaction, for bulk edits such as repricing
+    rooms or booking a group.
     """
-    def __init__(self, reservation_service: ReservationService, hotel_service: HotelService):
+    def __init__(self, reservation_service: ReservationService, hotel_service: HotelService,
+                 revenue_service: RevenueService = None, statistics_service: StatisticsService = None):
         self.__reservation_service = reservation_service
         self.__hotel_service = hotel_service
+        self.__revenue_service = revenue_service
+        self.__statistics_service = statistics_service
         self.__action_manager = ActionManager()
 
+        # id -> (generation, DTO)
+        self.__floor_dtos = {}
+        self.__floor_grid_dtos = {}
+        self.__room_dtos = {}
+        self.__reservation_dtos = LRUCache(RESERVATION_DTO_CACHE_SIZE)
+
+        self.__events = ChangeBus()
+        reservation_service.subscribe(self._forward_event)
+        hotel_service.subscribe(self._forward_event)
+
+    # Change events
+    def subscribe(self, handler, entity_type: str = None) -> None:
+        """
+        Registers handler(event) for the changes to the entities of a type (change_events.FLOOR, ELEMENT or
+        RESERVATION), or of every type by default.
+        """
+        self.__events.subscribe(handler, entity_type)
+
+    def unsubscribe(self, handler, entity_type: str = None) -> None:
+        """Removes a handler registered with subscribe."""
+        self.__events.unsubscribe(handler, entity_type)
+
+    def _forward_event(self, event) -> None:
+        """Forwards a model change event to the subscribed views, with DTOs in place of model objects."""
+        if not self.__events.has_subscribers(event.entity_type):
+            return
+        if isinstance(event, EntityAdded):
+            event = EntityAdded(event.entity_type, event.entity_id, self._event_dto(event))
+        elif isinstance(event, EntityUpdated):
+            event = EntityUpdated(event.entity_type, event.entity_id, self._event_dto(event))
+        elif isinstance(event, EntityRemoved):
+            event = EntityRemoved(event.entity_type, event.entity_id)
+        self.__events.publish(event)
+
+    def _event_dto(self, event) -> FloorDTO | FloorElementDTO | RoomDTO | ReservationDTO:
+        if event.entity_type == FLOOR:
+            return self._floor_dto(event.entity)
+        if event.entity_type == ELEMENT:
+            return self._element_dto(event.entity)
+        return self._reservation_dto(event.entity)
+
     # Undo/Redo operations
     def undo(self) -> None:
         """Undoes the last action."""
@@ -48,24 +131,31 @@ class Controller:
     # Hotel
     def get_floor(self, floor_id: int) -> FloorDTO:
         """Returns a FloorDTO for the specified floor ID."""
-        return self._to_floor_dto(self.__hotel_service.get_floor(floor_id))
+        return self._floor_dto(self.__hotel_service.get_floor(floor_id))
 
     def get_all_floors(self) -> list[FloorDTO]:
         """Returns a list of all FloorDTOs sorted by their level."""
         result = self.__hotel_service.get_all_floors_sorted_by_level()
-        return [self._to_floor_dto(floor) for floor in result]
+        return [self._floor_dto(floor) for floor in result]
 
     def get_floor_grid(self, floor_id: int) -> dict[tuple[int, int], FloorElementDTO | RoomDTO | None]:
-        """Returns the grid of floor elements and rooms for the specified floor ID."""
+        """
+        Returns the grid of floor elements and rooms for the specified floor ID. The same grid is returned until the
+        floor changes, so it must not be modified.
+        """
+        generation = self.__hotel_service.get_floor_generation(floor_id)
+        cached = self.__floor_grid_dtos.get(floor_id)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+
         grid = self.__hotel_service.get_floor_grid(floor_id)
         dto_grid = {}
         for position, element in grid.items():
             if element is None:
                 dto_grid[position] = None
-            elif element.type == 'room':
-                dto_grid[position] = self._to_room_dto(element)
             else:
-                dto_grid[position] = self._to_floor_element_dto(element)
+                dto_grid[position] = self._element_dto(element)
+        self.__floor_grid_dtos[floor_id] = (generation, dto_grid)
         return dto_grid
 
     def get_floor_connections(self, floor_id: int) -> list[tuple[int, int]]:
@@ -79,11 +169,11 @@ class Controller:
 
     def get_room_by_id(self, room_id: int) -> RoomDTO:
         """Returns a RoomDTO for the specified room ID."""
-        return self._to_room_dto(self.__hotel_service.get_room_by_id(room_id))
+        return self._room_dto(self.__hotel_service.get_room_by_id(room_id))
 
     def get_room_by_number(self, room_number: str) -> RoomDTO:
         """Returns a RoomDTO for the specified room number."""
-        return self._to_room_dto(self.__hotel_service.get_room_by_number(room_number))
+        return self._room_dto(self.__hotel_service.get_room_by_number(room_number))
 
     def get_all_connections(self) -> list[tuple[int, int]]:
         """Returns a list of all connections in the hotel as tuples (floor_id, pos1, pos2)."""
@@ -91,32 +181,12 @@ class Controller:
 
     def get_rooms_availability_for_date(self, date_string: str) -> tuple[set[int], set[int]]:
         """Returns available and unavailable room IDs for a specific date."""
-        available_rooms = set()
-        unavailable_rooms = set()
         date_val = self._parse_iso_date(date_string)
+        occupied_room_ids = self.__reservation_service.get_occupied_room_ids(date_val)
+        room_ids = {room.db_id for room in self.__hotel_service.get_all_rooms()}
 
-        all_reservations = self.get_all_reservations()
-        unavailable_room_ids = set()
-
-        for res in all_reservations:
-            check_in = res.check_in_date
-            check_out = res.check_out_date
-            if check_in <= date_val < check_out:
-                unavailable_room_ids.add(res.room_id)
-
-        floors = self.get_all_floors()
-
-        for floor in floors:
-            floor_grid = self.get_floor_grid(floor.db_id)
-
-            for pos, element in floor_grid.items():
-                if not element or element.type != "room":
-                    continue
-                room_id = element.db_id
-                if room_id in unavailable_room_ids:
-                    unavailable_rooms.add(room_id)
-                else:
-                    available_rooms.add(room_id)
+        available_rooms = room_ids - occupied_room_ids
+        unavailable_rooms = room_ids & occupied_room_ids
         return available_rooms, unavailable_rooms
 
     def get_floor_number_of_rooms(self, floor_id: int) -> tuple[int, int]:
@@ -134,27 +204,25 @@ class Controller:
         return len(reservations)
 
     def get_available_rooms(self, check_in_date: str, check_out_date: str, number_of_guests: int) -> list[RoomDTO]:
-        """Returns a list of available RoomDTOs for the specified date range and number of guests"""
+        """
+        Returns a list of available RoomDTOs for the specified date range and number of guests, best fit first:
+        the smallest rooms that are large enough, cheaper ones first.
+        """
         check_in = self._parse_iso_date(check_in_date)
         check_out = self._parse_iso_date(check_out_date)
 
-        rooms = self.__hotel_service.get_rooms_by_capacity(number_of_guests)
+        rooms = self.__hotel_service.get_rooms_by_min_capacity(number_of_guests, best_fit=True)
         result: list[RoomDTO] = []
 
         for room in rooms:
-            room_id = room.db_id
-            reservations = self.__reservation_service.get_reservations_by_room_id(room_id) # Theta(1)
-            is_available = all(
-                not (check_in <= res.check_out_date and check_out >= res.check_in_date)
-                for res in reservations
-            )
-
-            if is_available:
-                result.append(self._to_room_dto(room))
+            if self.__reservation_service.is_room_free(room.db_id, check_in, check_out): # O(log n)
+                result.append(self._room_dto(room))
         return result
 
     def get_total_rooms_count(self) -> int:
         """Returns the total number of rooms in the hotel."""
+        if self.__statistics_service is not None:
+            return self.__statistics_service.get_room_count()
         rooms_count = 0
         floors = self.get_all_floors()
 
@@ -168,15 +236,17 @@ class Controller:
     # Reservations
     def get_reservation_by_id(self, reservation_id: str) -> ReservationDTO:
         """Returns a ReservationDTO for the specified reservation ID."""
-        return self._to_reservation_dto(self.__reservation_service.get_by_reservation_id(reservation_id))
+        return self._reservation_dto(self.__reservation_service.get_by_reservation_id(reservation_id))
 
     def get_all_reservations(self) -> list[ReservationDTO]:
         """Returns a list of all ReservationDTOs."""
         result = self.__reservation_service.get_all_reservations()
-        return [self._to_reservation_dto(res) for res in result]
+        return [self._reservation_dto(res) for res in result]
 
     def get_total_reservations_income(self) -> float:
         """Calculates the total income from all reservations."""
+        if self.__revenue_service is not None:
+            return self.__revenue_service.get_total_income()
         total_income = 0
         reservations = self.get_all_reservations()
 
@@ -189,30 +259,73 @@ class Controller:
                 total_income += days * room.price_per_night
         return total_income
 
-    # Search
-    def reservation_search(self, search_bar_string: str, from_date: date = None,
-                           to_date: date = None) -> list[ReservationDTO]:
-        """Search reservations by reservation ID, guest name, or room number, with optional date filtering."""
-        results = []
+    def get_floor_income(self, floor_id: int) -> float:
+        """Returns the income from the reservations of the rooms of a floor."""
+        return self._revenue_service().get_floor_income(floor_id)
+
+    def get_room_income(self, room_id: int) -> float:
+        """Returns the income from the reservations of a room."""
+        return self._revenue_service().get_room_income(room_id)
+
+    def get_income_by_month(self) -> dict[tuple[int, int], float]:
+        """Returns the income of every month with booked nights, keyed by (year, month)."""
+        return self._revenue_service().get_income_by_month()
+
+    def get_income_between(self, from_date: str, to_date: str) -> float:
+        """Returns the income of the nights from from_date up to, but not including, to_date."""
+        start = self._parse_iso_date(from_date)
+        end = self._parse_iso_date(to_date)
+        if end < start:
+            raise ControllerError("End date must not be before start date!")
+        return self._revenue_service().get_income_between(start, end)
+
+    def get_hotel_statistics(self, date_string: str) -> HotelStatisticsDTO:
+        """Returns the dashboard counters of the hotel, with the occupancy, arrivals and departures of a day."""
+        if self.__statistics_service is None:
+            raise ControllerError("Hotel statistics need a statistics service!")
+        day = self._parse_iso_date(date_string)
+        statistics = self.__statistics_service
+        return HotelStatisticsDTO(
+            day=day,
+            floors=statistics.get_floor_count(),
+            rooms=statistics.get_room_count(),
+            reservations=statistics.get_reservation_count(),
+            income=self.get_total_reservations_income(),
+            occupancy_rate=statistics.get_occupancy_rate(day),
+            arrivals=statistics.get_arrivals(day),
+            departures=statistics.get_departures(day),
+        )
 
-        rooms = self.__hotel_service.get_rooms_by_partial_number(search_bar_string)
-        room_ids = {room.db_id for room in rooms}
+    def _revenue_service(self) -> RevenueService:
+        if self.__revenue_service is None:
+            raise ControllerError("Income reports need a revenue service!")
+        return self.__revenue_service
 
-        all_reservations = self.__reservation_service.get_all_reservations()
-        for reservation in all_reservations:
-            if (
-                    search_bar_string in reservation.reservation_id
-                    or search_bar_string.lower() in reservation.guest_name.lower()
-                    or reservation.room_id in room_ids
-            ):
-                results.append(reservation)
+    # Search
+    def reservation_search(self, search_bar_string: str, from_date: date = None,
+                           to_date: date = None, limit: int = None) -> list[ReservationDTO]:
+        """
+        Search reservations by reservation ID, guest name, or room number, with optional date filtering.
+        Matches on ID or guest name come first, best ranked first, then the reservations of matching rooms.
+        """
+        filtered = from_date is not None or to_date is not None
+        results = self.__reservation_service.search_reservations(search_bar_string, None if filtered else limit)
+        found = {res.reservation_id for res in results}
+
+        for room in self.__hotel_service.get_rooms_by_partial_number(search_bar_string):
+            if limit is not None and not filtered and len(results) >= limit:
+                break
+            for reservation in self.__reservation_service.get_reservations_by_room_id(room.db_id):
+                if reservation.reservation_id not in found:
+                    found.add(reservation.reservation_id)
+                    results.append(reservation)
 
         if from_date:
             results = [res for res in results if res.check_out_date >= from_date]
         if to_date:
             results = [res for res in results if res.check_in_date <= to_date]
 
-        return [self._to_reservation_dto(res) for res in results]
+        return [self._reservation_dto(res) for res in results[:limit]]
 
     def reservation_direct_search(self, search_bar_string: str) -> list[ReservationDTO]:
         """Direct search for reservations by reservation ID, guest name, or room number."""
@@ -220,12 +333,9 @@ class Controller:
         reservation_by_id = self.__reservation_service.get_by_reservation_id(search_bar_string)
         if reservation_by_id:
             results.append(reservation_by_id)
-            return [self._to_reservation_dto(res) for res in results]
+            return [self._reservation_dto(res) for res in results]
 
-        all_reservations = self.__reservation_service.get_all_reservations()
-        for reservation in all_reservations:
-            if search_bar_string.lower() in reservation.guest_name.lower():
-                results.append(reservation)
+        results.extend(self.__reservation_service.get_reservations_by_partial_guest_name(search_bar_string))
 
         try:
             room = self.__hotel_service.get_room_by_number(search_bar_string)
@@ -234,11 +344,9 @@ class Controller:
             room_id = None
 
         if room_id is not None:
-            for reservation in all_reservations:
-                if reservation.room_id == room_id:
-                    results.append(reservation)
+            results.extend(self.__reservation_service.get_reservations_by_room_id(room_id))
 
-        return [self._to_reservation_dto(res) for res in results]
+        return [self._reservation_dto(res) for res in results]
 
     # CRUD operations
 
@@ -291,7 +399,7 @@ class Controller:
     # Reservations
     def make_reservation(self, request):
         """Makes a new reservation for a room."""
-        if not self._is_room_available(
+        if not self.is_room_available(
                 request.room_id,
                 request.check_in_date,
                 request.check_out_date,
@@ -301,9 +409,22 @@ class Controller:
         action = MakeReservationAction(self.__reservation_service, request)
         self.__action_manager.do_action(action)
 
+    def make_reservations_bulk(self, requests) -> None:
+        """Makes many reservations at once, as a single undoable action. Nothing is booked if any request fails."""
+        for request in requests:
+            if not self.is_room_available(
+                    request.room_id,
+                    request.check_in_date,
+                    request.check_out_date,
+                    request.number_of_guests
+            ):
+                raise ControllerError(f"Room {request.room_id} is not available for the selected dates or guest number!")
+        action = MakeReservationsBulkAction(self.__reservation_service, requests)
+        self.__action_manager.do_action(action)
+
     def edit_reservation(self, request):
         """Edits an existing reservation."""
-        if not self._is_room_available(
+        if not self.is_room_available(
                 request.room_id,
                 request.check_in_date,
                 request.check_out_date,
@@ -319,6 +440,166 @@ class Controller:
         action = DeleteReservationAction(self.__reservation_service, request)
         self.__action_manager.do_action(action)
 
+    # Batches
+    def apply_batch(self, requests) -> None:
+        """
+        Applies many requests of any kind at once, in order, as a single undoable action. Every request is checked
+        before anything is written, and the batch runs in one transaction: nothing is applied if any request fails.
+        """
+        requests = list(requests)
+        if not requests:
+            return
+        self._validate_batch(requests)
+        factories = [self._batch_action_factory(request) for request in requests]
+        action = BatchAction(self.__hotel_service, self.__reservation_service, factories)
+        self.__action_manager.do_action(action)
+        if any(type(request) in _CASCADING_ACTIONS for request in requests):
+            self.clear_stacks()
+
+    def _batch_action_factory(self, request):
+        """Returns a callable building the action of a batch request."""
+        request_type = type(request)
+        if request_type in _HOTEL_ACTIONS:
+            return partial(_HOTEL_ACTIONS[request_type], self.__hotel_service, request)
+        if request_type in _RESERVATION_ACTIONS:
+            return partial(_RESERVATION_ACTIONS[request_type], self.__reservation_service, request)
+        return partial(_CASCADING_ACTIONS[request_type], self.__hotel_service, self.__reservation_service, request)
+
+    def _validate_batch(self, requests) -> None:
+        """
+        Checks the requests of a batch in order, against the hotel as left by the earlier requests of the batch, and
+        raises a ControllerError naming the first invalid one. A floor, element or room removed by the batch cannot
+        be referenced by its other requests, as undoing the removal gives it a new ID. The check is conservative:
+        a stay freed by a reservation deleted or edited earlier in the batch is not booked again.
+        """
+        floor_names = {floor.db_id: floor.name for floor in self.__hotel_service.get_all_floors_sorted_by_level()}
+        taken_names = set(floor_names.values())
+        floor_elements = {}  # floor_id -> element IDs, of the floors removed by the batch
+        removed_elements = set()
+        for request in requests:
+            if isinstance(request, RemoveFloorRequest) and request.floor_id in floor_names:
+                elements = self.__hotel_service.get_elements_by_floor_id(request.floor_id)
+                floor_elements[request.floor_id] = [element.db_id for element in elements]
+                removed_elements.update(floor_elements[request.floor_id])
+            elif isinstance(request, RemoveElementRequest):
+                removed_elements.add(request.element_id)
+        removed_floors = set(floor_elements)
+        occupied = {}  # floor_id -> positions taken after the earlier requests
+        moved = {}  # element_id -> position after the earlier requests
+        capacities = {}  # room_id -> capacity after the earlier requests
+        booked = {}  # room_id -> {reservation ID, or request index of a new booking: stay} of the earlier requests
+        booked_rooms = {}  # reservation ID -> room_id of its stay in booked
+        removed = set()  # floors, elements and reservations already removed by the batch
+
+        def fail(index, message):
+            raise ControllerError(f"Request {index + 1} of the batch: {message}")
+
+        def positions(floor_id):
+            if floor_id not in occupied:
+                occupied[floor_id] = {el.position for el in self.__hotel_service.get_elements_by_floor_id(floor_id)}
+            return occupied[floor_id]
+
+        def check_floor(index, floor_id, removing=False):
+            if floor_id not in floor_names or ("floor", floor_id) in removed:
+                fail(index, f"floor {floor_id} not found!")
+            if floor_id in removed_floors and not removing:
+                fail(index, f"floor {floor_id} is removed by the batch!")
+
+        def check_element(index, element_id, removing=False):
+            try:
+                element = self.__hotel_service.get_element_by_id(element_id)
+            except ElementNotFoundError:
+                element = None
+            if element is None or ("element", element_id) in removed:
+                fail(index, f"element {element_id} not found!")
+            if element_id in removed_elements and not removing:
+                fail(index, f"element {element_id} is removed by the batch!")
+            return element
+
+        def check_reservation(index, reservation_id):
+            reservation = self.__reservation_service.get_by_reservation_id(reservation_id)
+            if reservation is None or ("reservation", reservation_id) in removed:
+                fail(index, f"reservation {reservation_id} not found!")
+            if reservation.room_id in removed_elements:
+                fail(index, f"the room of reservation {reservation_id} is removed by the batch!")
+
+        def check_stay(index, request, reservation_id=None):
+            if request.room_id in removed_elements:
+                fail(index, f"room {request.room_id} is removed by the batch!")
+            room = self.__hotel_service.get_room_by_id(request.room_id)
+            capacity = capacities.get(request.room_id, room.capacity if room is not None else 0)
+            check_in = self._parse_iso_date(request.check_in_date)
+            check_out = self._parse_iso_date(request.check_out_date)
+            if (room is None or capacity < request.number_of_guests
+                    or not self.__reservation_service.is_room_free(request.room_id, check_in, check_out,
+                                                                   reservation_id)):
+                fail(index, f"room {request.room_id} is not available for the selected dates or guest number!")
+            # A stay covers its check-out day too, as in ReservationRepository.is_room_free
+            key = reservation_id if reservation_id is not None else index
+            unbook(reservation_id)
+            stays = booked.setdefault(request.room_id, {})
+            if any(check_in <= other_out and other_in <= check_out for other_in, other_out in stays.values()):
+                fail(index, f"room {request.room_id} is booked twice by the batch!")
+            stays[key] = (check_in, check_out)
+            if reservation_id is not None:
+                booked_rooms[reservation_id] = request.room_id
+
+        def unbook(reservation_id):
+            """Forgets the stay given to a reservation by an earlier edit of the batch."""
+            if reservation_id in booked_rooms:
+                del booked[booked_rooms.pop(reservation_id)][reservation_id]
+
+        for index, request in enumerate(requests):
+            if isinstance(request, AddFloorRequest):
+                if request.name in taken_names:
+                    fail(index, f"floor {request.name} already exists!")
+                taken_names.add(request.name)
+            elif isinstance(request, RenameFloorRequest):
+                check_floor(index, request.floor_id)
+                if request.new_name in taken_names:
+                    fail(index, f"floor {request.new_name} already exists!")
+                taken_names.discard(floor_names[request.floor_id])
+                taken_names.add(request.new_name)
+                floor_names[request.floor_id] = request.new_name
+            elif isinstance(request, UpdateFloorLevelRequest):
+                check_floor(index, request.floor_id)
+            elif isinstance(request, RemoveFloorRequest):
+                check_floor(index, request.floor_id, removing=True)
+                removed.add(("floor", request.floor_id))
+                removed.update(("element", element_id) for element_id in floor_elements[request.floor_id])
+                taken_names.discard(floor_names[request.floor_id])
+            elif isinstance(request, AddElementRequest):
+                check_floor(index, request.floor_id)
+                if request.position in positions(request.floor_id):
+                    fail(index, "position is already occupied!")
+                positions(request.floor_id).add(request.position)
+            elif isinstance(request, EditRoomRequest):
+                if check_element(index, request.element_id).type != "room":
+                    fail(index, f"element {request.element_id} is not a room!")
+                capacities[request.element_id] = request.capacity
+            elif isinstance(request, MoveElementRequest):
+                element = check_element(index, request.element_id)
+                if request.position in positions(element.floor_id):
+                    fail(index, "position is already occupied!")
+                positions(element.floor_id).discard(moved.get(element.db_id, element.position))
+                positions(element.floor_id).add(request.position)
+                moved[element.db_id] = request.position
+            elif isinstance(request, RemoveElementRequest):
+                element = check_element(index, request.element_id, removing=True)
+                removed.add(("element", request.element_id))
+                positions(element.floor_id).discard(moved.get(element.db_id, element.position))
+            elif isinstance(request, MakeReservationRequest):
+                check_stay(index, request)
+            elif isinstance(request, EditReservationRequest):
+                check_reservation(index, request.reservation_id)
+                check_stay(index, request, request.reservation_id)
+            elif isinstance(request, DeleteReservationRequest):
+                check_reservation(index, request.reservation_id)
+                removed.add(("reservation", request.reservation_id))
+                unbook(request.reservation_id)
+            else:
+                fail(index, f"unsupported request {type(request).__name__}!")
+
     # Utility methods
 
     # Availability checks
@@ -330,7 +611,7 @@ class Controller:
                 return False
         return True
 
-    def _is_room_available(self, room_id: int, check_in_date: str, check_out_date: str,
+    def is_room_available(self, room_id: int, check_in_date: str, check_out_date: str,
                            number_of_guests: int, reservation_id: str = None):
         """Checks if a room is available for the specified date range and number of guests."""
         check_in = self._parse_iso_date(check_in_date)
@@ -340,29 +621,57 @@ class Controller:
         if room is None or room.capacity < number_of_guests:
             return False
 
-        reservations = self.__reservation_service.get_reservations_by_room_id(room_id)
-        is_available = all(
-            (reservation_id is not None and getattr(res, "reservation_id", None) == reservation_id) or
-            not (check_in <= res.check_out_date and check_out >= res.check_in_date)
-            for res in reservations
-        )
-        return is_available
+        return self.__reservation_service.is_room_free(room_id, check_in, check_out, reservation_id)
 
     # Parsing
     def _parse_iso_date(self, s: str) -> date:
         """Parses a date string in ISO format (YYYY-MM-DD) and returns a date object."""
-        try:
-            return datetime.strptime(s, "%Y-%m-%d").date()
-        except ValueError as e:
-            raise ValueError(f"Invalid date format, expected YYYY-MM-DD: {s}") from e
+        return parse_iso_date(s)
+
+    # DTO Cache
+    def _floor_dto(self, floor) -> FloorDTO:
+        """Returns the cached FloorDTO of a floor, rebuilt when the floor generation changed."""
+        generation = self.__hotel_service.get_floor_generation(floor.db_id)
+        cached = self.__floor_dtos.get(floor.db_id)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        elements = {el_id: self._element_dto(el) for el_id, el in floor.elements.items()}
+        dto = FloorDTO(db_id=floor.db_id, name=floor.name, level=floor.level, elements=elements)
+        self.__floor_dtos[floor.db_id] = (generation, dto)
+        return dto
+
+    def _element_dto(self, element) -> FloorElementDTO | RoomDTO:
+        """Returns a RoomDTO from the cache for a room, or a new FloorElementDTO for any other element."""
+        if element.type == 'room':
+            return self._room_dto(element)
+        return self._to_floor_element_dto(element)
+
+    def _room_dto(self, room) -> RoomDTO:
+        """Returns the cached RoomDTO of a room, rebuilt when the room generation changed."""
+        generation = self.__hotel_service.get_room_generation(room.db_id)
+        cached = self.__room_dtos.get(room.db_id)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        dto = self._to_room_dto(room)
+        self.__room_dtos[room.db_id] = (generation, dto)
+        return dto
+
+    def _reservation_dto(self, reservation) -> ReservationDTO:
+        """
+        Returns the cached ReservationDTO of a reservation, rebuilt when the reservations of its room or the room
+        itself (for the room number) changed.
+        """
+        room_id = reservation.room_id
+        generation = (room_id, self.__reservation_service.get_room_generation(room_id),
+                      self.__hotel_service.get_room_generation(room_id))
+        cached = self.__reservation_dtos.get(reservation.reservation_id)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        dto = self._to_reservation_dto(reservation)
+        self.__reservation_dtos.put(reservation.reservation_id, (generation, dto))
+        return dto
 
     # DTO Conversion
-    def _to_floor_dto(self, floor) -> FloorDTO:
-        """Converts a Floor model instance to a FloorDTO."""
-        elements = {el_id: self._to_floor_element_dto(el) if el.type != 'room' else self._to_room_dto(el)
-                    for el_id, el in floor.elements.items()}
-        return FloorDTO(db_id=floor.db_id, name=floor.name, level=floor.level, elements=elements)
-
     def _to_floor_element_dto(self, floor_element) -> FloorElementDTO:
         """Converts a FloorElement model instance to a FloorElementDTO."""
         return FloorElementDTO(
@@ -37,6 +37,17 @@ class ReservationDTO:
     check_in_date: date
     check_out_date: date
 
+@dataclass(frozen=True)
+class HotelStatisticsDTO:
+    day: date
+    floors: int
+    rooms: int
+    reservations: int
+    income: float
+    occupancy_rate: float
+    arrivals: int
+    departures: int
+
 
 # View -> Model Requests
 
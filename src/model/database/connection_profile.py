@@ -0,0 +1,111 @@
+"""
+Connection Profiles for Hotel Simulator
+This module defines the SQLite PRAGMA presets applied to the connections opened by the database manager.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+
+from src.utilities.exceptions import DatabaseError
+
+
+PROFILE_ENV_VAR = "HOTEL_SIMULATOR_DB_PROFILE"
+# No profile by default: the connection keeps SQLite's own settings (DELETE journal, FULL sync) unless one is chosen.
+DEFAULT_PROFILE = None
+
+JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+TEMP_STORES = {"DEFAULT", "FILE", "MEMORY"}
+
+
+@dataclass(frozen=True)
+class ConnectionProfile:
+    """
+    SQLite connection settings.
+
+    Attributes:
+        journal_mode (str): Rollback journal mode, WAL lets readers run alongside the writer.
+        synchronous (str): How often SQLite fsyncs, FULL on every commit, NORMAL at WAL checkpoints.
+        cache_size (int): Page cache size, in pages when positive and in KiB when negative.
+        mmap_size (int): Bytes of the database file accessed through memory mapping (0 disables it).
+        temp_store (str): Where temporary tables and indexes are kept.
+        busy_timeout (int): Milliseconds to wait on a locked database before failing.
+    """
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size: int = -2_000
+    mmap_size: int = 0
+    temp_store: str = "DEFAULT"
+    busy_timeout: int = 5_000
+
+    def validate(self) -> list:
+        errors = []
+        if not _is_one_of(self.journal_mode, JOURNAL_MODES):
+            errors.append(f"Journal mode must be one of {sorted(JOURNAL_MODES)}!")
+        if not _is_one_of(self.synchronous, SYNCHRONOUS_MODES):
+            errors.append(f"Synchronous mode must be one of {sorted(SYNCHRONOUS_MODES)}!")
+        if not isinstance(self.cache_size, int):
+            errors.append("Cache size must be an integer!")
+        if not isinstance(self.mmap_size, int) or self.mmap_size < 0:
+            errors.append("Mmap size must be a non-negative integer!")
+        if not _is_one_of(self.temp_store, TEMP_STORES):
+            errors.append(f"Temp store must be one of {sorted(TEMP_STORES)}!")
+        if not isinstance(self.busy_timeout, int) or self.busy_timeout < 0:
+            errors.append("Busy timeout must be a non-negative integer!")
+        return errors
+
+
+def _is_one_of(value, choices: set) -> bool:
+    """Checks that a PRAGMA value is a string among the choices, ignoring case."""
+    return isinstance(value, str) and value.upper() in choices
+
+
+PROFILES = {
+    # Every commit is fsynced: nothing acknowledged is ever lost, even on power failure.
+    "durable": ConnectionProfile(
+        journal_mode="WAL", synchronous="FULL", cache_size=-8_000,
+        mmap_size=0, temp_store="DEFAULT", busy_timeout=5_000,
+    ),
+    # WAL with fsync at checkpoints: survives application crashes, may lose the last commits on power failure.
+    "balanced": ConnectionProfile(
+        journal_mode="WAL", synchronous="NORMAL", cache_size=-32_000,
+        mmap_size=128 * 1024 * 1024, temp_store="MEMORY", busy_timeout=5_000,
+    ),
+    # No fsync at all, for imports that can simply be rerun if the machine goes down mid-way.
+    "bulk-load": ConnectionProfile(
+        journal_mode="WAL", synchronous="OFF", cache_size=-256_000,
+        mmap_size=256 * 1024 * 1024, temp_store="MEMORY", busy_timeout=30_000,
+    ),
+}
+
+
+def get_profile(profile: str | ConnectionProfile) -> ConnectionProfile:
+    """Returns the preset with the given name, or the profile itself once validated."""
+    if isinstance(profile, str):
+        if profile not in PROFILES:
+            raise DatabaseError(f"Unknown connection profile {profile}! Expected one of {sorted(PROFILES)}.")
+        return PROFILES[profile]
+
+    errors = profile.validate()
+    if errors:
+        raise DatabaseError("Invalid connection profile!", errors)
+    return profile
+
+
+def apply_connection_profile(connection: sqlite3.Connection, profile: ConnectionProfile) -> None:
+    """Applies the PRAGMA settings of the profile to the connection."""
+    if connection.in_transaction:
+        raise DatabaseError("Cannot change the connection profile inside a transaction!")
+    try:
+        cursor = connection.cursor()
+        # PRAGMA values cannot be bound as parameters, they are checked by ConnectionProfile.validate instead.
+        cursor.execute(f"PRAGMA journal_mode = {profile.journal_mode.upper()}")
+        cursor.execute(f"PRAGMA synchronous = {profile.synchronous.upper()}")
+        cursor.execute(f"PRAGMA cache_size = {int(profile.cache_size)}")
+        cursor.execute(f"PRAGMA mmap_size = {int(profile.mmap_size)}")
+        cursor.execute(f"PRAGMA temp_store = {profile.temp_store.upper()}")
+        cursor.execute(f"PRAGMA busy_timeout = {int(profile.busy_timeout)}")
+    except sqlite3.OperationalError as e:
+        raise DatabaseError("Database operational error!") from e
+    except Exception as e:
+        raise DatabaseError("Database unexpected error!") from e
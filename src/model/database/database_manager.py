@@ -1,22 +1,80 @@
+import os
 import sqlite3
 from src.model.database.database_operations import create_hotel_simulator_model
+from src.model.database.unit_of_work import unit_of_work
+from src.model.database.read_pool import ReadOnlyPool, DEFAULT_WORKERS
+from src.model.database.connection_profile import (ConnectionProfile, DEFAULT_PROFILE, PROFILE_ENV_VAR,
+                                                   get_profile, apply_connection_profile)
+from src.utilities.exceptions import DatabaseError
 
 
 class DatabaseManager:
     """
     Manages the database connection and initialization.
+
+    The connection profile (journaling, fsync, caching and locking PRAGMAs) can be given by preset name or as a
+    ConnectionProfile. When omitted, it is read from the HOTEL_SIMULATOR_DB_PROFILE environment variable; if that is
+    unset too, the connection is left with SQLite's default settings and profile is None.
+
+    Read queries can also run on background threads through a pool of read-only connections, see submit_read.
     """
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, profile: str | ConnectionProfile = None, read_workers: int = DEFAULT_WORKERS):
+        self.__db_path = db_path
         self.__conn = get_connection(db_path)
+        self.__profile = None
+        self.__read_workers = read_workers
+        self.__read_pool = None
+        if profile is None:
+            profile = os.environ.get(PROFILE_ENV_VAR, DEFAULT_PROFILE)
+        if profile is not None:
+            self.set_profile(profile)
 
     def initialize_database(self):
         create_hotel_simulator_model(self.__conn)
 
+    def set_profile(self, profile: str | ConnectionProfile) -> None:
+        """Applies a connection profile, by preset name or as a ConnectionProfile."""
+        resolved = get_profile(profile)
+        apply_connection_profile(self.__conn, resolved)
+        self.__profile = resolved
+
+    def transaction(self):
+        """Opens a unit of work on the connection: the writes inside it are committed once, or rolled back together."""
+        return unit_of_work(self.__conn)
+
+    def read_pool(self) -> ReadOnlyPool:
+        """
+        Returns the pool of read-only connections, opening it on first use. Requires an on-disk database in WAL mode,
+        as set by every preset profile: with a rollback journal, a background read would lock out the writes of the
+        main connection.
+        """
+        if self.__read_pool is None:
+            journal_mode = self.__conn.execute("PRAGMA journal_mode").fetchone()[0]
+            if journal_mode.upper() != "WAL":
+                raise DatabaseError(f"A read-only pool needs the database in WAL mode, not {journal_mode.upper()}!")
+            self.__read_pool = ReadOnlyPool(self.__db_path, self.__read_workers, self.__profile)
+        return self.__read_pool
+
+    def submit_read(self, query, *args, **kwargs):
+        """Runs query(connection, *args, **kwargs) on a read-only connection in a background thread; returns a Future."""
+        return self.read_pool().submit(query, *args, **kwargs)
+
+    def close(self):
+        """Closes the read-only pool, if any, and the main connection."""
+        if self.__read_pool is not None:
+            self.__read_pool.close()
+            self.__read_pool = None
+        self.__conn.close()
+
     @property
     def conn(self):
         return self.__conn
 
+    @property
+    def profile(self) -> ConnectionProfile | None:
+        return self.__profile
+
 
 def get_connection(db_path: str) -> sqlite3.Connection:
     """
@@ -1,46 +1,26 @@
 """
 Database Operations for Hotel Simulator
 This module provides functions to create and manipulate the database schema of the hotel simulator application.
+Each write commits on its own, unless it runs inside a unit of work (see unit_of_work), which then commits once.
 """
 
 import sqlite3
+from src.model.database.migrations import migrate
+from src.model.database.unit_of_work import unit_of_work, commit as _commit
 from src.utilities.exceptions import DatabaseError
 
 
+# SQLite builds before 3.32 cap a statement at 999 bound parameters.
+_MAX_QUERY_PARAMETERS = 900
+
+
 # Create Tables
 def create_hotel_simulator_model(connection):
+    """Creates the schema, or upgrades an existing database to the latest schema version."""
     try:
-        cursor = connection.cursor()
-        cursor.executescript("""
-            CREATE TABLE IF NOT EXISTS floors (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                level INTEGER NOT NULL
-            );
-    
-            CREATE TABLE IF NOT EXISTS elements (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                element_type TEXT NOT NULL,
-                floor_id INTEGER NOT NULL,
-                x INTEGER NOT NULL,
-                y INTEGER NOT NULL,
-                number TEXT,
-                capacity INTEGER,
-                price_per_night REAL,
-                FOREIGN KEY (floor_id) REFERENCES floors(id)
-            );
-                
-            CREATE TABLE IF NOT EXISTS reservations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT, 
-                reservation_id TEXT UNIQUE NOT NULL, 
-                room_id INTEGER NOT NULL, 
-                guest_name TEXT NOT NULL, 
-                number_of_guests INTEGER NOT NULL, 
-                check_in_date TEXT NOT NULL, 
-                check_out_date TEXT NOT NULL
-            );
-        """)
-        connection.commit()
+        migrate(connection)
+    except DatabaseError:
+        raise
     except sqlite3.IntegrityError as e:
         raise DatabaseError("Database integrity error!") from e
     except sqlite3.OperationalError as e:
@@ -68,7 +48,7 @@ def insert_floor(connection, name, level):
         cursor.execute("""
             INSERT INTO floors (name, level) VALUES (?, ?)
         """, (name, level))
-        connection.commit()
+        _commit(connection)
         return cursor.lastrowid
     except sqlite3.IntegrityError as e:
         raise DatabaseError("Database integrity error!") from e
@@ -83,7 +63,7 @@ def update_floor_name(connection, floor_id, new_name):
         cursor.execute("""
             UPDATE floors SET name = ? WHERE id = ?
         """, (new_name, floor_id))
-        connection.commit()
+        _commit(connection)
     except sqlite3.IntegrityError as e:
         raise DatabaseError("Database integrity error!") from e
     except sqlite3.OperationalError as e:
@@ -97,7 +77,7 @@ def update_floor_level(connection, floor_id, new_level):
         cursor.execute("""
             UPDATE floors SET level = ? WHERE id = ?
         """, (new_level, floor_id))
-        connection.commit()
+        _commit(connection)
     except sqlite3.IntegrityError as e:
         raise DatabaseError("Database integrity error!") from e
     except sqlite3.OperationalError as e:
@@ -111,7 +91,7 @@ def delete_floor(connection, floor_id):
         cursor.execute("""
             DELETE FROM floors WHERE id = ?
         """, (floor_id,))
-        connection.commit()
+        _commit(connection)
     except sqlite3.OperationalError as e:
         raise DatabaseError("Database operational error!") from e
     except Exception as e:
@@ -131,13 +111,25 @@ def select_elements_by_floor_id(connection, floor_id):
     except Exception as e:
         raise DatabaseError("Database unexpected error!") from e
 
+def select_all_elements(connection):
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT * FROM elements ORDER BY floor_id, id
+        """)
+        return cursor.fetchall()
+    except sqlite3.OperationalError as e:
+        raise DatabaseError("Database operational error!") from e
+    except Exception as e:
+        raise DatabaseError("Database unexpected error!") from e
+
 def insert_element(connection, type, floor_id, x, y, number, capacity, price_per_night):
     try:
         cursor = connection.cursor()
         cursor.execute("""
             INSERT INTO elements (element_type, floor_id, x, y, number, capacity, price_per_night) VALUES (?, ?, ?, ?, ?, ?, ?)            
         """, (type, floor_id, x, y, number, capacity, price_per_night))
-        connection.commit()
+        _commit(connection)
         return cursor.lastrowid
     except sqlite3.IntegrityError as e:
         raise DatabaseError("Database integrity error!") from e
@@ -152,7 +144,7 @@ def update_element_position(connection, element_id, new_x, new_y):
         cursor.execute("""
             UPDATE elements SET x = ?, y = ? WHERE id = ?
         """, (new_x, new_y, element_id))
-        connection.commit()
+        _commit(connection)
     except sqlite3.IntegrityError as e:
         raise DatabaseError("Database integrity error!") from e
     except sqlite3.OperationalError as e:
@@ -166,7 +158,7 @@ def update_element(connection, element_id, new_number, new_capacity, new_price_p
         cursor.execute("""
             UPDATE elements SET number = ?, capacity = ?, price_per_night = ? WHERE id = ?
         """, (new_number, new_capacity, new_price_per_night, element_id))
-        connection.commit()
+        _commit(connection)
     except sqlite3.IntegrityError as e:
         raise DatabaseError("Database integrity error!") from e
     except sqlite3.OperationalError as e:
@@ -180,7 +172,7 @@ def delete_element(connection, element_id):
         cursor.execute("""
             DELETE FROM elements WHERE id = ?
         """, (element_id,))
-        connection.commit()
+        _commit(connection)
     except sqlite3.OperationalError as e:
         raise DatabaseError("Database operational error!") from e
     except Exception as e:
@@ -188,11 +180,12 @@ def delete_element(connection, element_id):
 
 
 # Reservations Table
+# Dates are passed and returned as integer day ordinals (see src.utilities.date_codec).
 def select_all_reservations(connection):
     try:
         cursor = connection.cursor()
         cursor.execute("""
-            SELECT * from reservations
+            SELECT * FROM reservation_stays
         """)
         return cursor.fetchall()
     except sqlite3.OperationalError as e:
@@ -204,7 +197,7 @@ def select_reservation_by_reservation_id(connection, reservation_id):
     try:
         cursor = connection.cursor()
         cursor.execute("""
-            SELECT * FROM reservations WHERE reservation_id = ?
+            SELECT * FROM reservation_stays WHERE reservation_id = ?
         """, (reservation_id,))
         return cursor.fetchone()
     except sqlite3.OperationalError as e:
@@ -212,13 +205,140 @@ def select_reservation_by_reservation_id(connection, reservation_id):
     except Exception as e:
         raise DatabaseError("Database unexpected error!") from e
 
-def insert_reservation(connection, reservation_id, room_id, guest_name, number_of_guests, check_in_date, check_out_date):
+def select_reservations_in_window(connection, first_day, last_day):
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT * FROM reservation_stays WHERE check_out_day >= ? AND check_in_day <= ?
+        """, (first_day, last_day))
+        return cursor.fetchall()
+    except sqlite3.OperationalError as e:
+        raise DatabaseError("Database operational error!") from e
+    except Exception as e:
+        raise DatabaseError("Database unexpected error!") from e
+
+def select_reservations_by_room_id(connection, room_id):
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT * FROM reservation_stays WHERE room_id = ? ORDER BY check_in_day
+        """, (room_id,))
+        return cursor.fetchall()
+    except sqlite3.OperationalError as e:
+        raise DatabaseError("Database operational error!") from e
+    except Exception as e:
+        raise DatabaseError("Database unexpected error!") from e
+
+def select_reservations_by_guest_name(connection, guest_name):
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT * FROM reservation_stays WHERE guest_name = ?
+        """, (guest_name,))
+        return cursor.fetchall()
+    except sqlite3.OperationalError as e:
+        raise DatabaseError("Database operational error!") from e
+    except Exception as e:
+        raise DatabaseError("Database unexpected error!") from e
+
+def select_overlapping_reservations(connection, room_id, check_in_day, check_out_day):
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT * FROM reservation_stays WHERE room_id = ? AND check_in_day <= ? AND check_out_day >= ?
+            ORDER BY check_in_day
+        """, (room_id, check_out_day, check_in_day))
+        return cursor.fetchall()
+    except sqlite3.OperationalError as e:
+        raise DatabaseError("Database operational error!") from e
+    except Exception as e:
+        raise DatabaseError("Database unexpected error!") from e
+
+def select_occupied_room_ids(connection, day):
     try:
         cursor = connection.cursor()
         cursor.execute("""
-            INSERT INTO reservations (reservation_id, room_id, guest_name, number_of_guests, check_in_date, check_out_date) VALUES (?, ?, ?, ?, ?, ?)
-        """, (reservation_id, room_id, guest_name, number_of_guests, check_in_date, check_out_date))
-        connection.commit()
+            SELECT DISTINCT room_id FROM reservation_stays WHERE check_in_day <= ? AND check_out_day > ?
+        """, (day, day))
+        return [row[0] for row in cursor.fetchall()]
+    except sqlite3.OperationalError as e:
+        raise DatabaseError("Database operational error!") from e
+    except Exception as e:
+        raise DatabaseError("Database unexpected error!") from e
+
+def select_reservations_active_on(connection, day):
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT * FROM reservation_stays WHERE check_in_day <= ? AND check_out_day > ?
+        """, (day, day))
+        return cursor.fetchall()
+    except sqlite3.OperationalError as e:
+        raise DatabaseError("Database operational error!") from e
+    except Exception as e:
+        raise DatabaseError("Database unexpected error!") from e
+
+def select_reservations_overlapping_range(connection, first_day, last_day):
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT * FROM reservation_stays WHERE check_in_day <= ? AND check_out_day >= ?
+        """, (last_day, first_day))
+        return cursor.fetchall()
+    except sqlite3.OperationalError as e:
+        raise DatabaseError("Database operational error!") from e
+    except Exception as e:
+        raise DatabaseError("Database unexpected error!") from e
+
+def count_reservations_by_room(connection):
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT room_id, COUNT(*) FROM reservation_stays GROUP BY room_id
+        """)
+        return dict(cursor.fetchall())
+    except sqlite3.OperationalError as e:
+        raise DatabaseError("Database operational error!") from e
+    except Exception as e:
+        raise DatabaseError("Database unexpected error!") from e
+
+def sum_room_nights_by_room(connection, start_day, end_day):
+    """Occupied nights of every room from start_day up to, but not including, end_day."""
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT room_id, SUM(MIN(check_out_day, ?) - MAX(check_in_day, ?)) FROM reservation_stays
+            WHERE check_in_day < ? AND check_out_day > ?
+            GROUP BY room_id
+        """, (end_day, start_day, end_day, start_day))
+        return dict(cursor.fetchall())
+    except sqlite3.OperationalError as e:
+        raise DatabaseError("Database operational error!") from e
+    except Exception as e:
+        raise DatabaseError("Database unexpected error!") from e
+
+def select_reservations_matching(connection, text):
+    """Reservations whose reservation ID or guest name contains text, case-insensitive for ASCII."""
+    pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT * FROM reservation_stays
+            WHERE reservation_id LIKE ? ESCAPE '\\' OR guest_name LIKE ? ESCAPE '\\'
+        """, (pattern, pattern))
+        return cursor.fetchall()
+    except sqlite3.OperationalError as e:
+        raise DatabaseError("Database operational error!") from e
+    except Exception as e:
+        raise DatabaseError("Database unexpected error!") from e
+
+def insert_reservation(connection, reservation_id, room_id, guest_name, number_of_guests, check_in_day, check_out_day):
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+            INSERT INTO reservation_stays (reservation_id, room_id, guest_name, number_of_guests, check_in_day, check_out_day) VALUES (?, ?, ?, ?, ?, ?)
+        """, (reservation_id, room_id, guest_name, number_of_guests, check_in_day, check_out_day))
+        _commit(connection)
         return cursor.lastrowid
     except sqlite3.IntegrityError as e:
         raise DatabaseError("Database integrity error!") from e
@@ -227,15 +347,47 @@ def insert_reservation(connection, reservation_id, room_id, guest_name, number_o
     except Exception as e:
         raise DatabaseError("Database unexpected error!") from e
 
-def update_reservation(connection, db_id, reservation_id, room_id, guest_name, number_of_guests, check_in_date, check_out_date):
+def insert_reservations_bulk(connection, reservations):
+    """
+    Inserts many reservations with a single executemany, all or nothing, in its own unit of work: one commit,
+    or a savepoint when called inside another unit of work.
+    :param reservations: rows of (reservation_id, room_id, guest_name, number_of_guests, check_in_day, check_out_day)
+    :return: the database IDs of the inserted rows, in the order of the input
+    """
+    try:
+        with unit_of_work(connection):
+            cursor = connection.cursor()
+            cursor.executemany("""
+                INSERT INTO reservation_stays (reservation_id, room_id, guest_name, number_of_guests, check_in_day, check_out_day) VALUES (?, ?, ?, ?, ?, ?)
+            """, reservations)
+
+            reservation_ids = [row[0] for row in reservations]
+            db_ids = {}
+            for start in range(0, len(reservation_ids), _MAX_QUERY_PARAMETERS):
+                chunk = reservation_ids[start:start + _MAX_QUERY_PARAMETERS]
+                cursor.execute(f"""
+                    SELECT reservation_id, id FROM reservation_stays WHERE reservation_id IN ({", ".join("?" * len(chunk))})
+                """, chunk)
+                db_ids.update(cursor.fetchall())
+        return [db_ids[reservation_id] for reservation_id in reservation_ids]
+    except DatabaseError:
+        raise
+    except sqlite3.IntegrityError as e:
+        raise DatabaseError("Database integrity error!") from e
+    except sqlite3.OperationalError as e:
+        raise DatabaseError("Database operational error!") from e
+    except Exception as e:
+        raise DatabaseError("Database unexpected error!") from e
+
+def update_reservation(connection, db_id, reservation_id, room_id, guest_name, number_of_guests, check_in_day, check_out_day):
     try:
         cursor = connection.cursor()
         cursor.execute("""
-            UPDATE reservations 
-            SET room_id = ?, guest_name = ?, number_of_guests = ?, check_in_date = ?, check_out_date = ?
+            UPDATE reservation_stays
+            SET room_id = ?, guest_name = ?, number_of_guests = ?, check_in_day = ?, check_out_day = ?
             WHERE id = ?
-        """, (room_id, guest_name, number_of_guests, check_in_date, check_out_date, db_id))
-        connection.commit()
+        """, (room_id, guest_name, number_of_guests, check_in_day, check_out_day, db_id))
+        _commit(connection)
     except sqlite3.IntegrityError as e:
         raise DatabaseError("Database integrity error!") from e
     except sqlite3.OperationalError as e:
@@ -247,9 +399,9 @@ def delete_reservation(connection, db_id):
     try:
         cursor = connection.cursor()
         cursor.execute("""
-            DELETE FROM reservations WHERE id = ?
+            DELETE FROM reservation_stays WHERE id = ?
         """, (db_id,))
-        connection.commit()
+        _commit(connection)
     except sqlite3.OperationalError as e:
         raise DatabaseError("Database operational error!") from e
     except Exception as e:
@@ -0,0 +1,145 @@
+"""
+Schema Migrations for Hotel Simulator
+This module keeps the database schema versioned through PRAGMA user_version and upgrades older databases in place.
+Each migration runs in its own transaction together with the version bump, so a failed upgrade leaves the
+database at the last fully applied version.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+
+from src.utilities.exceptions import DatabaseError
+
+
+# julianday() of a date minus this offset is its Python day ordinal (date.toordinal()), and back.
+JULIAN_DAY_OFFSET = 1721424.5
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    script: str
+
+
+MIGRATIONS = [
+    Migration(1, "Create the floors, elements and reservations tables", """
+        CREATE TABLE IF NOT EXISTS floors (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            level INTEGER NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS elements (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            element_type TEXT NOT NULL,
+            floor_id INTEGER NOT NULL,
+            x INTEGER NOT NULL,
+            y INTEGER NOT NULL,
+            number TEXT,
+            capacity INTEGER,
+            price_per_night REAL,
+            FOREIGN KEY (floor_id) REFERENCES floors(id)
+        );
+
+        CREATE TABLE IF NOT EXISTS reservations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            reservation_id TEXT UNIQUE NOT NULL,
+            room_id INTEGER NOT NULL,
+            guest_name TEXT NOT NULL,
+            number_of_guests INTEGER NOT NULL,
+            check_in_date TEXT NOT NULL,
+            check_out_date TEXT NOT NULL
+        );
+    """),
+    Migration(2, "Add secondary indexes on the hot lookup columns", """
+        CREATE INDEX IF NOT EXISTS idx_elements_floor_id ON elements(floor_id);
+        CREATE INDEX IF NOT EXISTS idx_reservations_room_id_check_in ON reservations(room_id, check_in_date);
+        CREATE INDEX IF NOT EXISTS idx_reservations_guest_name ON reservations(guest_name);
+        CREATE INDEX IF NOT EXISTS idx_reservations_check_out ON reservations(check_out_date);
+    """),
+    Migration(3, "Store reservation dates as integer day ordinals behind a compatibility view", f"""
+        CREATE TABLE reservation_stays (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            reservation_id TEXT UNIQUE NOT NULL,
+            room_id INTEGER NOT NULL,
+            guest_name TEXT NOT NULL,
+            number_of_guests INTEGER NOT NULL,
+            check_in_day INTEGER NOT NULL,
+            check_out_day INTEGER NOT NULL
+        );
+
+        INSERT INTO reservation_stays
+            (id, reservation_id, room_id, guest_name, number_of_guests, check_in_day, check_out_day)
+        SELECT id, reservation_id, room_id, guest_name, number_of_guests,
+               CAST(julianday(check_in_date) - {JULIAN_DAY_OFFSET} AS INTEGER),
+               CAST(julianday(check_out_date) - {JULIAN_DAY_OFFSET} AS INTEGER)
+        FROM reservations;
+
+        DROP TABLE reservations;
+
+        CREATE INDEX idx_reservation_stays_room_id_check_in ON reservation_stays(room_id, check_in_day);
+        CREATE INDEX idx_reservation_stays_guest_name ON reservation_stays(guest_name);
+        CREATE INDEX idx_reservation_stays_check_out ON reservation_stays(check_out_day);
+
+        -- The original TEXT columns, for ad-hoc queries and older tools.
+        CREATE VIEW reservations AS
+        SELECT id, reservation_id, room_id, guest_name, number_of_guests,
+               date(check_in_day + {JULIAN_DAY_OFFSET}) AS check_in_date,
+               date(check_out_day + {JULIAN_DAY_OFFSET}) AS check_out_date
+        FROM reservation_stays;
+
+        CREATE TRIGGER reservations_insert INSTEAD OF INSERT ON reservations
+        BEGIN
+            INSERT INTO reservation_stays
+                (id, reservation_id, room_id, guest_name, number_of_guests, check_in_day, check_out_day)
+            VALUES (NEW.id, NEW.reservation_id, NEW.room_id, NEW.guest_name, NEW.number_of_guests,
+                    CAST(julianday(NEW.check_in_date) - {JULIAN_DAY_OFFSET} AS INTEGER),
+                    CAST(julianday(NEW.check_out_date) - {JULIAN_DAY_OFFSET} AS INTEGER));
+        END;
+
+        CREATE TRIGGER reservations_update INSTEAD OF UPDATE ON reservations
+        BEGIN
+            UPDATE reservation_stays
+            SET reservation_id = NEW.reservation_id, room_id = NEW.room_id, guest_name = NEW.guest_name,
+                number_of_guests = NEW.number_of_guests,
+                check_in_day = CAST(julianday(NEW.check_in_date) - {JULIAN_DAY_OFFSET} AS INTEGER),
+                check_out_day = CAST(julianday(NEW.check_out_date) - {JULIAN_DAY_OFFSET} AS INTEGER)
+            WHERE id = OLD.id;
+        END;
+
+        CREATE TRIGGER reservations_delete INSTEAD OF DELETE ON reservations
+        BEGIN
+            DELETE FROM reservation_stays WHERE id = OLD.id;
+        END;
+    """),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def get_schema_version(connection) -> int:
+    """Returns the schema version stored in the database header."""
+    try:
+        return connection.execute("PRAGMA user_version").fetchone()[0]
+    except sqlite3.OperationalError as e:
+        raise DatabaseError("Database operational error!") from e
+
+def migrate(connection, target_version: int = LATEST_VERSION) -> int:
+    """Applies every pending migration up to target_version and returns the resulting schema version."""
+    current_version = get_schema_version(connection)
+    if current_version > LATEST_VERSION:
+        raise DatabaseError(f"Database schema version {current_version} is newer than this application "
+                            f"supports ({LATEST_VERSION})!")
+
+    for migration in MIGRATIONS:
+        if migration.version <= current_version or migration.version > target_version:
+            continue
+        try:
+            connection.executescript(
+                f"BEGIN;\n{migration.script}\nPRAGMA user_version = {migration.version};\nCOMMIT;"
+            )
+        except sqlite3.Error as e:
+            connection.rollback()
+            raise DatabaseError(f"Migration {migration.version} ({migration.description}) failed!") from e
+        current_version = migration.version
+    return current_version
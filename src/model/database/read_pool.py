@@ -0,0 +1,87 @@
+"""
+Read-Only Connection Pool for Hotel Simulator
+This module runs read queries on background threads, each with its own read-only connection to the database file.
+With the database in WAL mode, these readers work alongside the main connection without blocking it, and they
+see the last committed state: changes still pending in an open unit of work are not visible to them.
+"""
+
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import quote
+
+from src.model.database.connection_profile import ConnectionProfile
+from src.utilities.exceptions import DatabaseError
+
+
+DEFAULT_WORKERS = 4
+
+
+class ReadOnlyPool:
+    """
+    A fixed set of worker threads, each owning one connection opened with a mode=ro URI.
+
+    Work is submitted as a callable taking the connection as first argument, which is the signature of the select
+    functions in database_operations, e.g. pool.submit(db.select_all_reservations).
+    """
+
+    def __init__(self, db_path: str, workers: int = DEFAULT_WORKERS, profile: ConnectionProfile = None):
+        if db_path == ":memory:" or not Path(db_path).is_file():
+            raise DatabaseError(f"A read-only pool needs an existing database file, got {db_path}!")
+        if workers <= 0:
+            raise DatabaseError("A read-only pool needs at least one worker!")
+
+        self.__workers = workers
+        self.__uri = f"file:{quote(str(Path(db_path).resolve()))}?mode=ro"
+        self.__profile = profile or ConnectionProfile()
+        self.__local = threading.local()
+        self.__connections = []
+        self.__lock = threading.Lock()
+        self.__closed = False
+        self.__executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hotel-db-reader")
+
+    @property
+    def workers(self) -> int:
+        return self.__workers
+
+    def submit(self, query, *args, **kwargs) -> Future:
+        """Schedules query(connection, *args, **kwargs) on a worker thread and returns its Future."""
+        if self.__closed:
+            raise DatabaseError("The read-only pool is closed!")
+        return self.__executor.submit(self.__run, query, args, kwargs)
+
+    def run(self, query, *args, **kwargs):
+        """Runs a query on a worker thread and waits for its result."""
+        return self.submit(query, *args, **kwargs).result()
+
+    def close(self) -> None:
+        """Waits for the pending queries, then closes every worker connection."""
+        self.__closed = True
+        self.__executor.shutdown(wait=True)
+        with self.__lock:
+            for connection in self.__connections:
+                connection.close()
+            self.__connections.clear()
+
+    def __run(self, query, args, kwargs):
+        return query(self.__connection(), *args, **kwargs)
+
+    def __connection(self) -> sqlite3.Connection:
+        """Returns the connection of the current worker thread, opening it on first use."""
+        connection = getattr(self.__local, "connection", None)
+        if connection is None:
+            try:
+                # check_same_thread is off only so that close() can release the connections from the caller thread.
+                connection = sqlite3.connect(self.__uri, uri=True, check_same_thread=False)
+                connection.execute("PRAGMA query_only = ON")
+                connection.execute(f"PRAGMA cache_size = {int(self.__profile.cache_size)}")
+                connection.execute(f"PRAGMA mmap_size = {int(self.__profile.mmap_size)}")
+                connection.execute(f"PRAGMA temp_store = {self.__profile.temp_store.upper()}")
+                connection.execute(f"PRAGMA busy_timeout = {int(self.__profile.busy_timeout)}")
+            except sqlite3.Error as e:
+                raise DatabaseError("Database operational error!") from e
+            self.__local.connection = connection
+            with self.__lock:
+                self.__connections.append(connection)
+        return connection
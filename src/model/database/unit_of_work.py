@@ -0,0 +1,118 @@
+"""
+Unit of Work for Hotel Simulator
+This module groups several database operations into one transaction. Inside a unit of work the functions of
+database_operations do not commit; the outermost unit commits once when it exits, or rolls everything back if an
+exception escapes. Nested units map to SAVEPOINTs, so a failing inner unit only undoes its own work.
+
+Repositories join the active unit before mutating their caches, handing over a reload callback. When a unit rolls
+back, the callbacks of every repository that changed something inside it are run, so the caches match the database
+again.
+"""
+
+import sqlite3
+from contextlib import contextmanager
+
+from src.utilities.exceptions import DatabaseError
+
+
+class _UnitState:
+    """Bookkeeping of the unit of work active on one connection: one list of rollback hooks per nesting level."""
+
+    def __init__(self):
+        self.hooks = [[]]
+
+    @property
+    def depth(self) -> int:
+        return len(self.hooks)
+
+
+# Keyed by id(connection): sqlite3.Connection supports neither weak references nor attributes.
+# Entries only live while a unit is open, and hold the connection so its id cannot be reused meanwhile.
+_active_units = {}
+
+
+def in_unit_of_work(connection) -> bool:
+    """Checks whether a unit of work is open on the connection."""
+    return id(connection) in _active_units
+
+def join(connection, on_rollback) -> None:
+    """Registers a rollback hook with the innermost open unit of work, if any. Each hook is registered once per level."""
+    entry = _active_units.get(id(connection))
+    if entry is None:
+        return
+    hooks = entry[1].hooks[-1]
+    if on_rollback not in hooks:
+        hooks.append(on_rollback)
+
+def commit(connection) -> None:
+    """Commits the connection, unless a unit of work is open on it: the unit will commit when it exits."""
+    if not in_unit_of_work(connection):
+        connection.commit()
+
+@contextmanager
+def unit_of_work(connection):
+    """Opens a unit of work on the connection, or a nested one (a savepoint) if a unit is already open."""
+    key = id(connection)
+    outermost = key not in _active_units
+    if outermost:
+        state = _UnitState()
+        _active_units[key] = (connection, state)
+    else:
+        state = _active_units[key][1]
+        state.hooks.append([])
+    savepoint = f"unit_of_work_{state.depth}"
+
+    try:
+        if outermost:
+            if not connection.in_transaction:
+                connection.execute("BEGIN")
+        else:
+            connection.execute(f"SAVEPOINT {savepoint}")
+    except sqlite3.Error as e:
+        _close_level(key, state, outermost, keep_hooks=False)
+        raise DatabaseError("Database operational error!") from e
+
+    try:
+        yield connection
+    except BaseException:
+        _roll_back_level(connection, key, state, outermost, savepoint)
+        raise
+
+    try:
+        if outermost:
+            connection.commit()
+        else:
+            connection.execute(f"RELEASE {savepoint}")
+    except sqlite3.Error as e:
+        _roll_back_level(connection, key, state, outermost, savepoint)
+        raise DatabaseError("Database commit error!") from e
+    _close_level(key, state, outermost)
+
+
+def _roll_back_level(connection, key, state, outermost, savepoint) -> None:
+    hooks = state.hooks[-1]
+    try:
+        if outermost:
+            connection.rollback()
+        else:
+            connection.execute(f"ROLLBACK TO {savepoint}")
+            connection.execute(f"RELEASE {savepoint}")
+    finally:
+        # The work of this level is gone, so its hooks do not move up: whatever the outer levels changed
+        # registered its own hooks there.
+        _close_level(key, state, outermost, keep_hooks=False)
+    # Run after the level is closed, so the reloads read the restored state.
+    for hook in hooks:
+        hook()
+
+def _close_level(key, state, outermost, keep_hooks=True) -> None:
+    """Pops a nesting level; hooks of a released level move up, as its work is only final once the outer unit commits."""
+    hooks = state.hooks.pop()
+    if outermost:
+        del _active_units[key]
+        return
+    if not keep_hooks:
+        return
+    for hook in hooks:
+        if hook not in state.hooks[-1]:
+            state.hooks[-1].append(hook)
@@ -13,6 +13,8 @@ class Floor:
         elements (dict): Dictionary of floor elements, keyed by their db_id.
     """
 
+    __slots__ = ("__db_id", "__name", "__level", "__elements", "__grid_cache")
+
     def __init__(self, db_id: int = None, name: str = None, level: int = None):
         self.__db_id = db_id
         self.__name = name
@@ -9,6 +9,8 @@ class FloorElement:
         position (tuple): Position of the element on the floor.
     """
 
+    __slots__ = ("_db_id", "_type", "_floor_id", "_position")
+
     def __init__(self, db_id: int = None, type: str = None, floor_id: int = None, position: tuple = None):
         self._db_id = db_id
         self._type = type
@@ -15,6 +15,9 @@ class Reservation:
         check_out_date (date): Check-out date for the reservation.
     """
 
+    __slots__ = ("__db_id", "__reservation_id", "__room_id", "__guest_name", "__number_of_guests",
+                 "__check_in_date", "__check_out_date")
+
     def __init__(
             self,
             db_id: int = None,
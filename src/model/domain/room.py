@@ -15,6 +15,8 @@ class Room(FloorElement):
         price_per_night (float): Price per night for the room.
     """
 
+    __slots__ = ("__number", "__capacity", "__price_per_night")
+
     def __init__(
             self,
             db_id: int = None,
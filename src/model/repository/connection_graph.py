@@ -0,0 +1,169 @@
+from abc import ABC, abstractmethod
+
+from src.utilities.exceptions import RepositoryError
+
+
+DEFAULT_GRAPH_BACKEND = "networkx"
+
+
+class ConnectionGraph(ABC):
+    """
+    Abstract undirected graph of the connections between floor elements, keyed by element ID.
+
+    Holds only what HotelRepository needs: nodes, edges, degrees and edge listings. Removing an edge or a node that
+    is not in the graph is a no-op.
+    """
+
+    @abstractmethod
+    def __contains__(self, node: int) -> bool:
+        ...
+
+    @abstractmethod
+    def add_node(self, node: int) -> None:
+        ...
+
+    def add_nodes_from(self, nodes) -> None:
+        for node in nodes:
+            self.add_node(node)
+
+    @abstractmethod
+    def remove_node(self, node: int) -> None:
+        """Removes a node and all its edges."""
+        ...
+
+    @abstractmethod
+    def add_edge(self, u: int, v: int) -> None:
+        """Adds an edge, adding its end nodes if needed."""
+        ...
+
+    def add_edges_from(self, edges) -> None:
+        for u, v in edges:
+            self.add_edge(u, v)
+
+    @abstractmethod
+    def remove_edge(self, u: int, v: int) -> None:
+        ...
+
+    def remove_edges_from(self, edges) -> None:
+        for u, v in edges:
+            self.remove_edge(u, v)
+
+    @abstractmethod
+    def degree(self, node: int) -> int:
+        ...
+
+    @abstractmethod
+    def neighbors(self, node: int):
+        ...
+
+    @abstractmethod
+    def edges(self, node: int = None) -> list[tuple[int, int]]:
+        """Returns the edges of node, each as (node, neighbour), or every edge once if node is None."""
+        ...
+
+
+class NetworkXGraph(ConnectionGraph):
+    """ConnectionGraph backed by networkx.Graph, for callers that want the networkx algorithms on hand."""
+
+    def __init__(self):
+        # Imported here, so that the adjacency backend does not pay for the networkx import.
+        import networkx as nx
+        self.__graph = nx.Graph()
+
+    @property
+    def graph(self):
+        return self.__graph
+
+    def __contains__(self, node: int) -> bool:
+        return node in self.__graph
+
+    def add_node(self, node: int) -> None:
+        self.__graph.add_node(node)
+
+    def add_nodes_from(self, nodes) -> None:
+        self.__graph.add_nodes_from(nodes)
+
+    def remove_node(self, node: int) -> None:
+        if node in self.__graph:
+            self.__graph.remove_node(node)
+
+    def add_edge(self, u: int, v: int) -> None:
+        self.__graph.add_edge(u, v)
+
+    def add_edges_from(self, edges) -> None:
+        self.__graph.add_edges_from(edges)
+
+    def remove_edge(self, u: int, v: int) -> None:
+        if self.__graph.has_edge(u, v):
+            self.__graph.remove_edge(u, v)
+
+    def remove_edges_from(self, edges) -> None:
+        self.__graph.remove_edges_from(edges)
+
+    def degree(self, node: int) -> int:
+        return self.__graph.degree(node)
+
+    def neighbors(self, node: int):
+        return self.__graph.neighbors(node)
+
+    def edges(self, node: int = None) -> list[tuple[int, int]]:
+        return list(self.__graph.edges if node is None else self.__graph.edges(node))
+
+
+class AdjacencyGraph(ConnectionGraph):
+    """Compact ConnectionGraph: one set of neighbour IDs per node, without per-node or per-edge attribute dicts."""
+
+    def __init__(self):
+        self.__adjacency = {}
+
+    def __contains__(self, node: int) -> bool:
+        return node in self.__adjacency
+
+    def add_node(self, node: int) -> None:
+        if node not in self.__adjacency:
+            self.__adjacency[node] = set()
+
+    def remove_node(self, node: int) -> None:
+        for neighbour in self.__adjacency.pop(node, ()):
+            if neighbour != node:
+                self.__adjacency[neighbour].discard(node)
+
+    def add_edge(self, u: int, v: int) -> None:
+        self.__adjacency.setdefault(u, set()).add(v)
+        self.__adjacency.setdefault(v, set()).add(u)
+
+    def remove_edge(self, u: int, v: int) -> None:
+        if u in self.__adjacency and v in self.__adjacency:
+            self.__adjacency[u].discard(v)
+            self.__adjacency[v].discard(u)
+
+    def degree(self, node: int) -> int:
+        neighbours = self.__adjacency[node]
+        # A self-loop counts twice, as in networkx
+        return len(neighbours) + (node in neighbours)
+
+    def neighbors(self, node: int):
+        return iter(self.__adjacency[node])
+
+    def edges(self, node: int = None) -> list[tuple[int, int]]:
+        if node is not None:
+            return [(node, neighbour) for neighbour in self.__adjacency.get(node, ())]
+        seen = set()
+        edges = []
+        for u, neighbours in self.__adjacency.items():
+            seen.add(u)
+            edges.extend((u, v) for v in neighbours if v not in seen or v == u)
+        return edges
+
+
+GRAPH_BACKENDS = {
+    "networkx": NetworkXGraph,
+    "adjacency": AdjacencyGraph,
+}
+
+
+def create_graph(backend: str = DEFAULT_GRAPH_BACKEND) -> ConnectionGraph:
+    """Returns an empty connection graph of the backend with the given name."""
+    if backend not in GRAPH_BACKENDS:
+        raise RepositoryError(f"Unknown graph backend {backend}! Expected one of {sorted(GRAPH_BACKENDS)}.")
+    return GRAPH_BACKENDS[backend]()
@@ -1,26 +1,57 @@
+import copy
 import sqlite3
-import networkx as nx
+from bisect import bisect_left, insort
 
 from src.model.database import database_operations as db
+from src.model.database import unit_of_work as uow
 from src.model.domain.floor import Floor
 from src.model.domain.floor_element import FloorElement
 from src.model.domain.room import Room
+from src.model.repository.connection_graph import DEFAULT_GRAPH_BACKEND, create_graph
+from src.model.repository.ngram_index import NgramIndex
+from src.utilities.change_events import (ChangeBus, EntityAdded, EntityUpdated, EntityRemoved, EntitiesReloaded,
+                                          FLOOR, ELEMENT)
 from src.utilities.exceptions import FloorAlreadyExistsError, FloorNotFoundError, ElementNotFoundError
 
 
 class HotelRepository:
     """
     Repository for managing hotel floors and elements with in-memory caching and SQLite persistence.
+
+    The connections between elements are kept in a ConnectionGraph of the given backend: "networkx" or the more
+    compact "adjacency" (see connection_graph.GRAPH_BACKENDS).
+
+    Every change to a floor (its name, level or elements) and to a room stamps it with the next value of a
+    monotonically increasing generation counter, so callers can cache what they derive from them and rebuild it only
+    when the generation changed. A reload stamps everything.
+
+    Every change to a floor or an element is published on the events bus (see change_events): EntityAdded,
+    EntityUpdated (with a copy of an element before the change), EntityRemoved, and EntitiesReloaded after a reload.
+    Removing a floor publishes the removal of each of its elements, then of the floor.
     """
 
-    def __init__(self, connection: sqlite3.Connection):
+    def __init__(self, connection: sqlite3.Connection, graph_backend: str = DEFAULT_GRAPH_BACKEND):
         self.__connection = connection
+        self.__graph_backend = graph_backend
 
-        self.__graph = nx.Graph()
+        self.__graph = create_graph(graph_backend)
         self.__floors_by_id = {}
         self.__floors_by_name = {}
+        self.__floors_by_element_id = {}
+        self.__intra_edges_by_floor = {}
+        self.__inter_edges_by_floor = {}
+        self.__staircases_by_level = {}
         self.__rooms_by_id = {}
         self.__rooms_by_capacity = {}
+        self.__capacities = []
+        self.__rooms_by_number = {}
+        self.__room_numbers = NgramIndex()
+
+        self.__generation = 0
+        self.__loaded_generation = 0
+        self.__floor_generations = {}
+        self.__room_generations = {}
+        self.__events = ChangeBus()
 
         self.load_from_db()
 
@@ -28,49 +59,127 @@ class HotelRepository:
     def connection(self) -> sqlite3.Connection:
         return self.__connection
 
+    @property
+    def events(self) -> ChangeBus:
+        """The bus on which the changes to the floors and elements are published."""
+        return self.__events
+
+    def transaction(self):
+        """Opens a unit of work on the repository connection; the caches are reloaded if it rolls back."""
+        return uow.unit_of_work(self.__connection)
+
     # Data persistence
-    def load_from_db(self):
-        """Loads all data from the database into the repository."""
-        floors = db.select_all_floors(self.__connection)
+    def reload(self):
+        """Discards the in-memory state and loads it again from the database. O(F + E) complexity."""
+        self.__graph = create_graph(self.__graph_backend)
+        self.__floors_by_id = {}
+        self.__floors_by_name = {}
+        self.__floors_by_element_id = {}
+        self.__intra_edges_by_floor = {}
+        self.__inter_edges_by_floor = {}
+        self.__staircases_by_level = {}
+        self.__rooms_by_id = {}
+        self.__rooms_by_capacity = {}
+        self.__capacities = []
+        self.__rooms_by_number = {}
+        self.__room_numbers = NgramIndex()
+        self.__generation += 1
+        self.__loaded_generation = self.__generation
+        self.__floor_generations = {}
+        self.__room_generations = {}
+        self.load_from_db()
+        self.__events.publish(EntitiesReloaded(FLOOR))
+        self.__events.publish(EntitiesReloaded(ELEMENT))
 
-        for db_id, name, level in floors:
+    def load_from_db(self):
+        """
+        Loads all data from the database into the repository. Floors and elements are read with one query each and
+        the connection graph is built in one pass over each floor grid plus one pass over the staircases,
+        producing the same connections as adding the elements one by one and refreshing the staircases.
+        O(F + E) complexity.
+        """
+        for db_id, name, level in db.select_all_floors(self.__connection):
             floor = Floor(db_id, name, level)
             self.__floors_by_name[floor.name] = floor
             self.__floors_by_id[floor.db_id] = floor
 
-            elements = db.select_elements_by_floor_id(self.__connection, db_id)
-            for row in elements:
-                if row[1] == "room":
-                    element = Room(
-                        db_id=row[0],
-                        type=row[1],
-                        floor_id=row[2],
-                        position=(row[3], row[4]),
-                        number=row[5],
-                        capacity=row[6],
-                        price_per_night=row[7]
-                    )
-                    self.__rooms_by_id[element.db_id] = element
-                    if element.capacity not in self.__rooms_by_capacity:
-                        self.__rooms_by_capacity[element.capacity] = []
-                    self.__rooms_by_capacity[element.capacity].append(element)
-                else:
-                    element = FloorElement(
-                        db_id=row[0],
-                        type=row[1],
-                        floor_id=row[2],
-                        position=(row[3], row[4])
-                    )
-                floor.add_element(element)
-                self.__graph.add_node(element.db_id, element=element)
-                self.handle_connections(element)
-        self.refresh_staircases()
+        adjacency = {}
+        for row in db.select_all_elements(self.__connection):
+            floor = self.__floors_by_id.get(row[2])
+            if floor is None:
+                continue
+            element = self._element_from_row(row)
+            floor.add_element(element)
+            self.__floors_by_element_id[element.db_id] = floor
+            if element.type == "room":
+                self._index_room(element)
+            elif element.type == "staircase":
+                self._index_staircase(element, floor.level)
+
+            # Same-floor links, seeing only the elements loaded before this one
+            adjacency[element.db_id] = set()
+            neighbours = floor.get_element_neighbors(element.db_id).values()
+            for neighbour_id in self._same_floor_links(element, neighbours, lambda node: len(adjacency[node])):
+                adjacency[element.db_id].add(neighbour_id)
+                adjacency[neighbour_id].add(element.db_id)
+
+        # Staircases are then relinked against the complete grids, as refresh_staircases does
+        for floor in self.__floors_by_id.values():
+            for element in floor.elements.values():
+                if element.type != "staircase":
+                    continue
+                for neighbour_id in adjacency[element.db_id]:
+                    adjacency[neighbour_id].discard(element.db_id)
+                adjacency[element.db_id].clear()
+
+                neighbours = floor.get_element_neighbors(element.db_id).values()
+                linked = self._same_floor_links(element, neighbours, lambda node: len(adjacency[node]))
+                linked.extend(self._staircases_above_and_below(element, floor.level))
+                for neighbour_id in linked:
+                    adjacency[element.db_id].add(neighbour_id)
+                    adjacency[neighbour_id].add(element.db_id)
+
+        self.__graph.add_nodes_from(
+            element.db_id for floor in self.__floors_by_id.values() for element in floor.elements.values()
+        )
+        edges = [
+            (element_id, neighbour_id)
+            for element_id, neighbour_ids in adjacency.items() for neighbour_id in neighbour_ids
+            if element_id < neighbour_id
+        ]
+        self.__graph.add_edges_from(edges)
+        for u, v in edges:
+            self._index_edge(u, v)
+
+    @staticmethod
+    def _element_from_row(row) -> FloorElement | Room:
+        """Builds a Room or FloorElement from an elements table row."""
+        if row[1] == "room":
+            return Room(
+                db_id=row[0],
+                type=row[1],
+                floor_id=row[2],
+                position=(row[3], row[4]),
+                number=row[5],
+                capacity=row[6],
+                price_per_night=row[7]
+            )
+        return FloorElement(
+            db_id=row[0],
+            type=row[1],
+            floor_id=row[2],
+            position=(row[3], row[4])
+        )
 
     # Getters
     def get_all_floors(self) -> list[Floor]:
         """Returns a list of all floors. Theta(1) complexity."""
         return list(self.__floors_by_id.values())
 
+    def count_floors(self) -> int:
+        """Returns the number of floors. Theta(1) complexity."""
+        return len(self.__floors_by_id)
+
     def get_floor_by_id(self, floor_id: int) -> Floor | None:
         """Returns the floor with the specified ID. Theta(1) complexity."""
         if floor_id not in self.__floors_by_id:
@@ -95,6 +204,21 @@ class HotelRepository:
             raise FloorNotFoundError(f"Floor {floor_id} not found!")
         return self.__floors_by_id[floor_id].elements
 
+    def get_floor_generation(self, floor_id: int) -> int:
+        """Returns the generation of the last change to the floor, its name, level or elements. Theta(1) complexity."""
+        return self.__floor_generations.get(floor_id, self.__loaded_generation)
+
+    def get_room_generation(self, room_id: int) -> int:
+        """Returns the generation of the last change to the room. Theta(1) complexity."""
+        return self.__room_generations.get(room_id, self.__loaded_generation)
+
+    def get_element_by_id(self, element_id: int) -> FloorElement | Room:
+        """Returns the element of any type with the specified ID. Theta(1) complexity."""
+        floor = self.__floors_by_element_id.get(element_id)
+        if floor is None:
+            raise ElementNotFoundError(f"Element {element_id} not found!")
+        return floor.elements[element_id]
+
     def get_all_rooms(self) -> list[Room]:
         """Returns a list of all rooms. Theta(1) complexity."""
         return list(self.__rooms_by_id.values())
@@ -107,54 +231,100 @@ class HotelRepository:
         return room
 
     def get_room_by_number(self, room_number: str) -> Room | None:
-        """Returns the room with the specified number. O(R) complexity."""
-        for room in self.__rooms_by_id.values():
-            if room.number == room_number:
-                return room
-        raise ElementNotFoundError(f"Room with number {room_number} not found!")
+        """Returns the room with the specified number. Theta(1) complexity."""
+        rooms = self.__rooms_by_number.get(room_number)
+        if not rooms:
+            raise ElementNotFoundError(f"Room with number {room_number} not found!")
+        return next(iter(rooms.values()))
+
+    def get_rooms_by_partial_number(self, partial_number: str) -> list[Room]:
+        """
+        Returns the rooms whose number contains partial_number, case-insensitive, ordered by ID.
+        O(k log k) complexity for k matches, through the n-gram index.
+        """
+        return [self.__rooms_by_id[room_id] for room_id in sorted(self.__room_numbers.search(partial_number))]
 
     def get_rooms_by_capacity(self, capacity: int) -> list[Room]:
-        """Returns a list of rooms that can accommodate the specified number of guests. Theta(1) complexity."""
-        return self.__rooms_by_capacity.get(capacity, [])
+        """Returns a list of rooms whose capacity is exactly the specified one. O(RC) complexity."""
+        return list(self.__rooms_by_capacity.get(capacity, {}).values())
+
+    def get_rooms_by_min_capacity(self, min_capacity: int, best_fit: bool = False) -> list[Room]:
+        """
+        Returns the rooms that can accommodate at least min_capacity guests, by increasing capacity.
+        With best_fit, rooms of equal capacity are ordered by price per night, then ID, so the first room is the
+        smallest and cheapest adequate one. O(log K + R) complexity for K distinct capacities and R results,
+        plus O(R log R) with best_fit.
+        """
+        rooms = []
+        for capacity in self.__capacities[bisect_left(self.__capacities, min_capacity):]:
+            bucket = self.__rooms_by_capacity[capacity].values()
+            if best_fit:
+                bucket = sorted(bucket, key=lambda room: (room.price_per_night, room.db_id))
+            rooms.extend(bucket)
+        return rooms
 
     def get_connections_by_floor_id(self, floor_id: int) -> list[tuple[int, int]]:
-        """Returns a list of connections (edges) between elements on the specified floor. O(E) complexity."""
-        floor = self.__floors_by_id[floor_id]
-        element_ids = set(floor.elements.keys())
-        connections = set()
-        for u, v in self.__graph.edges():
-            if u in element_ids and v in element_ids:
-                connections.add(tuple(sorted((u, v))))
-        return list(connections)
+        """
+        Returns a list of connections (edges) between elements on the specified floor, each as (smaller ID, larger
+        ID). O(E_f) complexity for E_f edges on that floor.
+        """
+        if floor_id not in self.__floors_by_id:
+            raise FloorNotFoundError(f"Floor {floor_id} not found!")
+        return list(self.__intra_edges_by_floor.get(floor_id, ()))
+
+    def get_inter_floor_connections_by_floor_id(self, floor_id: int) -> list[tuple[int, int]]:
+        """
+        Returns a list of connections (edges) between the staircases of the specified floor and those of the floors
+        above and below, each as (smaller ID, larger ID). O(E_f) complexity.
+        """
+        if floor_id not in self.__floors_by_id:
+            raise FloorNotFoundError(f"Floor {floor_id} not found!")
+        return list(self.__inter_edges_by_floor.get(floor_id, ()))
 
     def get_all_connections(self) -> list[tuple[int, int]]:
-        return list(self.__graph.edges)
+        """Returns every connection (edge) in the hotel once. O(E) complexity."""
+        return self.__graph.edges()
 
     # CRUD operations
 
     # Floors
     def add_floor(self, floor: Floor) -> int:
         """Adds a new floor to the repository and the database. Theta(1) complexity."""
+        uow.join(self.__connection, self.reload)
         if floor.db_id in self.__floors_by_id or floor.name in self.__floors_by_name:
             raise FloorAlreadyExistsError(f"Floor {floor.name} already exists!")
 
         floor.db_id = db.insert_floor(self.__connection, floor.name, floor.level)
         self.__floors_by_id[floor.db_id] = floor
         self.__floors_by_name[floor.name] = floor
-        self.refresh_staircases()
+        self._touch(self.__floor_generations, floor.db_id)
+        self.__events.publish(EntityAdded(FLOOR, floor.db_id, floor))
         return floor.db_id
 
     def move_floor(self, floor_id: int, new_level: int) -> None:
-        """Changes the level of the specified floor. Theta(1) complexity."""
+        """
+        Changes the level of the specified floor and relinks its staircases to the floors around the new level.
+        O(S) complexity for S staircases on the floor.
+        """
+        uow.join(self.__connection, self.reload)
         if floor_id not in self.__floors_by_id:
             raise FloorNotFoundError(f"Floor {floor_id} not found!")
         db.update_floor_level(self.__connection, floor_id, new_level)
         floor = self.__floors_by_id[floor_id]
+        staircases = self._staircases_of(floor)
+        for staircase in staircases:
+            self._unlink_other_floors(staircase)
+            self._unindex_staircase(staircase, floor.level)
         floor.level = new_level
-        self.refresh_staircases()
+        for staircase in staircases:
+            self._index_staircase(staircase, new_level)
+            self._link_other_floors(staircase, new_level)
+        self._touch(self.__floor_generations, floor_id)
+        self.__events.publish(EntityUpdated(FLOOR, floor_id, floor))
 
     def rename_floor(self, old_name: str, new_name: str) -> None:
         """Renames the specified floor. Theta(1) complexity."""
+        uow.join(self.__connection, self.reload)
         floor = self.__floors_by_name.get(old_name)
         if not floor:
             raise FloorNotFoundError(f"Floor {old_name} not found!")
@@ -165,21 +335,37 @@ class HotelRepository:
         del self.__floors_by_name[old_name]
         floor.name = new_name
         self.__floors_by_name[new_name] = floor
+        self._touch(self.__floor_generations, floor.db_id)
+        self.__events.publish(EntityUpdated(FLOOR, floor.db_id, floor))
 
     def remove_floor(self, floor_id: int) -> None:
-        """Removes the specified floor from the repository and the database. Theta(1) complexity."""
+        """Removes the specified floor from the repository and the database. O(E) complexity for E floor elements."""
+        uow.join(self.__connection, self.reload)
         if floor_id not in self.__floors_by_id:
             raise FloorNotFoundError(f"Floor {floor_id} not found!")
 
         db.delete_floor(self.__connection, floor_id)
         floor = self.__floors_by_id[floor_id]
+        for staircase in self._staircases_of(floor):
+            self._unlink_other_floors(staircase)
+            self._unindex_staircase(staircase, floor.level)
+        for element_id in floor.elements:
+            self.__floors_by_element_id.pop(element_id, None)
+            if element_id in self.__rooms_by_id:
+                self._touch(self.__room_generations, element_id)
+        self._touch(self.__floor_generations, floor_id)
+        self.__intra_edges_by_floor.pop(floor_id, None)
+        self.__inter_edges_by_floor.pop(floor_id, None)
         del self.__floors_by_id[floor.db_id]
         del self.__floors_by_name[floor.name]
-        self.refresh_staircases()
+        for element_id, element in floor.elements.items():
+            self.__events.publish(EntityRemoved(ELEMENT, element_id, element))
+        self.__events.publish(EntityRemoved(FLOOR, floor_id, floor))
 
     # Floor elements
     def add_element(self, element: FloorElement | Room) -> int:
         """Adds a new element to the repository and the database. Theta(1) complexity."""
+        uow.join(self.__connection, self.reload)
         if element.floor_id not in self.__floors_by_id:
             raise FloorNotFoundError(f"Floor {element.floor_id} not found!")
 
@@ -195,98 +381,231 @@ class HotelRepository:
             )
         floor = self.__floors_by_id[element.floor_id]
         floor.add_element(element)
-        self.__graph.add_node(element.db_id, element=element)
+        self.__floors_by_element_id[element.db_id] = floor
+        if element.type == "staircase":
+            self._index_staircase(element, floor.level)
+        self.__graph.add_node(element.db_id)
         self.handle_connections(element)
 
         if element.type == "room":
-            self.__rooms_by_id[element.db_id] = element
-            if element.capacity not in self.__rooms_by_capacity:
-                self.__rooms_by_capacity[element.capacity] = []
-            self.__rooms_by_capacity[element.capacity].append(element)
+            self._index_room(element)
+        self._touch_element(element.db_id, floor.db_id)
+        self.__events.publish(EntityAdded(ELEMENT, element.db_id, element))
         return element.db_id
 
     def move_element(self, element_id: int, new_position: tuple[int, int]) -> None:
-        """Moves the specified element to a new position. O(F) complexity."""
+        """Moves the specified element to a new position. Theta(1) complexity to find its floor."""
+        uow.join(self.__connection, self.reload)
         db.update_element_position(self.__connection, element_id, new_x=new_position[0], new_y=new_position[1])
-        for floor in self.__floors_by_id.values():
-            if element_id in floor.elements:
-                floor.move_element(element_id, new_position)
-                self.handle_connections(floor.elements[element_id])
-                break
+        floor = self.__floors_by_element_id.get(element_id)
+        if floor is not None:
+            element = floor.elements[element_id]
+            previous = copy.copy(element)
+            if element.type == "staircase":
+                self._unindex_staircase(element, floor.level)
+            floor.move_element(element_id, new_position)
+            if element.type == "staircase":
+                self._index_staircase(element, floor.level)
+            self.handle_connections(element)
+            self._touch_element(element_id, floor.db_id)
+            self.__events.publish(EntityUpdated(ELEMENT, element_id, element, previous))
 
     def edit_room(self, element_id: int, new_number: str, new_capacity: int, new_price_per_night: float) -> None:
-        """Edits the properties of the specified room. O(F) complexity."""
+        """Edits the properties of the specified room. O(K + L) complexity, for its capacity and number indexes."""
+        uow.join(self.__connection, self.reload)
         db.update_element(self.__connection, element_id, new_number, new_capacity, new_price_per_night)
-        for floor in self.__floors_by_id.values():
-            if element_id in floor.elements:
-                floor.edit_room(element_id, new_number, new_capacity, new_price_per_night)
-                break
+        room = self.__rooms_by_id.get(element_id)
+        if room is not None:
+            previous = copy.copy(room)
+            self._unindex_room(room)
+        floor = self.__floors_by_element_id.get(element_id)
+        if floor is not None:
+            floor.edit_room(element_id, new_number, new_capacity, new_price_per_night)
+        if room is not None:
+            self._index_room(room)
+        if floor is not None:
+            self._touch_element(element_id, floor.db_id)
+        if room is not None:
+            self.__events.publish(EntityUpdated(ELEMENT, element_id, room, previous))
 
     def remove_element(self, element_id: int, element_type: str, floor_id: int) -> None:
-        """Removes the specified element from the repository and the database. O(RC) complexity."""
+        """Removes the specified element from the repository and the database. O(K + L) complexity for a room."""
+        uow.join(self.__connection, self.reload)
         self.delete_all_connections(element_id)
         self.__graph.remove_node(element_id)
         db.delete_element(self.__connection, element_id)
 
         if element_type == "room" and element_id in self.__rooms_by_id:
-            element = self.__rooms_by_id[element_id]
-            del self.__rooms_by_id[element_id]
-            if element.capacity in self.__rooms_by_capacity:
-                self.__rooms_by_capacity[element.capacity] = [
-                    room for room in self.__rooms_by_capacity[element.capacity]
-                    if room.db_id != element_id
-                ]
-                if not self.__rooms_by_capacity[element.capacity]:
-                    del self.__rooms_by_capacity[element.capacity]
+            self._unindex_room(self.__rooms_by_id[element_id])
+        elif element_type == "staircase" and element_id in self.__floors_by_element_id:
+            self._unindex_staircase(self.__floors_by_id[floor_id].elements[element_id],
+                                    self.__floors_by_id[floor_id].level)
 
         floor = self.__floors_by_id[floor_id]
+        element = floor.elements.get(element_id)
         floor.delete_element(element_id)
+        self.__floors_by_element_id.pop(element_id, None)
+        self._touch(self.__floor_generations, floor_id)
+        if element_type == "room":
+            self._touch(self.__room_generations, element_id)
+        self.__events.publish(EntityRemoved(ELEMENT, element_id, element))
+
+    def _touch(self, generations: dict, key: int) -> None:
+        """Stamps key with the next generation. Theta(1) complexity."""
+        self.__generation += 1
+        generations[key] = self.__generation
+
+    def _touch_element(self, element_id: int, floor_id: int) -> None:
+        """Stamps the floor of a changed element, and the element itself if it is a room."""
+        self._touch(self.__floor_generations, floor_id)
+        if element_id in self.__rooms_by_id:
+            self._touch(self.__room_generations, element_id)
+
+    def _index_room(self, room: Room) -> None:
+        """Adds a room to the ID, capacity and number indexes. O(K + L) complexity for a number of length L."""
+        self.__rooms_by_id[room.db_id] = room
+        rooms = self.__rooms_by_capacity.get(room.capacity)
+        if rooms is None:
+            rooms = self.__rooms_by_capacity[room.capacity] = {}
+            insort(self.__capacities, room.capacity)
+        rooms[room.db_id] = room
+        self.__rooms_by_number.setdefault(room.number, {})[room.db_id] = room
+        self.__room_numbers.add(room.db_id, room.number)
+
+    def _unindex_room(self, room: Room) -> None:
+        """Removes a room from the ID, capacity and number indexes. O(K + L) complexity for K distinct capacities."""
+        self.__rooms_by_id.pop(room.db_id, None)
+        rooms = self.__rooms_by_capacity.get(room.capacity)
+        if rooms is not None:
+            rooms.pop(room.db_id, None)
+            if not rooms:
+                del self.__rooms_by_capacity[room.capacity]
+                del self.__capacities[bisect_left(self.__capacities, room.capacity)]
+        rooms = self.__rooms_by_number.get(room.number)
+        if rooms is not None:
+            rooms.pop(room.db_id, None)
+            if not rooms:
+                del self.__rooms_by_number[room.number]
+        self.__room_numbers.remove(room.db_id)
 
     def handle_connections(self, element: FloorElement) -> None:
-        """Handles the connections of the specified element based on its type and position. O(F + E) complexity."""
+        """
+        Handles the connections of the specified element based on its type and position. O(D) complexity for D
+        connections: same-floor neighbours come from the floor grid, staircases above and below from the staircase
+        index.
+        """
         if element.db_id not in self.__graph:
             raise ElementNotFoundError(f"Element {element.db_id} not found in graph!")
 
         self.delete_all_connections(element.db_id)
 
         neighbours = self.__floors_by_id[element.floor_id].get_element_neighbors(element.db_id).values()
-        if not neighbours:
-            return
+        for neighbour_id in self._same_floor_links(element, neighbours, self.__graph.degree):
+            self.add_connection(element.db_id, neighbour_id)
         if element.type == "staircase":
-            for neighbour in neighbours:
+            self._link_other_floors(element, self.__floors_by_id[element.floor_id].level)
+
+    @staticmethod
+    def _same_floor_links(element: FloorElement, neighbours, degree) -> list[int]:
+        """
+        Returns the IDs of the neighbours an element connects to on its own floor: staircases and hallways join
+        each other and any room that is not connected yet, while a room joins its first neighbouring hallway.
+        """
+        if element.type == "staircase" or element.type == "hallway":
+            return [
+                neighbour.db_id for neighbour in neighbours
                 if (neighbour.type == "staircase" or neighbour.type == "hallway"
-                        or (neighbour.type == "room" and self.__graph.degree(neighbour.db_id) == 0)):
-                    self.add_connection(element.db_id, neighbour.db_id)
-            for floor in self.__floors_by_id.values():
-                if (floor.db_id != element.floor_id and
-                        abs(floor.level - self.__floors_by_id[element.floor_id].level) == 1):
-                    for other_element in floor.elements.values():
-                        if other_element.type == "staircase" and other_element.position == element.position:
-                            self.add_connection(element.db_id, other_element.db_id)
-        elif element.type == "hallway":
-            for neighbour in neighbours:
-                if (neighbour.type == "staircase" or neighbour.type == "hallway"
-                        or (neighbour.type == "room" and self.__graph.degree(neighbour.db_id) == 0)):
-                    self.add_connection(element.db_id, neighbour.db_id)
-        elif element.type == "room":
+                    or (neighbour.type == "room" and degree(neighbour.db_id) == 0))
+            ]
+        if element.type == "room":
             for neighbour in neighbours:
                 if neighbour.type == "hallway":
-                    self.add_connection(element.db_id, neighbour.db_id)
-                    break
-        else:
-            return
+                    return [neighbour.db_id]
+        return []
 
     def add_connection(self, from_id: int, to_id: int) -> None:
         '''Adds a connection (edge) between two elements in the graph. Theta(1) complexity.'''
         self.__graph.add_edge(from_id, to_id)
+        self._index_edge(from_id, to_id)
 
     def delete_all_connections(self, element_id: int) -> None:
         """Deletes all connections (edges) associated with the specified element in the graph. O(D) complexity."""
-        self.__graph.remove_edges_from(list(self.__graph.edges(element_id)))
+        edges = list(self.__graph.edges(element_id))
+        self.__graph.remove_edges_from(edges)
+        for u, v in edges:
+            self._unindex_edge(u, v)
+
+    def _index_edge(self, u: int, v: int) -> None:
+        """Adds an edge to the edge set of its floor, or to the inter-floor sets of both its floors. Theta(1)."""
+        for floor_id, edges in self._edge_sets(u, v):
+            edges.setdefault(floor_id, set()).add((min(u, v), max(u, v)))
+
+    def _unindex_edge(self, u: int, v: int) -> None:
+        """Removes an edge from the per-floor edge sets. Theta(1) complexity."""
+        for floor_id, edges in self._edge_sets(u, v):
+            floor_edges = edges.get(floor_id)
+            if floor_edges is None:
+                continue
+            floor_edges.discard((min(u, v), max(u, v)))
+            if not floor_edges:
+                del edges[floor_id]
+
+    def _edge_sets(self, u: int, v: int) -> list[tuple[int, dict]]:
+        """The (floor ID, edge sets by floor) pairs an edge belongs to; ends on a removed floor are skipped."""
+        floor_ids = {floor.db_id for floor in (self.__floors_by_element_id.get(u), self.__floors_by_element_id.get(v))
+                     if floor is not None}
+        if len(floor_ids) == 1 and u in self.__floors_by_element_id and v in self.__floors_by_element_id:
+            return [(floor_ids.pop(), self.__intra_edges_by_floor)]
+        return [(floor_id, self.__inter_edges_by_floor) for floor_id in floor_ids]
 
     def refresh_staircases(self):
-        """Refreshes all staircase connections across all floors. O(F(E + F)) complexity."""
+        """
+        Relinks every staircase to the staircases at the same position on the floors above and below. Floor changes
+        relink only the staircases they affect, so this is only needed to rebuild all links. O(S) complexity.
+        """
         for floor in self.__floors_by_id.values():
-            for element in floor.elements.values():
-                if element.type == "staircase":
-                    self.handle_connections(element)
+            for staircase in self._staircases_of(floor):
+                self._unlink_other_floors(staircase)
+        for floor in self.__floors_by_id.values():
+            for staircase in self._staircases_of(floor):
+                self._link_other_floors(staircase, floor.level)
+
+    def _staircases_of(self, floor: Floor) -> list[FloorElement]:
+        """The staircases of a floor, read from the staircase index. O(S_f) complexity."""
+        return [floor.elements[element_id]
+                for element_ids in self.__staircases_by_level.get(floor.level, {}).values()
+                for element_id in element_ids if element_id in floor.elements]
+
+    def _staircases_above_and_below(self, staircase: FloorElement, level: int) -> list[int]:
+        """IDs of the staircases at the same position one level up or down. Theta(1) complexity."""
+        return [element_id
+                for other_level in (level - 1, level + 1)
+                for element_id in self.__staircases_by_level.get(other_level, {}).get(staircase.position, ())]
+
+    def _link_other_floors(self, staircase: FloorElement, level: int) -> None:
+        """Connects a staircase on the given level to the staircases above and below it. Theta(1) complexity."""
+        for element_id in self._staircases_above_and_below(staircase, level):
+            self.add_connection(staircase.db_id, element_id)
+
+    def _unlink_other_floors(self, staircase: FloorElement) -> None:
+        """Deletes the connections of a staircase to elements of other floors. O(D) complexity."""
+        for neighbour_id in list(self.__graph.neighbors(staircase.db_id)):
+            neighbour_floor = self.__floors_by_element_id.get(neighbour_id)
+            if neighbour_floor is None or neighbour_floor.db_id != staircase.floor_id:
+                self.__graph.remove_edge(staircase.db_id, neighbour_id)
+                self._unindex_edge(staircase.db_id, neighbour_id)
+
+    def _index_staircase(self, staircase: FloorElement, level: int) -> None:
+        """Adds a staircase to the (level, position) index. Theta(1) complexity."""
+        self.__staircases_by_level.setdefault(level, {}).setdefault(staircase.position, set()).add(staircase.db_id)
+
+    def _unindex_staircase(self, staircase: FloorElement, level: int) -> None:
+        """Removes a staircase from the (level, position) index. Theta(1) complexity."""
+        positions = self.__staircases_by_level.get(level)
+        if positions is None or staircase.position not in positions:
+            return
+        positions[staircase.position].discard(staircase.db_id)
+        if not positions[staircase.position]:
+            del positions[staircase.position]
+            if not positions:
+                del self.__staircases_by_level[level]
@@ -0,0 +1,90 @@
+from bisect import bisect_left, bisect_right, insort
+
+
+class IntervalIndex:
+    """
+    Index of closed intervals grouped by key, backed by sorted lists and binary search.
+
+    Two intervals [a, b] and [c, d] overlap when a <= d and c <= b, which matches the
+    reservation overlap rule used by the controller (a check-out day blocks a check-in on the same day).
+    Bounds can be any mutually comparable values that support subtraction (dates, ints).
+    """
+
+    def __init__(self):
+        self.__starts = {}
+        self.__entries = {}
+        self.__ends = {}
+        self.__max_span = {}
+
+    def __contains__(self, key) -> bool:
+        return key in self.__entries
+
+    def add(self, key, start, end, item_id) -> None:
+        """Adds the interval [start, end] of item_id under key. O(log n) search + O(n) list insert."""
+        if key not in self.__entries:
+            self.__starts[key] = []
+            self.__entries[key] = []
+            self.__ends[key] = []
+            self.__max_span[key] = end - start
+
+        starts = self.__starts[key]
+        position = bisect_right(starts, start)
+        starts.insert(position, start)
+        self.__entries[key].insert(position, (start, end, item_id))
+        insort(self.__ends[key], end)
+
+        span = end - start
+        if span > self.__max_span[key]:
+            self.__max_span[key] = span
+
+    def remove(self, key, start, end, item_id) -> None:
+        """Removes the interval [start, end] of item_id under key. O(log n) search + O(n) list delete."""
+        starts = self.__starts.get(key)
+        if not starts:
+            return
+
+        entries = self.__entries[key]
+        low, high = bisect_left(starts, start), bisect_right(starts, start)
+        for position in range(low, high):
+            if entries[position][2] == item_id:
+                del starts[position]
+                del entries[position]
+                break
+        else:
+            return
+
+        ends = self.__ends[key]
+        del ends[bisect_left(ends, end)]
+
+        if not starts:
+            del self.__starts[key]
+            del self.__entries[key]
+            del self.__ends[key]
+            del self.__max_span[key]
+
+    def count_overlapping(self, key, start, end) -> int:
+        """Returns how many intervals under key overlap [start, end]. O(log n) complexity."""
+        starts = self.__starts.get(key)
+        if not starts:
+            return 0
+        ends = self.__ends[key]
+        ending_before = bisect_left(ends, start)
+        starting_after = len(starts) - bisect_right(starts, end)
+        return len(starts) - ending_before - starting_after
+
+    def is_free(self, key, start, end) -> bool:
+        """Checks that no interval under key overlaps [start, end]. O(log n) complexity."""
+        return self.count_overlapping(key, start, end) == 0
+
+    def overlapping(self, key, start, end) -> list:
+        """
+        Returns the item ids of intervals under key overlapping [start, end], ordered by start.
+        O(log n + m) complexity, m being the intervals starting within the longest span before start.
+        """
+        starts = self.__starts.get(key)
+        if not starts:
+            return []
+        entries = self.__entries[key]
+        low = bisect_left(starts, start - self.__max_span[key])
+        high = bisect_right(starts, end)
+        return [item_id for _, item_end, item_id in entries[low:high] if item_end >= start]
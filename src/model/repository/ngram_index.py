@@ -0,0 +1,68 @@
+class NgramIndex:
+    """
+    Case-insensitive substring index over short texts, backed by posting sets of every min_gram- to n-gram.
+
+    A query of min_gram to n characters is answered by one posting set lookup. A longer query intersects the posting
+    sets of its n-grams, starting from the smallest, and checks the few remaining candidates for the whole substring.
+    Queries shorter than min_gram scan the indexed texts: with min_gram = n, only n-grams are kept, which saves
+    memory on large collections whose short queries would match most of the keys anyway.
+    """
+
+    def __init__(self, n: int = 3, min_gram: int = 1):
+        self.__n = n
+        self.__min_gram = min_gram
+        self.__text_by_key = {}
+        self.__keys_by_gram = {}
+
+    def __len__(self) -> int:
+        return len(self.__text_by_key)
+
+    def __contains__(self, key) -> bool:
+        return key in self.__text_by_key
+
+    def add(self, key, text: str) -> None:
+        """Indexes text under key, replacing the previous text of key. O(n * L) complexity for a text of length L."""
+        self.remove(key)
+        text = str(text).casefold()
+        self.__text_by_key[key] = text
+        for gram in self.__grams(text):
+            self.__keys_by_gram.setdefault(gram, set()).add(key)
+
+    def remove(self, key) -> None:
+        """Removes key from the index. O(n * L) complexity."""
+        text = self.__text_by_key.pop(key, None)
+        if text is None:
+            return
+        for gram in self.__grams(text):
+            keys = self.__keys_by_gram[gram]
+            keys.discard(key)
+            if not keys:
+                del self.__keys_by_gram[gram]
+
+    def search(self, query: str) -> set:
+        """
+        Returns the keys whose text contains query. O(1) for queries of min_gram to n characters, O(k) for k
+        candidates above, O(N) below min_gram.
+        """
+        query = str(query).casefold()
+        if not query:
+            return set(self.__text_by_key)
+        if len(query) < self.__min_gram:
+            return {key for key, text in self.__text_by_key.items() if query in text}
+        if len(query) <= self.__n:
+            return set(self.__keys_by_gram.get(query, ()))
+
+        postings = []
+        for start in range(len(query) - self.__n + 1):
+            keys = self.__keys_by_gram.get(query[start:start + self.__n])
+            if not keys:
+                return set()
+            postings.append(keys)
+        postings.sort(key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return {key for key in candidates if query in self.__text_by_key[key]}
+
+    def __grams(self, text: str) -> set[str]:
+        return {text[start:start + size]
+                for size in range(self.__min_gram, self.__n + 1)
+                for start in range(len(text) - size + 1)}
@@ -0,0 +1,154 @@
+from datetime import date
+
+import numpy as np
+
+
+class OccupancyMatrix:
+    """
+    Rooms x days occupancy counts stored in a NumPy array, one row per room and one column per day.
+
+    A reservation occupies the nights from its check-in day up to, but not including, its check-out day.
+    Cells hold counters rather than bits so that removing one of two overlapping stays stays correct.
+    The array is column-major, so the rooms occupied on a given day are one contiguous column slice.
+
+    The matrix spans at most max_days days. The nights of a stay falling outside that span are not recorded; covers
+    tells whether the matrix can still answer for a given day.
+    """
+
+    _INITIAL_ROOMS = 16
+    _INITIAL_DAYS = 366
+    _MAX_DAYS = 10 * 366
+
+    def __init__(self, max_days: int = _MAX_DAYS):
+        self.__row_by_room_id = {}
+        self.__room_ids = []
+        self.__first_day = None
+        self.__max_days = max_days
+        self.__counts = np.zeros((0, 0), dtype=np.uint16, order="F")
+        # Span of the days whose nights were dropped for lying outside the matrix, as [start, end) ordinals
+        self.__dropped = None
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.__room_ids), self.__counts.shape[1]
+
+    def add(self, room_id: int, check_in_date: date, check_out_date: date) -> None:
+        """Marks the nights of a stay as occupied. O(nights) complexity, amortized."""
+        self.__update(room_id, check_in_date, check_out_date, 1)
+
+    def remove(self, room_id: int, check_in_date: date, check_out_date: date) -> None:
+        """Releases the nights of a stay previously added. O(nights) complexity."""
+        self.__update(room_id, check_in_date, check_out_date, -1)
+
+    def covers(self, day: date) -> bool:
+        """Checks whether the matrix holds every stay on the night of the given day. Theta(1) complexity."""
+        if self.__column(day) is not None or self.__dropped is None:
+            return True
+        return not self.__dropped[0] <= day.toordinal() < self.__dropped[1]
+
+    def is_occupied(self, room_id: int, day: date) -> bool:
+        """Checks whether the room is occupied on the night of the given day. Theta(1) complexity."""
+        row = self.__row_by_room_id.get(room_id)
+        column = self.__column(day)
+        if row is None or column is None:
+            return False
+        return bool(self.__counts[row, column])
+
+    def occupied_room_ids(self, day: date) -> set[int]:
+        """Returns the IDs of the rooms occupied on the night of the given day. One column slice, O(R) complexity."""
+        column = self.__column(day)
+        if column is None:
+            return set()
+        rows = np.flatnonzero(self.__counts[:len(self.__room_ids), column])
+        return {self.__room_ids[row] for row in rows}
+
+    def __column(self, day: date) -> int | None:
+        if self.__first_day is None:
+            return None
+        column = day.toordinal() - self.__first_day
+        if 0 <= column < self.__counts.shape[1]:
+            return column
+        return None
+
+    def __update(self, room_id: int, check_in_date: date, check_out_date: date, delta: int) -> None:
+        start, end = check_in_date.toordinal(), check_out_date.toordinal()
+        if end <= start:
+            return
+
+        if delta > 0:
+            self.__ensure_days(start, end)
+            row = self.__ensure_row(room_id)
+        else:
+            row = self.__row_by_room_id.get(room_id)
+            if row is None or self.__first_day is None:
+                return
+
+        width = self.__counts.shape[1]
+        first = max(start - self.__first_day, 0)
+        last = min(end - self.__first_day, width)
+        if delta > 0:
+            if first > start - self.__first_day or last < end - self.__first_day:
+                self.__drop(start, end)
+            if first < last:
+                self.__counts[row, first:last] += 1
+        elif first < last:
+            # Never below zero, should the stay not have been added
+            cells = self.__counts[row, first:last]
+            np.subtract(cells, 1, out=cells, where=cells > 0)
+
+    def __drop(self, start: int, end: int) -> None:
+        """Records that the nights of [start, end) outside the matrix were not stored."""
+        if self.__dropped is None:
+            self.__dropped = (start, end)
+        else:
+            self.__dropped = (min(start, self.__dropped[0]), max(end, self.__dropped[1]))
+
+    def __ensure_row(self, room_id: int) -> int:
+        row = self.__row_by_room_id.get(room_id)
+        if row is not None:
+            return row
+
+        row = len(self.__room_ids)
+        capacity = self.__counts.shape[0]
+        if row >= capacity:
+            grown = np.zeros((max(self._INITIAL_ROOMS, capacity * 2), self.__counts.shape[1]),
+                             dtype=np.uint16, order="F")
+            grown[:capacity, :] = self.__counts
+            self.__counts = grown
+
+        self.__row_by_room_id[room_id] = row
+        self.__room_ids.append(room_id)
+        return row
+
+    def __ensure_days(self, start: int, end: int) -> None:
+        if self.__first_day is None:
+            self.__first_day = start
+            width = min(max(self._INITIAL_DAYS, end - start), self.__max_days)
+            self.__counts = np.zeros((self.__counts.shape[0], width), dtype=np.uint16, order="F")
+            return
+
+        width = self.__counts.shape[1]
+        first_day = self.__first_day
+        last_day = first_day + width
+        if start >= first_day and end <= last_day:
+            return
+
+        # Grow geometrically on the side that overflowed so that sequential bookings stay amortized O(1).
+        if start < first_day:
+            first_day = min(start, first_day - width)
+        if end > last_day:
+            last_day = max(end, last_day + width)
+        if last_day - first_day > self.__max_days:
+            # Spend what is left of the span on the earlier days first, then on the later ones.
+            room = self.__max_days - width
+            first_day = max(first_day, self.__first_day - room)
+            room -= self.__first_day - first_day
+            last_day = min(last_day, self.__first_day + width + room)
+            if last_day - first_day == width:
+                return
+
+        grown = np.zeros((self.__counts.shape[0], last_day - first_day), dtype=np.uint16, order="F")
+        offset = self.__first_day - first_day
+        grown[:, offset:offset + width] = self.__counts
+        self.__counts = grown
+        self.__first_day = first_day
@@ -0,0 +1,109 @@
+import numpy as np
+
+
+class ReservationColumns:
+    """
+    Column store of reservations: parallel NumPy arrays of room IDs and check-in and check-out day ordinals, one row
+    per reservation.
+
+    Rows are kept dense: removing a reservation moves the last row into its slot, so every query is a vectorized
+    operation over the first len(self) rows. Range queries follow the reservation overlap rule ([check-in,
+    check-out] closed), night counts the occupancy rule (check-in included, check-out excluded).
+    """
+
+    _INITIAL_CAPACITY = 1024
+
+    def __init__(self):
+        self.__size = 0
+        self.__row_by_reservation_id = {}
+        self.__reservation_ids = []
+
+        self.__room_ids = np.zeros(0, dtype=np.int64)
+        self.__check_in = np.zeros(0, dtype=np.int32)
+        self.__check_out = np.zeros(0, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def __contains__(self, reservation_id) -> bool:
+        return reservation_id in self.__row_by_reservation_id
+
+    def add(self, reservation_id: str, room_id: int, check_in_day: int, check_out_day: int) -> None:
+        """Appends a reservation row. Theta(1) amortized complexity."""
+        if self.__size == len(self.__room_ids):
+            self.__grow()
+        row = self.__size
+        self.__room_ids[row] = room_id
+        self.__check_in[row] = check_in_day
+        self.__check_out[row] = check_out_day
+        self.__row_by_reservation_id[reservation_id] = row
+        self.__reservation_ids.append(reservation_id)
+        self.__size += 1
+
+    def remove(self, reservation_id: str) -> None:
+        """Removes a reservation row by moving the last row into its place. Theta(1) complexity."""
+        row = self.__row_by_reservation_id.pop(reservation_id, None)
+        if row is None:
+            return
+        last = self.__size - 1
+        if row != last:
+            for column in (self.__room_ids, self.__check_in, self.__check_out):
+                column[row] = column[last]
+            moved_id = self.__reservation_ids[last]
+            self.__reservation_ids[row] = moved_id
+            self.__row_by_reservation_id[moved_id] = row
+        self.__reservation_ids.pop()
+        self.__size = last
+
+    # Vectorized queries, O(n) NumPy operations
+    def active_on(self, day: int) -> list[str]:
+        """Returns the IDs of the reservations occupying the night of the given day."""
+        mask = (self.__check_in[:self.__size] <= day) & (self.__check_out[:self.__size] > day)
+        return self.__ids(mask)
+
+    def overlapping(self, first_day: int, last_day: int, room_id: int = None) -> list[str]:
+        """Returns the IDs of the reservations overlapping [first_day, last_day], optionally of one room."""
+        mask = (self.__check_in[:self.__size] <= last_day) & (self.__check_out[:self.__size] >= first_day)
+        if room_id is not None:
+            mask &= self.__room_ids[:self.__size] == room_id
+        return self.__ids(mask)
+
+    def count_by_room(self) -> dict[int, int]:
+        """Returns the number of reservations of every room that has any."""
+        room_ids, counts = np.unique(self.__room_ids[:self.__size], return_counts=True)
+        return dict(zip(room_ids.tolist(), counts.tolist()))
+
+    def room_nights(self, start_day: int, end_day: int, room_id: int = None) -> int:
+        """Returns the number of occupied room-nights from start_day up to, but not including, end_day."""
+        nights = self.__nights(start_day, end_day)
+        if room_id is not None:
+            nights = nights[self.__room_ids[:self.__size] == room_id]
+        return int(nights.sum())
+
+    def room_nights_by_room(self, start_day: int, end_day: int) -> dict[int, int]:
+        """Returns the occupied room-nights of every room from start_day up to, but not including, end_day."""
+        nights = self.__nights(start_day, end_day)
+        booked = nights > 0
+        room_ids, inverse = np.unique(self.__room_ids[:self.__size][booked], return_inverse=True)
+        totals = np.bincount(inverse, weights=nights[booked], minlength=len(room_ids))
+        return dict(zip(room_ids.tolist(), totals.astype(np.int64).tolist()))
+
+    def __nights(self, start_day: int, end_day: int) -> np.ndarray:
+        stay_start = np.maximum(self.__check_in[:self.__size], start_day)
+        stay_end = np.minimum(self.__check_out[:self.__size], end_day)
+        return np.clip(stay_end.astype(np.int64) - stay_start, 0, None)
+
+    def __ids(self, mask: np.ndarray) -> list[str]:
+        return [self.__reservation_ids[row] for row in np.flatnonzero(mask)]
+
+    def __grow(self) -> None:
+        capacity = max(self._INITIAL_CAPACITY, 2 * len(self.__room_ids))
+        self.__room_ids = self.__resized(self.__room_ids, capacity)
+        self.__check_in = self.__resized(self.__check_in, capacity)
+        self.__check_out = self.__resized(self.__check_out, capacity)
+
+    @staticmethod
+    def __resized(column: np.ndarray, capacity: int) -> np.ndarray:
+        resized = np.zeros(capacity, dtype=column.dtype)
+        resized[:len(column)] = column
+        return resized
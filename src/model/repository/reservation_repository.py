@@ -1,22 +1,76 @@
+import copy
 import sqlite3
-from datetime import datetime
+from concurrent.futures import Future
+from datetime import date, timedelta
 
-from src.utilities.exceptions import (ReservationAlreadyExistsError, ReservationNotFoundError)
+from src.utilities.exceptions import (ReservationAlreadyExistsError, ReservationNotFoundError,
+                                      ReservationConflictError)
 from src.model.domain.reservation import Reservation
 from src.model.database import database_operations as db
+from src.model.database import unit_of_work as uow
+from src.model.database.read_pool import ReadOnlyPool
+from src.model.repository.interval_index import IntervalIndex
+from src.model.repository.occupancy_matrix import OccupancyMatrix
+from src.model.repository.reservation_columns import ReservationColumns
+from src.model.repository.reservation_search_index import ReservationSearchIndex
+from src.utilities.change_events import (ChangeBus, EntityAdded, EntityUpdated, EntityRemoved, EntitiesReloaded,
+                                          RESERVATION)
+from src.utilities.lru_cache import LRUCache
+from src.utilities.date_codec import to_day, from_day
 
 
 class ReservationRepository:
     """
     Repository for managing Reservation entities with in-memory caching and SQLite persistence.
+
+    By default every reservation is cached. With horizon_days set, only the reservations overlapping
+    [today - horizon_days, today + horizon_days] are cached; the others are read from SQLite on demand through the
+    same getters and kept in an LRU cache of cold_cache_size lookups.
+
+    With a read_pool, reporting queries can also be run on a background read-only connection (the *_async getters).
+
+    With columnar set, the cached reservations are also kept in a ReservationColumns store, and the analytics getters
+    (active on a day, in a range, counts and room-nights) run as NumPy operations instead of Python loops.
+
+    Complexities below are for the cached reservations: n of them, k_r in the room concerned, k_g of the guest
+    concerned, N nights in the stay concerned and L characters in its reservation ID and guest name. Lookups outside
+    the horizon add one indexed query. The per-room and per-guest buckets are dicts keyed by reservation_id, in
+    insertion order, so a reservation leaves them in Theta(1).
+
+    Every change to the reservations of a room stamps the room with the next value of a monotonically increasing
+    generation counter (see get_room_generation); a reload stamps every room.
+
+    Every change is published on the events bus (see change_events): EntityAdded, EntityUpdated with a copy of the
+    reservation before the edit, EntityRemoved, and EntitiesReloaded after a reload. A change of reservation ID is
+    published as a removal of the old ID and an addition of the new one.
     """
 
-    def __init__(self, connection: sqlite3.Connection):
+    def __init__(self, connection: sqlite3.Connection, horizon_days: int = None, today: date = None,
+                 cold_cache_size: int = 256, read_pool: ReadOnlyPool = None, columnar: bool = False):
         self.__connection = connection
+        self.__read_pool = read_pool
+        self.__columnar = columnar
+
+        self.__window = None
+        if horizon_days is not None:
+            if horizon_days < 0:
+                raise ValueError("Reservation horizon must be a non-negative number of days!")
+            today = today or date.today()
+            self.__window = (today - timedelta(days=horizon_days), today + timedelta(days=horizon_days))
+        self.__cold = LRUCache(cold_cache_size)
 
         self.__by_reservation_id = {}
         self.__by_room_id = {}
         self.__by_guest_name = {}
+        self.__stays_by_room = IntervalIndex()
+        self.__occupancy = OccupancyMatrix()
+        self.__columns = ReservationColumns() if columnar else None
+        self.__search = ReservationSearchIndex()
+
+        self.__generation = 0
+        self.__loaded_generation = 0
+        self.__room_generations = {}
+        self.__events = ChangeBus()
 
         self.load_from_db()
 
@@ -24,92 +78,413 @@ class ReservationRepository:
     def connection(self) -> sqlite3.Connection:
         return self.__connection
 
+    @property
+    def events(self) -> ChangeBus:
+        """The bus on which the changes to the reservations are published."""
+        return self.__events
+
+    @property
+    def window(self) -> tuple[date, date] | None:
+        """The (first, last) day of the cached horizon, or None when every reservation is cached."""
+        return self.__window
+
+    def transaction(self):
+        """Opens a unit of work on the repository connection; the caches are reloaded if it rolls back."""
+        return uow.unit_of_work(self.__connection)
+
     # Data persistence
+    def reload(self):
+        """Discards the in-memory caches and loads them again from the database. Theta(n) complexity."""
+        self.__by_reservation_id = {}
+        self.__by_room_id = {}
+        self.__by_guest_name = {}
+        self.__stays_by_room = IntervalIndex()
+        self.__occupancy = OccupancyMatrix()
+        self.__columns = ReservationColumns() if self.__columnar else None
+        self.__search = ReservationSearchIndex()
+        self.__cold.clear()
+        self.__generation += 1
+        self.__loaded_generation = self.__generation
+        self.__room_generations = {}
+        self.load_from_db()
+        self.__events.publish(EntitiesReloaded(RESERVATION))
+
     def load_from_db(self):
-        """Load all reservations from the database into the in-memory cache. Theta(n) complexity."""
-        reservations = db.select_all_reservations(self.__connection)
+        """Load the reservations of the horizon (all of them by default) into the in-memory cache. Theta(n) complexity."""
+        if self.__window is None:
+            reservations = db.select_all_reservations(self.__connection)
+        else:
+            reservations = db.select_reservations_in_window(
+                self.__connection, to_day(self.__window[0]), to_day(self.__window[1]))
         for row in reservations:
-            reservation = Reservation(
-                db_id=row[0],
-                reservation_id=row[1],
-                room_id=row[2],
-                guest_name=row[3],
-                number_of_guests=row[4],
-                check_in_date=datetime.strptime(row[5], "%Y-%m-%d").date(),
-                check_out_date=datetime.strptime(row[6], "%Y-%m-%d").date(),
-            )
-            self.add_to_cache(reservation)
+            self.add_to_cache(self._reservation_from_row(row))
+
+    @staticmethod
+    def _reservation_from_row(row) -> Reservation:
+        return Reservation(
+            db_id=row[0],
+            reservation_id=row[1],
+            room_id=row[2],
+            guest_name=row[3],
+            number_of_guests=row[4],
+            check_in_date=from_day(row[5]),
+            check_out_date=from_day(row[6]),
+        )
+
+    def _in_window(self, check_in_date: date, check_out_date: date) -> bool:
+        """Whether a stay overlaps the horizon, i.e. belongs in the in-memory cache. Theta(1) complexity."""
+        return self.__window is None or (check_out_date >= self.__window[0] and check_in_date <= self.__window[1])
+
+    def _covers(self, check_in_date: date, check_out_date: date) -> bool:
+        """Whether a date range lies inside the horizon, so the cache alone can answer for it. Theta(1) complexity."""
+        return self.__window is None or (check_in_date >= self.__window[0] and check_out_date <= self.__window[1])
+
+    def _cached_or_loaded(self, rows) -> list[Reservation]:
+        """Map database rows to the cached reservations, building the ones outside the horizon. Theta(k) complexity."""
+        return [self.__by_reservation_id.get(row[1]) or self._reservation_from_row(row) for row in rows]
+
+    def get_room_generation(self, room_id: int) -> int:
+        """Return the generation of the last change to the reservations of a room. Theta(1) complexity."""
+        return self.__room_generations.get(room_id, self.__loaded_generation)
+
+    def _touch_room(self, room_id: int):
+        """Stamp a room whose reservations changed with the next generation. Theta(1) complexity."""
+        self.__generation += 1
+        self.__room_generations[room_id] = self.__generation
+
+    def _cold_lookup(self, key: tuple, load):
+        """Return the result of a database lookup for data outside the horizon, through the LRU cache."""
+        if key in self.__cold:
+            return self.__cold.get(key)
+        value = load()
+        self.__cold.put(key, value)
+        return value
 
     def add_to_cache(self, reservation: Reservation):
-        """Add a reservation to the in-memory cache. Theta(1) complexity."""
+        """
+        Add a reservation to the in-memory cache. O(log k_r + k_r + N + L) complexity: the interval index insert,
+        the occupied nights and the search index postings, every other index Theta(1) amortized.
+        """
         self.__by_reservation_id[reservation.reservation_id] = reservation
+        self._touch_room(reservation.room_id)
+        self.__by_room_id.setdefault(reservation.room_id, {})[reservation.reservation_id] = reservation
+        self.__by_guest_name.setdefault(reservation.guest_name, {})[reservation.reservation_id] = reservation
 
-        if reservation.room_id not in self.__by_room_id:
-            self.__by_room_id[reservation.room_id] = []
-        self.__by_room_id[reservation.room_id].append(reservation)
-
-        if reservation.guest_name not in self.__by_guest_name:
-            self.__by_guest_name[reservation.guest_name] = []
-        self.__by_guest_name[reservation.guest_name].append(reservation)
+        self.__stays_by_room.add(reservation.room_id, to_day(reservation.check_in_date),
+                                 to_day(reservation.check_out_date), reservation.reservation_id)
+        self.__occupancy.add(reservation.room_id, reservation.check_in_date, reservation.check_out_date)
+        self.__search.add(reservation.reservation_id, reservation.guest_name)
+        if self.__columns is not None:
+            self.__columns.add(reservation.reservation_id, reservation.room_id, to_day(reservation.check_in_date),
+                               to_day(reservation.check_out_date))
 
     def remove_from_cache(self, reservation: Reservation):
-        """Remove a reservation from the in-memory cache. Theta(1) complexity."""
+        """
+        Remove a reservation from the in-memory cache. O(log k_r + k_r + N + L) complexity, like add_to_cache;
+        the room and guest buckets are Theta(1).
+        """
         self.__by_reservation_id.pop(reservation.reservation_id, None)
+        self._touch_room(reservation.room_id)
+        self._unbucket(self.__by_room_id, reservation.room_id, reservation.reservation_id)
+        self._unbucket(self.__by_guest_name, reservation.guest_name, reservation.reservation_id)
+
+        self.__stays_by_room.remove(reservation.room_id, to_day(reservation.check_in_date),
+                                    to_day(reservation.check_out_date), reservation.reservation_id)
+        self.__occupancy.remove(reservation.room_id, reservation.check_in_date, reservation.check_out_date)
+        self.__search.remove(reservation.reservation_id, reservation.guest_name)
+        if self.__columns is not None:
+            self.__columns.remove(reservation.reservation_id)
+
+    def _reindex(self, old: Reservation, reservation: Reservation):
+        """
+        Move an edited cached reservation between the index entries whose keys changed, given a copy of it from
+        before the edit. Theta(1) for a change of guest count, O(log k_r + k_r + N) for a new room
+        or new dates, O(L) more for a new guest name.
+        """
+        reservation_id = reservation.reservation_id
+        self._touch_room(old.room_id)
+        self._touch_room(reservation.room_id)
+        if old.room_id != reservation.room_id:
+            self._unbucket(self.__by_room_id, old.room_id, reservation_id)
+            self.__by_room_id.setdefault(reservation.room_id, {})[reservation_id] = reservation
+        renamed = old.guest_name != reservation.guest_name
+        if renamed:
+            self._unbucket(self.__by_guest_name, old.guest_name, reservation_id)
+            self.__by_guest_name.setdefault(reservation.guest_name, {})[reservation_id] = reservation
+            self.__search.remove(reservation_id, old.guest_name)
+            self.__search.add(reservation_id, reservation.guest_name)
+
+        moved = (old.room_id, old.check_in_date, old.check_out_date) != \
+            (reservation.room_id, reservation.check_in_date, reservation.check_out_date)
+        if moved:
+            self.__stays_by_room.remove(old.room_id, to_day(old.check_in_date), to_day(old.check_out_date),
+                                        reservation_id)
+            self.__stays_by_room.add(reservation.room_id, to_day(reservation.check_in_date),
+                                     to_day(reservation.check_out_date), reservation_id)
+            self.__occupancy.remove(old.room_id, old.check_in_date, old.check_out_date)
+            self.__occupancy.add(reservation.room_id, reservation.check_in_date, reservation.check_out_date)
+        if self.__columns is not None and moved:
+            self.__columns.remove(reservation_id)
+            self.__columns.add(reservation_id, reservation.room_id, to_day(reservation.check_in_date),
+                               to_day(reservation.check_out_date))
 
-        room_reservations = self.__by_room_id.get(reservation.room_id)
-        if room_reservations:
-            room_reservations = [r for r in room_reservations if r != reservation]
-            if room_reservations:
-                self.__by_room_id[reservation.room_id] = room_reservations
-            else:
-                del self.__by_room_id[reservation.room_id]
-
-        name_resevations = self.__by_guest_name.get(reservation.guest_name)
-        if name_resevations:
-            name_resevations = [r for r in name_resevations if r != reservation]
-            if name_resevations:
-                self.__by_guest_name[reservation.guest_name] = name_resevations
-            else:
-                del self.__by_guest_name[reservation.guest_name]
+    @staticmethod
+    def _unbucket(buckets: dict, key, reservation_id: str):
+        """Remove a reservation from the bucket of key, dropping the bucket once empty. Theta(1) complexity."""
+        bucket = buckets.get(key)
+        if bucket is None:
+            return
+        bucket.pop(reservation_id, None)
+        if not bucket:
+            del buckets[key]
 
     # Getters
     def get_all_reservations(self) -> list[Reservation]:
-        """Return a list of all reservations. Theta(n) complexity."""
-        return list(self.__by_reservation_id.values())
+        """Return a list of all reservations. Theta(n) complexity, reading the whole table when a horizon is set."""
+        if self.__window is None:
+            return list(self.__by_reservation_id.values())
+        return self._cached_or_loaded(db.select_all_reservations(self.__connection))
+
+    def get_all_reservations_async(self) -> Future:
+        """
+        Return a Future of the list of all reservations, read on a background connection when a read pool is set.
+        The reservations are fresh objects built from the last committed state, not the cached instances.
+        """
+        if self.__read_pool is None:
+            future = Future()
+            future.set_result(self.get_all_reservations())
+            return future
+        return self.__read_pool.submit(
+            lambda connection: [self._reservation_from_row(row) for row in db.select_all_reservations(connection)])
 
     def get_by_reservation_id(self, reservation_id: str) -> Reservation | None:
         """Return a reservation by its reservation_id. Theta(1) complexity."""
-        return self.__by_reservation_id.get(reservation_id)
+        reservation = self.__by_reservation_id.get(reservation_id)
+        if reservation is not None or self.__window is None or reservation_id is None:
+            return reservation
+
+        def load():
+            row = db.select_reservation_by_reservation_id(self.__connection, reservation_id)
+            return self._reservation_from_row(row) if row else None
+        return self._cold_lookup(("reservation_id", reservation_id), load)
 
     def get_reservations_by_room_id(self, room_id: int) -> list[Reservation]:
-        """Return a list of reservations for a specific room_id. Theta(1) complexity."""
-        return self.__by_room_id.get(room_id, [])
+        """Return a list of reservations for a specific room_id, in insertion order. Theta(k_r) complexity."""
+        if self.__window is None:
+            return list(self.__by_room_id.get(room_id, {}).values())
+
+        def load():
+            rows = db.select_reservations_by_room_id(self.__connection, room_id)
+            return [self._reservation_from_row(row) for row in rows if row[1] not in self.__by_reservation_id]
+        return self._cold_lookup(("room_id", room_id), load) + list(self.__by_room_id.get(room_id, {}).values())
 
     def get_reservations_by_guest_name(self, guest_name: str) -> list[Reservation]:
-        """Return a list of reservations for a specific guest_name. Theta(1) complexity."""
-        return self.__by_guest_name.get(guest_name, [])
+        """Return a list of reservations for a specific guest_name, in insertion order. Theta(k_g) complexity."""
+        if self.__window is None:
+            return list(self.__by_guest_name.get(guest_name, {}).values())
+
+        def load():
+            rows = db.select_reservations_by_guest_name(self.__connection, guest_name)
+            return [self._reservation_from_row(row) for row in rows if row[1] not in self.__by_reservation_id]
+        return self._cold_lookup(("guest_name", guest_name), load) + list(self.__by_guest_name.get(guest_name, {}).values())
+
+    def get_reservations_by_partial_guest_name(self, query: str) -> list[Reservation]:
+        """
+        Return the reservations whose guest name contains query, case-insensitive, ordered by reservation ID.
+        O(m log m) complexity for m matches.
+        """
+        matches = [self.__by_reservation_id[reservation_id]
+                   for reservation_id in sorted(self.__search.match_guest_name(query))]
+        if self.__window is not None:
+            folded = query.casefold()
+            matches += [reservation for reservation in self._cold_matches(query)
+                        if folded in reservation.guest_name.casefold()]
+        return matches
+
+    def search_reservations(self, query: str, limit: int = None) -> list[Reservation]:
+        """
+        Return the reservations whose ID or guest name contains query, case-insensitive, best matches first
+        (see ReservationSearchIndex). O(m log limit) complexity for m matches, plus one query outside the horizon.
+        """
+        reservation_ids = self.__search.search(query, limit)
+        matches = [self.__by_reservation_id[reservation_id] for reservation_id in reservation_ids]
+        if self.__window is None:
+            return matches
+
+        def order(reservation):
+            return ReservationSearchIndex.rank(query, reservation.reservation_id, reservation.guest_name), \
+                reservation.reservation_id
+        cold = [reservation for reservation in self._cold_matches(query) if order(reservation)[0] is not None]
+        return sorted(matches + cold, key=order)[:limit]
+
+    def _cold_matches(self, query: str) -> list[Reservation]:
+        """Reservations outside the horizon whose ID or guest name may contain query, read from the database."""
+        return self._cold_lookup(
+            ("search", query.casefold()),
+            lambda: [self._reservation_from_row(row) for row in db.select_reservations_matching(self.__connection, query)
+                     if row[1] not in self.__by_reservation_id])
+
+    def get_overlapping_reservations(self, room_id: int, check_in_date: date, check_out_date: date) -> list[Reservation]:
+        """
+        Return the reservations of a room overlapping the given date range, ordered by check-in.
+        O(log k_r + m) complexity for m matches.
+        """
+        if not self._covers(check_in_date, check_out_date):
+            rows = db.select_overlapping_reservations(
+                self.__connection, room_id, to_day(check_in_date), to_day(check_out_date))
+            return self._cached_or_loaded(rows)
+        reservation_ids = self.__stays_by_room.overlapping(room_id, to_day(check_in_date), to_day(check_out_date))
+        return [self.__by_reservation_id[reservation_id] for reservation_id in reservation_ids]
+
+    def get_occupied_room_ids(self, day: date) -> set[int]:
+        """Return the IDs of the rooms occupied on the night of the given day. O(R) complexity (one matrix column)."""
+        if not self._covers(day, day) or not self.__occupancy.covers(day):
+            return set(db.select_occupied_room_ids(self.__connection, to_day(day)))
+        return self.__occupancy.occupied_room_ids(day)
+
+    # Analytics
+    def get_reservations_active_on(self, day: date) -> list[Reservation]:
+        """Return the reservations occupying the night of the given day. O(n) complexity, vectorized when columnar."""
+        if not self._covers(day, day):
+            return self._cached_or_loaded(db.select_reservations_active_on(self.__connection, to_day(day)))
+        if self.__columns is not None:
+            return [self.__by_reservation_id[reservation_id] for reservation_id in self.__columns.active_on(to_day(day))]
+        return [reservation for reservation in self.__by_reservation_id.values()
+                if reservation.check_in_date <= day < reservation.check_out_date]
+
+    def get_reservations_in_range(self, first_date: date, last_date: date) -> list[Reservation]:
+        """Return the reservations of all rooms overlapping [first_date, last_date]. O(n) complexity, vectorized when columnar."""
+        if not self._covers(first_date, last_date):
+            rows = db.select_reservations_overlapping_range(self.__connection, to_day(first_date), to_day(last_date))
+            return self._cached_or_loaded(rows)
+        if self.__columns is not None:
+            reservation_ids = self.__columns.overlapping(to_day(first_date), to_day(last_date))
+            return [self.__by_reservation_id[reservation_id] for reservation_id in reservation_ids]
+        return [reservation for reservation in self.__by_reservation_id.values()
+                if reservation.check_in_date <= last_date and reservation.check_out_date >= first_date]
+
+    def count_reservations_by_room(self) -> dict[int, int]:
+        """Return the number of reservations of every booked room. O(R) complexity for R booked rooms, O(n) when columnar."""
+        if self.__window is not None:
+            return db.count_reservations_by_room(self.__connection)
+        if self.__columns is not None:
+            return self.__columns.count_by_room()
+        return {room_id: len(reservations) for room_id, reservations in self.__by_room_id.items()}
+
+    def count_room_nights_by_room(self, start_date: date, end_date: date) -> dict[int, int]:
+        """
+        Return the occupied nights of every room from start_date up to, but not including, end_date.
+        O(n) complexity, vectorized when columnar.
+        """
+        start_day, end_day = to_day(start_date), to_day(end_date)
+        if not self._covers(start_date, end_date):
+            return db.sum_room_nights_by_room(self.__connection, start_day, end_day)
+        if self.__columns is not None:
+            return self.__columns.room_nights_by_room(start_day, end_day)
+        nights_by_room = {}
+        for reservation in self.__by_reservation_id.values():
+            nights = min(to_day(reservation.check_out_date), end_day) - max(to_day(reservation.check_in_date), start_day)
+            if nights > 0:
+                nights_by_room[reservation.room_id] = nights_by_room.get(reservation.room_id, 0) + nights
+        return nights_by_room
+
+    def count_room_nights(self, start_date: date, end_date: date, room_id: int = None) -> int:
+        """Return the occupied room-nights from start_date up to, but not including, end_date. O(n) complexity."""
+        if self.__columns is not None and self._covers(start_date, end_date):
+            return self.__columns.room_nights(to_day(start_date), to_day(end_date), room_id)
+        nights_by_room = self.count_room_nights_by_room(start_date, end_date)
+        if room_id is not None:
+            return nights_by_room.get(room_id, 0)
+        return sum(nights_by_room.values())
+
+    def is_room_free(self, room_id: int, check_in_date: date, check_out_date: date,
+                     exclude_reservation_id: str = None) -> bool:
+        """
+        Check that no reservation of a room overlaps the given date range, optionally ignoring one reservation
+        (the one being edited). O(log k_r) complexity.
+        """
+        first_day, last_day = to_day(check_in_date), to_day(check_out_date)
+        if self._covers(check_in_date, check_out_date):
+            overlapping = self.__stays_by_room.count_overlapping(room_id, first_day, last_day)
+        else:
+            overlapping = len(db.select_overlapping_reservations(self.__connection, room_id, first_day, last_day))
+        excluded = self.get_by_reservation_id(exclude_reservation_id)
+        if (excluded is not None and excluded.room_id == room_id
+                and to_day(excluded.check_in_date) <= last_day and to_day(excluded.check_out_date) >= first_day):
+            overlapping -= 1
+        return overlapping == 0
 
     # CRUD operations
     def add_reservation(self, reservation: Reservation):
-        """Add a new reservation to the repository and persist it to the database. Theta(1) complexity."""
-        if reservation.reservation_id in self.__by_reservation_id:
+        """Add a new reservation to the repository and persist it to the database. Same complexity as add_to_cache."""
+        uow.join(self.__connection, self.reload)
+        if self.get_by_reservation_id(reservation.reservation_id) is not None:
             raise ReservationAlreadyExistsError(f"Reservation with ID {reservation.reservation_id} already exists!")
 
         reservation.db_id = db.insert_reservation(
             self.__connection,
             reservation.reservation_id, reservation.room_id,
             reservation.guest_name, reservation.number_of_guests,
-            reservation.check_in_date.isoformat(), reservation.check_out_date.isoformat(),
+            to_day(reservation.check_in_date), to_day(reservation.check_out_date),
         )
-        self.add_to_cache(reservation)
+        self._store(reservation)
+        self.__events.publish(EntityAdded(RESERVATION, reservation.reservation_id, reservation))
+
+    def _store(self, reservation: Reservation):
+        """
+        Cache a persisted reservation if it falls inside the horizon, otherwise drop the stale cold lookups.
+        Same complexity as add_to_cache.
+        """
+        if self._in_window(reservation.check_in_date, reservation.check_out_date):
+            self.add_to_cache(reservation)
+        else:
+            self.__cold.clear()
+            self._touch_room(reservation.room_id)
+
+    def add_reservations_bulk(self, reservations: list[Reservation]) -> None:
+        """
+        Add many reservations at once: the batch is checked in memory against the cache and against itself,
+        written with a single executemany in one transaction, then added to the cache. Either every reservation
+        is added or none is. O(b (log k_r + k_r + N + L)) complexity for a batch of b reservations.
+        """
+        uow.join(self.__connection, self.reload)
+        batch_ids = set()
+        batch_stays = IntervalIndex()
+        for reservation in reservations:
+            if (reservation.reservation_id in batch_ids
+                    or self.get_by_reservation_id(reservation.reservation_id) is not None):
+                raise ReservationAlreadyExistsError(f"Reservation with ID {reservation.reservation_id} already exists!")
+            first_day, last_day = to_day(reservation.check_in_date), to_day(reservation.check_out_date)
+            if (not self.is_room_free(reservation.room_id, reservation.check_in_date, reservation.check_out_date)
+                    or not batch_stays.is_free(reservation.room_id, first_day, last_day)):
+                raise ReservationConflictError(
+                    f"Reservation {reservation.reservation_id} overlaps another reservation of room {reservation.room_id}!")
+            batch_ids.add(reservation.reservation_id)
+            batch_stays.add(reservation.room_id, first_day, last_day, reservation.reservation_id)
+
+        db_ids = db.insert_reservations_bulk(self.__connection, [
+            (reservation.reservation_id, reservation.room_id,
+             reservation.guest_name, reservation.number_of_guests,
+             to_day(reservation.check_in_date), to_day(reservation.check_out_date))
+            for reservation in reservations
+        ])
+        for reservation, db_id in zip(reservations, db_ids):
+            reservation.db_id = db_id
+            self._store(reservation)
+            self.__events.publish(EntityAdded(RESERVATION, reservation.reservation_id, reservation))
 
     def update_reservation(self, reservation_id: str, **kwargs):
-        """Update an existing reservation in the repository and the database. Theta(1) complexity."""
-        reservation = self.__by_reservation_id.get(reservation_id)
+        """
+        Update an existing reservation in the repository and the database. Only the indexes whose keys changed are
+        touched, see _reindex for the complexity.
+        """
+        uow.join(self.__connection, self.reload)
+        reservation = self.get_by_reservation_id(reservation_id)
         if reservation is None:
             raise ReservationNotFoundError(f"Reservation with id {reservation_id} does not exist!")
 
-        self.remove_from_cache(reservation)
+        cached = self.__by_reservation_id.get(reservation_id) is reservation
+        old = copy.copy(reservation)
         for key, value in kwargs.items():
             if hasattr(reservation, key):
                 setattr(reservation, key, value)
@@ -121,16 +496,36 @@ class ReservationRepository:
             reservation.room_id,
             reservation.guest_name,
             reservation.number_of_guests,
-            reservation.check_in_date.isoformat(),
-            reservation.check_out_date.isoformat(),
+            to_day(reservation.check_in_date),
+            to_day(reservation.check_out_date),
         )
-        self.add_to_cache(reservation)
+        if not cached:
+            self.__cold.clear()
+            self._touch_room(old.room_id)
+            self._store(reservation)
+        elif (old.reservation_id != reservation.reservation_id
+              or not self._in_window(reservation.check_in_date, reservation.check_out_date)):
+            self.remove_from_cache(old)
+            self._store(reservation)
+        else:
+            self._reindex(old, reservation)
+        if old.reservation_id != reservation.reservation_id:
+            self.__events.publish(EntityRemoved(RESERVATION, old.reservation_id, old))
+            self.__events.publish(EntityAdded(RESERVATION, reservation.reservation_id, reservation))
+        else:
+            self.__events.publish(EntityUpdated(RESERVATION, reservation.reservation_id, reservation, old))
 
     def delete_reservation(self, reservation_id: str):
-        """Delete a reservation from the repository and the database. Theta(1) complexity."""
-        reservation = self.__by_reservation_id.get(reservation_id)
+        """Delete a reservation from the repository and the database. Same complexity as remove_from_cache."""
+        uow.join(self.__connection, self.reload)
+        reservation = self.get_by_reservation_id(reservation_id)
         if reservation is None:
             raise ReservationNotFoundError(f"Reservation with id {reservation_id} does not exist!")
 
         db.delete_reservation(self.__connection, reservation.db_id)
-        self.remove_from_cache(reservation)
+        if self.__by_reservation_id.get(reservation_id) is reservation:
+            self.remove_from_cache(reservation)
+        else:
+            self.__cold.clear()
+            self._touch_room(reservation.room_id)
+        self.__events.publish(EntityRemoved(RESERVATION, reservation_id, reservation))
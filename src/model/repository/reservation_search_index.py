@@ -0,0 +1,98 @@
+import heapq
+
+from src.model.repository.ngram_index import NgramIndex
+
+
+class ReservationSearchIndex:
+    """
+    Search index over the reservation IDs and guest names of the cached reservations, casefolded.
+
+    Reservation IDs are indexed by trigrams only, one entry per reservation. Guest names are indexed once per distinct
+    name, with the reservations of each name kept alongside. Results are ranked: exact matches first, then prefix
+    matches, then any substring match, reservation IDs before guest names at the same level.
+    """
+
+    EXACT_ID, EXACT_NAME, PREFIX_ID, PREFIX_NAME, SUBSTRING_ID, SUBSTRING_NAME = range(6)
+
+    def __init__(self):
+        self.__reservation_ids = NgramIndex(n=3, min_gram=3)
+        self.__guest_names = NgramIndex()
+        self.__ids_by_name = {}
+
+    def __len__(self) -> int:
+        return len(self.__reservation_ids)
+
+    def add(self, reservation_id: str, guest_name: str) -> None:
+        """Indexes a reservation. O(L) complexity for an ID of length L, plus the name if it is new."""
+        self.__reservation_ids.add(reservation_id, reservation_id)
+        name = guest_name.casefold()
+        ids = self.__ids_by_name.get(name)
+        if ids is None:
+            ids = self.__ids_by_name[name] = set()
+            self.__guest_names.add(name, name)
+        ids.add(reservation_id)
+
+    def remove(self, reservation_id: str, guest_name: str) -> None:
+        """Removes a reservation from the index. O(L) complexity."""
+        self.__reservation_ids.remove(reservation_id)
+        name = guest_name.casefold()
+        ids = self.__ids_by_name.get(name)
+        if ids is None:
+            return
+        ids.discard(reservation_id)
+        if not ids:
+            del self.__ids_by_name[name]
+            self.__guest_names.remove(name)
+
+    def match_guest_name(self, query: str) -> set[str]:
+        """Returns the IDs of the reservations whose guest name contains query."""
+        matches = set()
+        for name in self.__guest_names.search(query):
+            matches |= self.__ids_by_name[name]
+        return matches
+
+    def search(self, query: str, limit: int = None) -> list[str]:
+        """
+        Returns the IDs of the reservations whose ID or guest name contains query, best ranked first (ties by ID).
+        With a limit, only the top ones are ranked fully: O(m log limit) for m matches.
+        """
+        query = query.casefold()
+        ranks = {reservation_id: self.id_rank(query, reservation_id)
+                 for reservation_id in self.__reservation_ids.search(query)}
+        for name in self.__guest_names.search(query):
+            name_rank = self.name_rank(query, name)
+            for reservation_id in self.__ids_by_name[name]:
+                if name_rank < ranks.get(reservation_id, name_rank + 1):
+                    ranks[reservation_id] = name_rank
+
+        def order(reservation_id):
+            return ranks[reservation_id], reservation_id
+        if limit is None:
+            return sorted(ranks, key=order)
+        return heapq.nsmallest(limit, ranks, key=order)
+
+    @classmethod
+    def rank(cls, query: str, reservation_id: str, guest_name: str) -> int | None:
+        """Returns the rank of a reservation for query, or None if neither its ID nor its guest name matches."""
+        query = query.casefold()
+        ranks = [rank for rank in (cls.id_rank(query, reservation_id), cls.name_rank(query, guest_name.casefold()))
+                 if rank is not None]
+        return min(ranks) if ranks else None
+
+    @classmethod
+    def id_rank(cls, query: str, reservation_id: str) -> int | None:
+        text = reservation_id.casefold()
+        if text == query:
+            return cls.EXACT_ID
+        if text.startswith(query):
+            return cls.PREFIX_ID
+        return cls.SUBSTRING_ID if query in text else None
+
+    @classmethod
+    def name_rank(cls, query: str, name: str) -> int | None:
+        """Ranks a casefolded guest name; a match at the start of any word of the name counts as a prefix."""
+        if name == query:
+            return cls.EXACT_NAME
+        if name.startswith(query) or f" {query}" in name:
+            return cls.PREFIX_NAME
+        return cls.SUBSTRING_NAME if query in name else None
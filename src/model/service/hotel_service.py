@@ -13,6 +13,17 @@ class HotelService:
     def __init__(self, repository: HotelRepository):
         self.__repository = repository
 
+    def transaction(self):
+        """Opens a unit of work: the floors and elements changed inside it are committed together or not at all."""
+        return self.__repository.transaction()
+
+    def subscribe(self, handler, entity_type: str = None) -> None:
+        """Registers handler(event) for the change events of the floors or the elements, or both by default."""
+        self.__repository.events.subscribe(handler, entity_type)
+
+    def unsubscribe(self, handler, entity_type: str = None) -> None:
+        self.__repository.events.unsubscribe(handler, entity_type)
+
     # Getters
     def get_all_floors_sorted_by_level(self) -> list[Floor]:
         """Returns all floors sorted by their level in descending order (highest level first)."""
@@ -44,6 +55,22 @@ class HotelService:
         """Returns all connections in the hotel as a list of tuples (from_floor_id, to_floor_id)."""
         return self.__repository.get_all_connections()
 
+    def get_floor_generation(self, floor_id: int) -> int:
+        """Returns a number that increases whenever the floor or one of its elements changes."""
+        return self.__repository.get_floor_generation(floor_id)
+
+    def get_room_generation(self, room_id: int) -> int:
+        """Returns a number that increases whenever the room changes."""
+        return self.__repository.get_room_generation(room_id)
+
+    def get_element_by_id(self, element_id: int) -> FloorElement | Room:
+        """Returns the element with the given ID, whatever its type."""
+        return self.__repository.get_element_by_id(element_id)
+
+    def get_all_rooms(self) -> list[Room]:
+        """Returns all rooms in the hotel."""
+        return self.__repository.get_all_rooms()
+
     def get_room_by_id(self, room_id: int) -> Room:
         """Returns the room with the given ID."""
         return self.__repository.get_room_by_id(room_id)
@@ -54,17 +81,16 @@ class HotelService:
 
     def get_rooms_by_partial_number(self, partial_number: str) -> list[Room]:
         """Returns a list of rooms whose number contains the partial_number string (case-insensitive)."""
-        all_rooms = self.__repository.get_all_rooms()
-        partial_number_lower = partial_number.lower()
-        return [
-            room for room in all_rooms
-            if partial_number_lower in str(room.number).lower()
-        ]
+        return self.__repository.get_rooms_by_partial_number(partial_number)
 
     def get_rooms_by_capacity(self, capacity: int) -> list[Room]:
-        """Returns all rooms that can accommodate the given capacity."""
+        """Returns all rooms whose capacity is exactly the given one."""
         return self.__repository.get_rooms_by_capacity(capacity)
 
+    def get_rooms_by_min_capacity(self, min_capacity: int, best_fit: bool = False) -> list[Room]:
+        """Returns all rooms for at least min_capacity guests, smallest first; best_fit also puts cheaper rooms first."""
+        return self.__repository.get_rooms_by_min_capacity(min_capacity, best_fit)
+
     # CRUD operations
 
     # Floors
@@ -1,9 +1,11 @@
-from datetime import datetime, date
+from datetime import date
 from random import randint
 
 from src.model.repository.reservation_repository import ReservationRepository
+from src.utilities.change_events import RESERVATION
 from src.utilities.exceptions import ValidationError
 from src.model.domain.reservation import Reservation
+from src.utilities.date_codec import parse_iso_date
 
 
 class ReservationService:
@@ -14,6 +16,17 @@ class ReservationService:
     def __init__(self, reservation_repository: ReservationRepository):
         self.__repository = reservation_repository
 
+    def transaction(self):
+        """Opens a unit of work: the reservations changed inside it are committed together or not at all."""
+        return self.__repository.transaction()
+
+    def subscribe(self, handler) -> None:
+        """Registers handler(event) for the change events of the reservations (see change_events)."""
+        self.__repository.events.subscribe(handler, RESERVATION)
+
+    def unsubscribe(self, handler) -> None:
+        self.__repository.events.unsubscribe(handler, RESERVATION)
+
     # Getters
     def get_all_reservations(self) -> list[Reservation]:
         """Returns all reservations."""
@@ -27,6 +40,47 @@ class ReservationService:
         """Returns all reservations for the given room ID."""
         return self.__repository.get_reservations_by_room_id(room_id)
 
+    def get_occupied_room_ids(self, day: date) -> set[int]:
+        """Returns the IDs of the rooms occupied on the night of the given day."""
+        return self.__repository.get_occupied_room_ids(day)
+
+    def get_room_generation(self, room_id: int) -> int:
+        """Returns a number that increases whenever a reservation of the room is added, changed or removed."""
+        return self.__repository.get_room_generation(room_id)
+
+    def search_reservations(self, query: str, limit: int = None) -> list[Reservation]:
+        """Returns the reservations whose ID or guest name contains the query, best matches first."""
+        return self.__repository.search_reservations(query, limit)
+
+    def get_reservations_by_partial_guest_name(self, query: str) -> list[Reservation]:
+        """Returns the reservations whose guest name contains the query (case-insensitive)."""
+        return self.__repository.get_reservations_by_partial_guest_name(query)
+
+    def get_reservations_active_on(self, day: date) -> list[Reservation]:
+        """Returns the reservations occupying the night of the given day."""
+        return self.__repository.get_reservations_active_on(day)
+
+    def get_reservations_in_range(self, first_date: date, last_date: date) -> list[Reservation]:
+        """Returns the reservations of all rooms overlapping the given date range."""
+        return self.__repository.get_reservations_in_range(first_date, last_date)
+
+    def count_reservations_by_room(self) -> dict[int, int]:
+        """Returns the number of reservations of every booked room."""
+        return self.__repository.count_reservations_by_room()
+
+    def count_room_nights(self, start_date: date, end_date: date, room_id: int = None) -> int:
+        """Returns the occupied room-nights from start_date up to, but not including, end_date."""
+        return self.__repository.count_room_nights(start_date, end_date, room_id)
+
+    def count_room_nights_by_room(self, start_date: date, end_date: date) -> dict[int, int]:
+        """Returns the occupied nights of every room from start_date up to, but not including, end_date."""
+        return self.__repository.count_room_nights_by_room(start_date, end_date)
+
+    def is_room_free(self, room_id: int, check_in_date: date, check_out_date: date,
+                     exclude_reservation_id: str = None) -> bool:
+        """Checks that the room has no reservation overlapping the given date range."""
+        return self.__repository.is_room_free(room_id, check_in_date, check_out_date, exclude_reservation_id)
+
     # CRUD operations
     def make_reservation(self, room_id: int, guest_name: str, number_of_guests: int,
                          check_in_date: str, check_out_date: str, reservation_id: str = None) -> str | None:
@@ -48,6 +102,34 @@ class ReservationService:
         self.__repository.add_reservation(reservation)
         return reservation_id
 
+    def add_reservations_bulk(self, bookings: list[dict]) -> list[str]:
+        """
+        Creates many reservations in a single write. Each booking is a dict with the keyword arguments of
+        make_reservation. The whole batch is validated before anything is written; returns the reservation IDs.
+        """
+        reservations = []
+        errors = []
+        for index, booking in enumerate(bookings):
+            reservation_id = booking.get("reservation_id")
+            if reservation_id is None:
+                reservation_id = self._generate_reservation_id(
+                    booking["room_id"], booking["check_in_date"], booking["check_out_date"]
+                )
+            reservation = Reservation(
+                reservation_id=reservation_id, room_id=booking["room_id"],
+                guest_name=booking["guest_name"], number_of_guests=booking["number_of_guests"],
+                check_in_date=self._parse_iso_date(booking["check_in_date"]),
+                check_out_date=self._parse_iso_date(booking["check_out_date"])
+            )
+            errors.extend(f"Booking {index}: {error}" for error in reservation.validate())
+            reservations.append(reservation)
+
+        if errors:
+            raise ValidationError('Invalid Reservation!', errors)
+
+        self.__repository.add_reservations_bulk(reservations)
+        return [reservation.reservation_id for reservation in reservations]
+
     def update_reservation(self, reservation_id: str, room_id: int, guest_name: str,
                            number_of_guests: int, check_in_date: str, check_out_date: str) -> None:
         """Updates an existing reservation with the provided details."""
@@ -64,7 +146,8 @@ class ReservationService:
 
         self.__repository.update_reservation(reservation_id=reservation_id, room_id=room_id,
                                              guest_name=guest_name, number_of_guests=number_of_guests,
-                                             check_in_date=check_in_date, check_out_date=check_out_date)
+                                             check_in_date=reservation.check_in_date,
+                                             check_out_date=reservation.check_out_date)
 
     def delete_reservation(self, reservation_id: str) -> Reservation:
         """Deletes the reservation with the given reservation ID."""
@@ -74,17 +157,15 @@ class ReservationService:
     def _generate_reservation_id(self, room_id: int, check_in_date: str, check_out_date: str) -> str:
         """Generates a unique reservation ID based on room ID, check-in and check-out dates, and a random code."""
         room_id = str(room_id).zfill(3)
-        year = str(datetime.strptime(check_in_date, "%Y-%m-%d").year)[-2:]
-        month = datetime.strptime(check_in_date, "%Y-%m-%d").strftime("%m")
-        check_in_day = datetime.strptime(check_in_date, "%Y-%m-%d").strftime("%d")
-        check_out_day = datetime.strptime(check_out_date, "%Y-%m-%d").strftime("%d")
+        check_in, check_out = parse_iso_date(check_in_date), parse_iso_date(check_out_date)
+        year = str(check_in.year)[-2:]
+        month = f"{check_in.month:02d}"
+        check_in_day = f"{check_in.day:02d}"
+        check_out_day = f"{check_out.day:02d}"
         code = str(randint(0, 9)) + str(randint(0, 9)) + str(randint(0, 9))
 
         reservation_id = "R" + room_id + year + month + check_in_day + check_out_day + code
         return reservation_id
 
     def _parse_iso_date(self, s: str) -> date | None:
-        try:
-            return datetime.strptime(s, "%Y-%m-%d").date()
-        except ValueError as e:
-            raise ValueError(f"Invalid date format, expected YYYY-MM-DD: {s}") from e
+        return parse_iso_date(s)
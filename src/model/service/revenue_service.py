@@ -0,0 +1,157 @@
+from datetime import date
+
+from src.model.domain.reservation import Reservation
+from src.model.repository.hotel_repository import HotelRepository
+from src.model.repository.reservation_repository import ReservationRepository
+from src.utilities.change_events import EntitiesReloaded, before_and_after, ELEMENT, RESERVATION
+
+
+class RevenueService:
+    """
+    Service layer keeping the reservation income as running totals: overall, per room, per floor and per month.
+
+    It subscribes to the change events of both repositories and applies every change as a delta. A reservation
+    change adds or subtracts its nights, split by the month of each night. A room price or floor change moves the
+    income of that room's nights across its month buckets only. A reload of either repository resynchronizes
+    everything. Income is counted as nights (check-in included, check-out excluded) times the current price of the
+    room. Reservations of a room that no longer exists count no income.
+
+    Totals are kept in integer cents, so that adding and subtracting the same stays always returns them to exactly
+    zero; the getters convert them back to currency units.
+    """
+
+    def __init__(self, reservation_repository: ReservationRepository, hotel_repository: HotelRepository):
+        self.__reservation_repository = reservation_repository
+        self.__hotel_repository = hotel_repository
+        self.__resync()
+        reservation_repository.events.subscribe(self._on_reservation_changed, RESERVATION)
+        hotel_repository.events.subscribe(self._on_element_changed, ELEMENT)
+
+    # Getters
+    def get_total_income(self) -> float:
+        """Returns the income of all reservations. Theta(1) complexity."""
+        return self.__total / 100
+
+    def get_room_income(self, room_id: int) -> float:
+        """Returns the income of the reservations of a room. Theta(1) complexity."""
+        return self.__nights_by_room.get(room_id, 0) * self.__prices.get(room_id, 0) / 100
+
+    def get_floor_income(self, floor_id: int) -> float:
+        """Returns the income of the reservations of the rooms of a floor. Theta(1) complexity."""
+        return self.__income_by_floor.get(floor_id, 0) / 100
+
+    def get_monthly_income(self, year: int, month: int) -> float:
+        """Returns the income of the nights spent in the given month. Theta(1) complexity."""
+        return self.__income_by_month.get((year, month), 0) / 100
+
+    def get_income_by_month(self) -> dict[tuple[int, int], float]:
+        """Returns the income of every month with booked nights, keyed by (year, month). O(months) complexity."""
+        return {month: income / 100 for month, income in sorted(self.__income_by_month.items())}
+
+    def get_income_between(self, start_date: date, end_date: date) -> float:
+        """
+        Returns the income of the nights from start_date up to, but not including, end_date.
+        Same complexity as ReservationRepository.count_room_nights_by_room.
+        """
+        nights_by_room = self.__reservation_repository.count_room_nights_by_room(start_date, end_date)
+        return sum(nights * self.__prices.get(room_id, 0) for room_id, nights in nights_by_room.items()) / 100
+
+    # Listeners
+    def _on_reservation_changed(self, event) -> None:
+        """Applies a reservation change. O(M) complexity for stays spanning M months."""
+        if isinstance(event, EntitiesReloaded):
+            self.__resync()
+            return
+        old, new = before_and_after(event)
+        if old is not None:
+            self.__add_stay(old, -1)
+        if new is not None:
+            self.__add_stay(new, 1)
+
+    def _on_element_changed(self, event) -> None:
+        """Applies a room change. O(M) complexity for the M months in which the room has booked nights."""
+        if isinstance(event, EntitiesReloaded):
+            self.__resync()
+            return
+        old, new = before_and_after(event)
+        if (new or old).type != "room":
+            return
+        room_id = event.entity_id
+        self.__move_room_income(room_id, -1)
+        if new is None:
+            self.__prices.pop(room_id, None)
+            self.__floors.pop(room_id, None)
+        else:
+            self.__prices[room_id] = self._to_cents(new.price_per_night)
+            self.__floors[room_id] = new.floor_id
+        self.__move_room_income(room_id, 1)
+
+    # Aggregates
+    def __resync(self) -> None:
+        """Rebuilds every total from the repositories. O(n M + R) complexity for n reservations and R rooms."""
+        self.__prices = {}  # room_id -> price per night, in cents
+        self.__floors = {}
+        self.__nights_by_room = {}
+        self.__nights_by_room_month = {}
+        self.__income_by_floor = {}
+        self.__income_by_month = {}
+        self.__total = 0
+        for room in self.__hotel_repository.get_all_rooms():
+            self.__prices[room.db_id] = self._to_cents(room.price_per_night)
+            self.__floors[room.db_id] = room.floor_id
+        for reservation in self.__reservation_repository.get_all_reservations():
+            self.__add_stay(reservation, 1)
+
+    def __add_stay(self, reservation: Reservation, sign: int) -> None:
+        """Adds (sign 1) or subtracts (sign -1) the nights of a stay and their income."""
+        room_id = reservation.room_id
+        price = self.__prices.get(room_id, 0)
+        floor_id = self.__floors.get(room_id)
+        months = self.__nights_by_room_month.setdefault(room_id, {})
+        for month, nights in self._nights_by_month(reservation.check_in_date, reservation.check_out_date):
+            nights *= sign
+            self._add(months, month, nights)
+            self._add(self.__nights_by_room, room_id, nights)
+            self._add(self.__income_by_month, month, nights * price)
+            if floor_id is not None:
+                self._add(self.__income_by_floor, floor_id, nights * price)
+            self.__total += nights * price
+        if not months:
+            del self.__nights_by_room_month[room_id]
+
+    def __move_room_income(self, room_id: int, sign: int) -> None:
+        """Adds (sign 1) or subtracts (sign -1) the income of every booked night of a room at its current price."""
+        price = self.__prices.get(room_id, 0)
+        if not price:
+            return
+        floor_id = self.__floors.get(room_id)
+        for month, nights in self.__nights_by_room_month.get(room_id, {}).items():
+            self._add(self.__income_by_month, month, sign * nights * price)
+        income = sign * self.__nights_by_room.get(room_id, 0) * price
+        if floor_id is not None:
+            self._add(self.__income_by_floor, floor_id, income)
+        self.__total += income
+
+    @staticmethod
+    def _to_cents(price: float | None) -> int:
+        """Converts a price to integer cents, rounding to the nearest cent."""
+        return round((price or 0) * 100)
+
+    @staticmethod
+    def _add(totals: dict, key, amount: int) -> None:
+        """Adds amount to totals[key], dropping the key when it falls back to zero."""
+        value = totals.get(key, 0) + amount
+        if value:
+            totals[key] = value
+        else:
+            totals.pop(key, None)
+
+    @staticmethod
+    def _nights_by_month(check_in_date: date, check_out_date: date):
+        """Yields ((year, month), nights) for the nights from check_in_date up to, but not including, check_out_date."""
+        start = check_in_date
+        while start < check_out_date:
+            next_month = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+            end = min(next_month, check_out_date)
+            yield (start.year, start.month), (end - start).days
+            start = end
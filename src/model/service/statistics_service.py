@@ -0,0 +1,109 @@
+from datetime import date
+
+from src.model.domain.reservation import Reservation
+from src.model.repository.hotel_repository import HotelRepository
+from src.model.repository.reservation_repository import ReservationRepository
+from src.utilities.change_events import (EntityAdded, EntityRemoved, EntitiesReloaded, before_and_after, ELEMENT,
+                                          RESERVATION)
+from src.utilities.date_codec import to_day
+
+
+class StatisticsService:
+    """
+    Service layer keeping the dashboard counters of the hotel up to date as the repositories change.
+
+    It counts rooms and reservations, and per day the arrivals (check-ins), departures (check-outs) and occupied
+    rooms (stays covering the night of that day). Each reservation change is applied as a delta over the nights of
+    the stays concerned; a reload of a repository recounts what it holds. Every getter is then a lookup.
+    """
+
+    def __init__(self, reservation_repository: ReservationRepository, hotel_repository: HotelRepository):
+        self.__reservation_repository = reservation_repository
+        self.__hotel_repository = hotel_repository
+        self.__resync_rooms()
+        self.__resync_reservations()
+        reservation_repository.events.subscribe(self._on_reservation_changed, RESERVATION)
+        hotel_repository.events.subscribe(self._on_element_changed, ELEMENT)
+
+    # Getters
+    def get_floor_count(self) -> int:
+        """Returns the number of floors. Theta(1) complexity."""
+        return self.__hotel_repository.count_floors()
+
+    def get_room_count(self) -> int:
+        """Returns the number of rooms. Theta(1) complexity."""
+        return len(self.__room_ids)
+
+    def get_reservation_count(self) -> int:
+        """Returns the number of reservations. Theta(1) complexity."""
+        return self.__reservation_count
+
+    def get_arrivals(self, day: date) -> int:
+        """Returns the number of reservations checking in on the given day. Theta(1) complexity."""
+        return self.__arrivals.get(to_day(day), 0)
+
+    def get_departures(self, day: date) -> int:
+        """Returns the number of reservations checking out on the given day. Theta(1) complexity."""
+        return self.__departures.get(to_day(day), 0)
+
+    def get_occupied_rooms(self, day: date) -> int:
+        """Returns the number of rooms occupied on the night of the given day. Theta(1) complexity."""
+        return self.__occupied.get(to_day(day), 0)
+
+    def get_occupancy_rate(self, day: date) -> float:
+        """Returns the share of rooms occupied on the night of the given day, from 0 to 1. Theta(1) complexity."""
+        if not self.__room_ids:
+            return 0.0
+        return min(1.0, self.get_occupied_rooms(day) / len(self.__room_ids))
+
+    # Listeners
+    def _on_reservation_changed(self, event) -> None:
+        """Applies a reservation change. O(N) complexity for N nights in the stays concerned."""
+        if isinstance(event, EntitiesReloaded):
+            self.__resync_reservations()
+            return
+        old, new = before_and_after(event)
+        if old is not None:
+            self.__add_stay(old, -1)
+        if new is not None:
+            self.__add_stay(new, 1)
+
+    def _on_element_changed(self, event) -> None:
+        """Applies a room change. Theta(1) complexity."""
+        if isinstance(event, EntitiesReloaded):
+            self.__resync_rooms()
+        elif isinstance(event, EntityAdded) and event.entity.type == "room":
+            self.__room_ids.add(event.entity_id)
+        elif isinstance(event, EntityRemoved):
+            self.__room_ids.discard(event.entity_id)
+
+    # Counters
+    def __resync_rooms(self) -> None:
+        self.__room_ids = {room.db_id for room in self.__hotel_repository.get_all_rooms()}
+
+    def __resync_reservations(self) -> None:
+        """Recounts every reservation. O(n N) complexity for n reservations of N nights."""
+        self.__reservation_count = 0
+        self.__arrivals = {}
+        self.__departures = {}
+        self.__occupied = {}
+        for reservation in self.__reservation_repository.get_all_reservations():
+            self.__add_stay(reservation, 1)
+
+    def __add_stay(self, reservation: Reservation, sign: int) -> None:
+        """Adds (sign 1) or subtracts (sign -1) a reservation from the counters."""
+        check_in, check_out = to_day(reservation.check_in_date), to_day(reservation.check_out_date)
+        self.__reservation_count += sign
+        self._add(self.__arrivals, check_in, sign)
+        self._add(self.__departures, check_out, sign)
+        for day in range(check_in, check_out):
+            self._add(self.__occupied, day, sign)
+
+    @staticmethod
+    def _add(counts: dict, key, amount: int) -> None:
+        """Adds amount to counts[key], dropping the key when it falls back to zero."""
+        value = counts.get(key, 0) + amount
+        if value:
+            counts[key] = value
+        else:
+            counts.pop(key, None)
@@ -0,0 +1,78 @@
+"""
+Change Events for Hotel Simulator
+This module defines the events published by the repositories when their entities change, and the bus that delivers
+them. Events are delivered synchronously, after the change is applied to the in-memory state, so a handler can read
+the repository it came from. Each event names the entity type and ID; the entity itself is the model object at the
+repository level, and the DTO once forwarded by the Controller.
+"""
+
+from dataclasses import dataclass
+
+
+FLOOR = "floor"
+ELEMENT = "element"
+RESERVATION = "reservation"
+
+
+@dataclass(frozen=True)
+class EntityAdded:
+    entity_type: str
+    entity_id: object
+    entity: object = None
+
+@dataclass(frozen=True)
+class EntityUpdated:
+    """An entity changed in place. previous is a copy of the entity before the change, when the publisher has one."""
+    entity_type: str
+    entity_id: object
+    entity: object = None
+    previous: object = None
+
+@dataclass(frozen=True)
+class EntityRemoved:
+    entity_type: str
+    entity_id: object
+    entity: object = None
+
+@dataclass(frozen=True)
+class EntitiesReloaded:
+    """Every entity of the type may have changed, e.g. after a rollback: subscribers should resynchronize."""
+    entity_type: str
+
+
+def before_and_after(event) -> tuple:
+    """Returns the (old, new) states of the entity of an added, updated or removed event; None where absent."""
+    if isinstance(event, EntityAdded):
+        return None, event.entity
+    if isinstance(event, EntityUpdated):
+        return event.previous, event.entity
+    if isinstance(event, EntityRemoved):
+        return event.entity, None
+    return None, None
+
+
+class ChangeBus:
+    """
+    Synchronous publish/subscribe of change events. Handlers subscribe to one entity type, or to every type with
+    entity_type None, and are called in subscription order. Publishing is O(h) for h handlers of the type.
+    """
+
+    def __init__(self):
+        self.__handlers = {}
+
+    def subscribe(self, handler, entity_type: str = None) -> None:
+        """Registers a callable handler(event) for the events of the given entity type, or of all types."""
+        self.__handlers.setdefault(entity_type, []).append(handler)
+
+    def unsubscribe(self, handler, entity_type: str = None) -> None:
+        """Removes a handler registered with the same entity type. Does nothing if it is not registered."""
+        handlers = self.__handlers.get(entity_type, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    def has_subscribers(self, entity_type: str) -> bool:
+        return bool(self.__handlers.get(entity_type) or self.__handlers.get(None))
+
+    def publish(self, event) -> None:
+        for handler in (*self.__handlers.get(event.entity_type, ()), *self.__handlers.get(None, ())):
+            handler(event)
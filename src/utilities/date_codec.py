@@ -0,0 +1,46 @@
+"""
+Date Codec for Hotel Simulator
+This module is the single place where reservation dates are parsed, formatted and converted to day ordinals.
+Day ordinals are the integers returned by date.toordinal() (0001-01-01 is day 1); they are what the database
+stores and what the overlap indexes compare.
+"""
+
+from datetime import date
+from functools import lru_cache
+
+
+ISO_DATE_FORMAT = "YYYY-MM-DD"
+
+
+@lru_cache(maxsize=4096)
+def parse_iso_date(value: str) -> date:
+    """
+    Parses a strict YYYY-MM-DD string. The same few hundred dates come back over and over (calendar pickers,
+    generated bookings), so results are memoized.
+    """
+    if not isinstance(value, str) or len(value) != 10 or value[4] != "-" or value[7] != "-":
+        raise ValueError(f"Invalid date format, expected {ISO_DATE_FORMAT}: {value}")
+    try:
+        return date.fromisoformat(value)
+    except ValueError as e:
+        raise ValueError(f"Invalid date format, expected {ISO_DATE_FORMAT}: {value}") from e
+
+def format_iso_date(value: date) -> str:
+    """Formats a date as YYYY-MM-DD."""
+    return value.isoformat()
+
+def to_day(value: date) -> int:
+    """Converts a date to its day ordinal."""
+    return value.toordinal()
+
+@lru_cache(maxsize=65536)
+def from_day(day: int) -> date:
+    """
+    Converts a day ordinal back to a date. Memoized, so that all the reservations loaded for a given day share one
+    date object instead of holding a copy each.
+    """
+    return date.fromordinal(day)
+
+def iso_to_day(value: str) -> int:
+    """Parses a YYYY-MM-DD string straight to its day ordinal."""
+    return parse_iso_date(value).toordinal()
@@ -16,6 +16,8 @@ class ReservationAlreadyExistsError(RepositoryError):
     pass
 class ReservationNotFoundError(RepositoryError):
     pass
+class ReservationConflictError(RepositoryError):
+    pass
 
 class FloorAlreadyExistsError(RepositoryError):
     pass
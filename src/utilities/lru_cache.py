@@ -0,0 +1,45 @@
+from collections import OrderedDict
+
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Fixed-capacity mapping that evicts the least recently used entry, backed by an OrderedDict.
+    None is a valid cached value, so lookups that found nothing can be cached as well.
+    """
+
+    def __init__(self, capacity: int = 256):
+        if capacity <= 0:
+            raise ValueError("LRU cache capacity must be positive!")
+        self.__capacity = capacity
+        self.__entries = OrderedDict()
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self.__entries
+
+    def get(self, key, default=None):
+        """Returns the cached value and marks it as most recently used. Theta(1) complexity."""
+        value = self.__entries.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        self.__entries.move_to_end(key)
+        return value
+
+    def put(self, key, value) -> None:
+        """Caches a value, evicting the least recently used entry when full. Theta(1) complexity."""
+        self.__entries[key] = value
+        self.__entries.move_to_end(key)
+        if len(self.__entries) > self.__capacity:
+            self.__entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.__entries.clear()
@@ -1,6 +1,7 @@
 import random
 from datetime import timedelta
 from src.controller.dto import MakeReservationRequest
+from src.utilities.exceptions import ActionError, ControllerError
 
 
 class ReservationGenerator:
@@ -25,8 +26,10 @@ class ReservationGenerator:
         # Calculate target number of rooms to fill each day
         target_room_count = max(1, int(len(all_rooms) * (occupancy_percentage / 100.0)))
 
-        # Track how many reservations we create
-        reservations_created = 0
+        # Collect the bookings and write them in one batch at the end
+        requests = []
+        # Check-out date of the last booking collected for each room; a room is busy up to and including it
+        booked_until = {}
 
         # Create reservations for each day in range
         current_date = start_date
@@ -34,8 +37,11 @@ class ReservationGenerator:
             # For each date, create reservations up to the target occupancy
             date_string = current_date.strftime("%Y-%m-%d")
 
-            # Find available rooms for this date
-            available_rooms = self._get_available_rooms_for_date(date_string, all_rooms)
+            # Find available rooms for this date, leaving out rooms already booked by this batch
+            available_rooms = [
+                room for room in self._get_available_rooms_for_date(date_string, all_rooms)
+                if room.db_id not in booked_until or booked_until[room.db_id] < current_date
+            ]
 
             # Calculate how many new reservations we need
             rooms_to_book = min(target_room_count, len(available_rooms))
@@ -66,17 +72,35 @@ class ReservationGenerator:
                     check_out_date=checkout_date.strftime("%Y-%m-%d")
                 )
 
-                # Make the reservation
-                try:
-                    self.controller.make_reservation(req)
-                    reservations_created += 1
-                except Exception as e:
-                    print(f"Failed to create reservation: {e}")
+                # Skip stays that run into an existing reservation
+                if not self.controller.is_room_available(
+                        req.room_id, req.check_in_date, req.check_out_date, req.number_of_guests
+                ):
+                    continue
+
+                requests.append(req)
+                booked_until[room.db_id] = checkout_date
 
             # Move to next day
             current_date += timedelta(days=1)
 
-        return reservations_created
+        return self._make_reservations(requests)
+
+    def _make_reservations(self, requests):
+        """
+        Make the reservations in a single transaction. If the batch is rejected, split it in halves and retry each,
+        so that only the rejected bookings are skipped. Returns the number of reservations made.
+        """
+        if not requests:
+            return 0
+        try:
+            self.controller.make_reservations_bulk(requests)
+            return len(requests)
+        except (ControllerError, ActionError):
+            if len(requests) == 1:
+                return 0
+        middle = len(requests) // 2
+        return self._make_reservations(requests[:middle]) + self._make_reservations(requests[middle:])
 
     def _get_all_rooms(self):
         """Get all rooms from all floors"""
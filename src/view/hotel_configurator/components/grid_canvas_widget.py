@@ -45,21 +45,55 @@ class GridCanvas(QWidget):
                     continue
                 if element.position is None:
                     continue
-                elementWidget = FloorElementWidget(
-                    elementType=element.type,
-                    position=pos,
-                    elementId=element.db_id,
-                    number=getattr(element, 'number', None),
-                    capacity=getattr(element, 'capacity', None),
-                    pricePerNight=getattr(element, 'price_per_night', None)
-                )
-                self.elements.append(elementWidget)
+                self.elements.append(self._createElementWidget(element, pos))
                 self.elementPositions[element.db_id] = pos
         self.connections = connections or []
         self.update()
 
+    def setElement(self, element):
+        """Adds the widget of an element, or replaces it if the element is already shown."""
+        self._dropElementWidget(element.db_id)
+        self.elements.append(self._createElementWidget(element, element.position))
+        self.elementPositions[element.db_id] = element.position
+        self.update()
+
+    def removeElement(self, elementId):
+        """Removes the widget of an element and its connections."""
+        self._dropElementWidget(elementId)
+        self.elementPositions.pop(elementId, None)
+        self.connections = [c for c in self.connections if elementId not in c]
+        self.update()
+
+    def hasElement(self, elementId):
+        return elementId in self.elementPositions
+
+    def setConnections(self, connections):
+        self.connections = connections or []
+        self.update()
+
+    def _createElementWidget(self, element, pos):
+        return FloorElementWidget(
+            elementType=element.type,
+            position=pos,
+            elementId=element.db_id,
+            number=getattr(element, 'number', None),
+            capacity=getattr(element, 'capacity', None),
+            pricePerNight=getattr(element, 'price_per_night', None)
+        )
+
+    def _dropElementWidget(self, elementId):
+        if elementId not in self.elementPositions:
+            return
+        for index, el in enumerate(self.elements):
+            if el.elementId == elementId:
+                if el is self.selectedElement:
+                    self.selectedElement = None
+                del self.elements[index]
+                break
+
     def clearFloorElements(self):
         self.elements = []
+        self.elementPositions = {}
         self.connections = []
         self.selectedElement = None
         self.update()
@@ -2,6 +2,7 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, Q
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor, QFont
 
+from src.utilities.change_events import EntityUpdated, EntityRemoved
 from src.view.hotel_configurator.components.floor_list_widget import FloorListWidget
 
 
@@ -209,6 +210,28 @@ class SideBar(QWidget):
             item.setData(Qt.ItemDataRole.UserRole, floor)
             self.floorList.addItem(item)
 
+    def applyFloorChange(self, event):
+        """Applies one floor change to the list, which is only rebuilt when the order of the floors may change."""
+        if isinstance(event, EntityUpdated):
+            item = self._floorItem(event.entity_id)
+            if item is not None and item.data(Qt.ItemDataRole.UserRole).level == event.entity.level:
+                item.setText(event.entity.name)
+                item.setData(Qt.ItemDataRole.UserRole, event.entity)
+                return
+        elif isinstance(event, EntityRemoved):
+            item = self._floorItem(event.entity_id)
+            if item is not None:
+                self.floorList.takeItem(self.floorList.row(item))
+                return
+        self.populateFloorList()
+
+    def _floorItem(self, floorId):
+        for i in range(self.floorList.count()):
+            item = self.floorList.item(i)
+            if item.data(Qt.ItemDataRole.UserRole).db_id == floorId:
+                return item
+        return None
+
     def displayRoomDetails(self, room):
         if room:
             self.roomNumberEdit.setText(str(room.number))
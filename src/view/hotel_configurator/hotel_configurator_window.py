@@ -6,6 +6,7 @@ from PyQt6.QtWidgets import (
 
 from src.controller.dto import AddFloorRequest, RenameFloorRequest, UpdateFloorLevelRequest, RemoveFloorRequest, \
     AddElementRequest, EditRoomRequest, MoveElementRequest, RemoveElementRequest
+from src.utilities.change_events import EntityUpdated, EntityRemoved, EntitiesReloaded, FLOOR, ELEMENT
 from src.view.components.top_bar import TopBar
 from src.view.hotel_configurator.components.side_bar import SideBar
 from src.view.hotel_configurator.components.hot_bar import HotBar
@@ -23,6 +24,8 @@ class HotelConfiguratorWindow(QMainWindow):
         self.selectedRoom = None
 
         self.setupUi()
+        self.controller.subscribe(self.handleFloorChange, FLOOR)
+        self.controller.subscribe(self.handleElementChange, ELEMENT)
 
     def setupUi(self):
         self.setWindowTitle("Hotel Configurator")
@@ -75,25 +78,16 @@ class HotelConfiguratorWindow(QMainWindow):
         self.controller.undo()
         self.updateUndoRedoButtons()
 
-        self.sideBar.populateFloorList()
+        # The floor list and the grid were updated by the change events of the undone action
         self.ensureSelectedFloorExists()
-        floorGrid = self.controller.get_floor_grid(self.selectedFloor.db_id)
-        connections = self.controller.get_floor_connections(self.selectedFloor.db_id)
-        self.gridCanvas.setFloorElements(floorGrid, connections)
         self.gridCanvas.selectElement(None)
-        self.gridCanvas.update()
 
     def redoAction(self):
         self.controller.redo()
         self.updateUndoRedoButtons()
 
-        self.sideBar.populateFloorList()
         self.ensureSelectedFloorExists()
-        floorGrid = self.controller.get_floor_grid(self.selectedFloor.db_id)
-        connections = self.controller.get_floor_connections(self.selectedFloor.db_id)
-        self.gridCanvas.setFloorElements(floorGrid, connections)
         self.gridCanvas.selectElement(None)
-        self.gridCanvas.update()
 
     def updateUndoRedoButtons(self):
         self.topBar.setButtonEnabled("↩ Undo", self.controller.can_undo())
@@ -111,6 +105,33 @@ class HotelConfiguratorWindow(QMainWindow):
             self.gridCanvas.selectElement(None)
             self.gridCanvas.update()
 
+    # Change events
+    def handleFloorChange(self, event):
+        self.sideBar.applyFloorChange(event)
+        selectedId = getattr(self.selectedFloor, "db_id", None)
+        if isinstance(event, EntityUpdated) and event.entity_id == selectedId:
+            self.selectedFloor = event.entity
+        elif isinstance(event, EntityRemoved) and event.entity_id == selectedId:
+            self.gridCanvas.clearFloorElements()
+
+    def handleElementChange(self, event):
+        """Applies one element change to the grid if it concerns the selected floor."""
+        if self.selectedFloor is None:
+            return
+        if isinstance(event, EntitiesReloaded):
+            self.ensureSelectedFloorExists()
+            self.refreshGrid()
+            return
+        if isinstance(event, EntityRemoved):
+            if self.gridCanvas.hasElement(event.entity_id):
+                self.gridCanvas.removeElement(event.entity_id)
+            return
+        if event.entity.floor_id != self.selectedFloor.db_id:
+            return
+        self.gridCanvas.setElement(event.entity)
+        # Adding or moving an element relinks it to its neighbours only
+        self.gridCanvas.setConnections(self.controller.get_floor_connections(self.selectedFloor.db_id))
+
     def ensureSelectedFloorExists(self):
         floors = self.controller.get_all_floors()
         if not floors:
@@ -183,7 +204,6 @@ class HotelConfiguratorWindow(QMainWindow):
             req = AddFloorRequest(name=floorName, level=self.sideBar.floorList.count())
             self.controller.add_floor(req)
             self.updateUndoRedoButtons()
-            self.sideBar.populateFloorList()
             QMessageBox.information(self, "Success", "Floor added successfully!")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to add floor: {str(e)}")
@@ -207,7 +227,6 @@ class HotelConfiguratorWindow(QMainWindow):
                 QMessageBox.critical(self, "Error", f"Failed to update floor order: {str(e)}")
                 return
         self.updateUndoRedoButtons()
-        self.sideBar.populateFloorList()
 
     def handleUpdateFloorClick(self):
         if not self.selectedFloor:
@@ -227,7 +246,6 @@ class HotelConfiguratorWindow(QMainWindow):
             req = RenameFloorRequest(floor_id=self.selectedFloor.db_id, new_name=newName)
             self.controller.rename_floor(req)
             self.updateUndoRedoButtons()
-            self.sideBar.populateFloorList()
             QMessageBox.information(self, "Success", "Floor renamed successfully!")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to rename floor: {str(e)}")
@@ -252,8 +270,6 @@ class HotelConfiguratorWindow(QMainWindow):
             req = RemoveFloorRequest(floor_id=self.selectedFloor.db_id)
             self.controller.remove_floor(req)
             self.updateUndoRedoButtons()
-            self.sideBar.populateFloorList()
-            self.gridCanvas.clearFloorElements()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to remove floor: {str(e)}")
             return
@@ -320,7 +336,6 @@ class HotelConfiguratorWindow(QMainWindow):
             self.controller.add_element(req)
             self.updateUndoRedoButtons()
             self.selectedFloor = self.controller.get_floor(self.selectedFloor.db_id)
-            self.refreshGrid()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to add room: {str(e)}")
 
@@ -355,19 +370,13 @@ class HotelConfiguratorWindow(QMainWindow):
             req = EditRoomRequest(self.selectedRoom.elementId, number, capacity, price)
             self.controller.edit_room(req)
             self.updateUndoRedoButtons()
-            self.refreshGrid()
 
             QMessageBox.information(self, "Success", "Room updated successfully!")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to update room: {str(e)}")
 
     def handleElementMoved(self, elementId, newPosition):
-        floorGrid = self.controller.get_floor_grid(self.selectedFloor.db_id)
-        currentPosition = None
-        for position, element in floorGrid.items():
-            if element and element.db_id == elementId:
-                currentPosition = position
-                break
+        currentPosition = self.gridCanvas.elementPositions.get(elementId)
         if currentPosition == newPosition:
             self.refreshGrid()
             return
@@ -376,7 +385,6 @@ class HotelConfiguratorWindow(QMainWindow):
             req = MoveElementRequest(element_id=elementId, floor_id=self.selectedFloor.db_id, position=newPosition)
             self.controller.move_element(req)
             self.updateUndoRedoButtons()
-            self.refreshGrid()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to move element: {str(e)}")
             self.refreshGrid()
@@ -412,7 +420,6 @@ class HotelConfiguratorWindow(QMainWindow):
             )
             self.controller.remove_element(req)
             self.updateUndoRedoButtons()
-            self.refreshGrid()
             if element.type == "room":
                 QMessageBox.information(self, "Success", f"Room successfully deleted!")
         except Exception as e:
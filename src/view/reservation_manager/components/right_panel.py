@@ -6,16 +6,25 @@ from PyQt6.QtWidgets import (
 )
 from datetime import datetime
 
+from src.utilities.change_events import EntityAdded, EntityUpdated, EntityRemoved, EntitiesReloaded, RESERVATION
+
 
 class ReservationRightPanel(QWidget):
     """Right panel for managing reservations."""
+    # Live search shows the best matches only, so typing stays responsive with many reservations loaded.
+    SEARCH_RESULT_LIMIT = 500
+
     def __init__(self, controller, editReservationClick, deleteReservationClick, parent=None):
         super().__init__(parent)
         self.controller = controller
         self.editReservationClick = editReservationClick
         self.deleteReservationClick = deleteReservationClick
+        # The listed items by reservation ID, and whether the list shows every reservation (no filter)
+        self.itemsById = {}
+        self.showingAll = False
 
         self.setupUi()
+        self.controller.subscribe(self.applyChange, RESERVATION)
 
     def setupUi(self):
         self.setAutoFillBackground(True)
@@ -134,18 +143,46 @@ class ReservationRightPanel(QWidget):
 
     def refresh(self):
         reservations = self.controller.get_all_reservations()
-        self.populateReservationsList(reservations)
+        self.populateReservationsList(reservations, showingAll=True)
 
-    def populateReservationsList(self, reservations):
+    def populateReservationsList(self, reservations, showingAll=False):
         self.reservationList.clear()
+        self.itemsById = {}
+        self.showingAll = showingAll
         for r in reservations:
-            text = (
-                f"{r.reservation_id} | Room {r.room_number} | "
-                f"{r.guest_name} | {r.check_in_date} | {r.check_out_date} | {r.number_of_guests}"
-            )
-            item = QListWidgetItem(text)
-            item.setData(Qt.ItemDataRole.UserRole, r)
-            self.reservationList.addItem(item)
+            self._addItem(r)
+
+    def applyChange(self, event):
+        """Applies one reservation change to the list. New reservations are only listed when no filter is set."""
+        if isinstance(event, EntitiesReloaded):
+            if self.showingAll:
+                self.refresh()
+            else:
+                self._onFilterChange()
+        elif isinstance(event, EntityAdded):
+            if self.showingAll:
+                self._addItem(event.entity)
+        elif isinstance(event, EntityUpdated):
+            item = self.itemsById.get(event.entity_id)
+            if item is not None:
+                self._setItem(item, event.entity)
+        elif isinstance(event, EntityRemoved):
+            item = self.itemsById.pop(event.entity_id, None)
+            if item is not None:
+                self.reservationList.takeItem(self.reservationList.row(item))
+
+    def _addItem(self, r):
+        item = QListWidgetItem()
+        self._setItem(item, r)
+        self.reservationList.addItem(item)
+        self.itemsById[r.reservation_id] = item
+
+    def _setItem(self, item, r):
+        item.setText(
+            f"{r.reservation_id} | Room {r.room_number} | "
+            f"{r.guest_name} | {r.check_in_date} | {r.check_out_date} | {r.number_of_guests}"
+        )
+        item.setData(Qt.ItemDataRole.UserRole, r)
 
     def _onSelectionChange(self):
         has = bool(self.reservationList.selectedItems())
@@ -173,14 +210,19 @@ class ReservationRightPanel(QWidget):
             fromDate = datetime.strptime(self.fromBtn.text().split(" ")[1].strip(), "%Y-%m-%d").date()
         if self.toBtn.text() != "To":
             toDate = datetime.strptime(self.toBtn.text().split(" ")[1].strip(), "%Y-%m-%d").date()
-        res = self.controller.reservation_search(s, fromDate, toDate)
+        if not s and fromDate is None and toDate is None:
+            self.refresh()
+            return
+        res = self.controller.reservation_search(s, fromDate, toDate, self.SEARCH_RESULT_LIMIT if s else None)
         self.populateReservationsList(res)
 
     def resetFilters(self):
         self.fromBtn.setText("From")
         self.toBtn.setText("To")
         self.searchBar.setText("")
-        self.populateReservationsList(self.controller.get_all_reservations())
+        # The list of every reservation is kept up to date by applyChange, so it is only reloaded after a filter
+        if not self.showingAll:
+            self.refresh()
 
     def resetAllFilters(self):
         self.directSearchBar.clear()
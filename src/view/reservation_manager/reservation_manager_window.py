@@ -75,14 +75,12 @@ class ReservationManagerWindow(QMainWindow):
         if self.controller.can_undo():
             self.controller.undo()
             self.rightPanel.resetAllFilters()
-            self.rightPanel.populateReservationsList(self.controller.get_all_reservations())
         self.updateUndoRedoButtons()
 
     def redoAction(self):
         if self.controller.can_redo():
             self.controller.redo()
             self.rightPanel.resetAllFilters()
-            self.rightPanel.populateReservationsList(self.controller.get_all_reservations())
         self.updateUndoRedoButtons()
 
     def updateUndoRedoButtons(self):
@@ -119,7 +117,6 @@ class ReservationManagerWindow(QMainWindow):
             self.updateUndoRedoButtons()
 
             self.rightPanel.resetFilters()
-            self.rightPanel.populateReservationsList(self.controller.get_all_reservations())
             QMessageBox.information(self, "Success", "Reservation created successfully!")
             self.leftPanel.nameInput.clear()
         except Exception as e:
@@ -183,7 +180,6 @@ class ReservationManagerWindow(QMainWindow):
                 self.updateUndoRedoButtons()
 
                 self.rightPanel.resetAllFilters()
-                self.rightPanel.populateReservationsList(self.controller.get_all_reservations())
                 QMessageBox.information(self, "Success", "Reservation updated successfully!")
                 dialog.accept()
             except Exception as e:
@@ -215,7 +211,6 @@ class ReservationManagerWindow(QMainWindow):
                 self.controller.delete_reservation(req)
                 self.updateUndoRedoButtons()
                 self.rightPanel.resetAllFilters()
-                self.rightPanel.populateReservationsList(self.controller.get_all_reservations())
                 QMessageBox.information(self, "Success", "Reservation deleted successfully!")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to delete reservation: {str(e)}")
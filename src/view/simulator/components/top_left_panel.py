@@ -10,6 +10,7 @@ class TopLeftPanel(QWidget):
         super().__init__(parent)
         self.generateReservationsCallback = generateReservationsCallback
         self.controller = controller
+        self.currentDate = None
         self.setupUi()
 
     def setupUi(self):
@@ -71,6 +72,24 @@ class TopLeftPanel(QWidget):
         self.incomeValue = QLabel("$0")
         self.incomeValue.setStyleSheet(valueStyle)
 
+        # Row 5: Occupancy of the current day
+        occupancyRateLabel = QLabel("Occupancy Rate:")
+        occupancyRateLabel.setStyleSheet(labelStyle)
+        self.occupancyRateValue = QLabel("0%")
+        self.occupancyRateValue.setStyleSheet(valueStyle)
+
+        # Row 6: Arrivals of the current day
+        arrivalsLabel = QLabel("Arrivals Today:")
+        arrivalsLabel.setStyleSheet(labelStyle)
+        self.arrivalsValue = QLabel("0")
+        self.arrivalsValue.setStyleSheet(valueStyle)
+
+        # Row 7: Departures of the current day
+        departuresLabel = QLabel("Departures Today:")
+        departuresLabel.setStyleSheet(labelStyle)
+        self.departuresValue = QLabel("0")
+        self.departuresValue.setStyleSheet(valueStyle)
+
         # Add to grid
         gridLayout.addWidget(floorsLabel, 0, 0)
         gridLayout.addWidget(self.floorsValue, 0, 1)
@@ -80,6 +99,12 @@ class TopLeftPanel(QWidget):
         gridLayout.addWidget(self.reservationsValue, 2, 1)
         gridLayout.addWidget(incomeLabel, 3, 0)
         gridLayout.addWidget(self.incomeValue, 3, 1)
+        gridLayout.addWidget(occupancyRateLabel, 4, 0)
+        gridLayout.addWidget(self.occupancyRateValue, 4, 1)
+        gridLayout.addWidget(arrivalsLabel, 5, 0)
+        gridLayout.addWidget(self.arrivalsValue, 5, 1)
+        gridLayout.addWidget(departuresLabel, 6, 0)
+        gridLayout.addWidget(self.departuresValue, 6, 1)
 
         layout.addWidget(statsContent)
 
@@ -176,22 +201,20 @@ class TopLeftPanel(QWidget):
 
             self.generateReservationsCallback(fromDate, toDate, occupancy)
 
-    def updateStats(self):
+    def updateStats(self, date=None):
         if not self.controller:
             return
+        if date is not None:
+            self.currentDate = date
+        if self.currentDate is None:
+            return
 
-        # Update floors count
-        floors = self.controller.get_all_floors()
-        self.floorsValue.setText(str(len(floors)))
-
-        # Get room count
-        totalRooms = self.controller.get_total_rooms_count()
-        self.roomsValue.setText(str(totalRooms))
-
-        # Get reservations count
-        reservations = self.controller.get_all_reservations()
-        self.reservationsValue.setText(str(len(reservations)))
-
-        # Get total income
-        totalIncome = self.controller.get_total_reservations_income()
-        self.incomeValue.setText(f"${totalIncome:,.2f}")
\ No newline at end of file
+        # The counters are kept up to date by the statistics service, so this is a handful of lookups
+        stats = self.controller.get_hotel_statistics(self.currentDate.toString("yyyy-MM-dd"))
+        self.floorsValue.setText(str(stats.floors))
+        self.roomsValue.setText(str(stats.rooms))
+        self.reservationsValue.setText(str(stats.reservations))
+        self.incomeValue.setText(f"${stats.income:,.2f}")
+        self.occupancyRateValue.setText(f"{stats.occupancy_rate:.0%}")
+        self.arrivalsValue.setText(str(stats.arrivals))
+        self.departuresValue.setText(str(stats.departures))
\ No newline at end of file
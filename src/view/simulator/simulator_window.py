@@ -121,7 +121,7 @@ class SimulatorWindow(QMainWindow):
             self.simulatorCanvas.updateRoomAvailability(self.currentDate)
             self.simulatorCanvas.update()
             # Update stats when room availability changes
-            self.topLeftPanel.updateStats()
+            self.topLeftPanel.updateStats(self.currentDate)
 
     def generateReservations(self, fromDate, toDate, occupancyPercentage):
         createdCount = self.reservationGenerator.generate_reservations(fromDate, toDate, occupancyPercentage)
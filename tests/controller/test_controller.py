@@ -34,7 +34,7 @@ def make_reservation(reservation_id="R1", room_id=1, guest_name="Alice", number_
     return res
 
 def test_reservation_search_by_id(controller):
-    controller._Controller__reservation_service.get_all_reservations.return_value = [
+    controller._Controller__reservation_service.search_reservations.return_value = [
         make_reservation(reservation_id="R1")
     ]
     controller._Controller__hotel_service.get_rooms_by_partial_number.return_value = []
@@ -43,27 +43,49 @@ def test_reservation_search_by_id(controller):
     assert results[0].reservation_id == "R1"
 
 def test_reservation_search_by_guest_name(controller):
-    controller._Controller__reservation_service.get_all_reservations.return_value = [
+    controller._Controller__reservation_service.search_reservations.return_value = [
         make_reservation(guest_name="Bob")
     ]
     controller._Controller__hotel_service.get_rooms_by_partial_number.return_value = []
     results = controller.reservation_search("bob")
     assert len(results) == 1
     assert results[0].guest_name == "Bob"
+    controller._Controller__reservation_service.search_reservations.assert_called_with("bob", None)
 
 def test_reservation_search_by_partial_room_number(controller):
     room = make_room(db_id=2, number="201")
     controller._Controller__hotel_service.get_rooms_by_partial_number.return_value = [room]
-    controller._Controller__reservation_service.get_all_reservations.return_value = [
+    controller._Controller__reservation_service.search_reservations.return_value = []
+    controller._Controller__reservation_service.get_reservations_by_room_id.return_value = [
         make_reservation(room_id=2)
     ]
     results = controller.reservation_search("20")
     assert len(results) == 1
     assert results[0].room_id == 2
 
+def test_reservation_search_deduplicates_room_matches(controller):
+    reservation = make_reservation(reservation_id="R201", room_id=2)
+    controller._Controller__hotel_service.get_rooms_by_partial_number.return_value = [make_room(db_id=2, number="201")]
+    controller._Controller__reservation_service.search_reservations.return_value = [reservation]
+    controller._Controller__reservation_service.get_reservations_by_room_id.return_value = [
+        reservation, make_reservation(reservation_id="R7", room_id=2)
+    ]
+    results = controller.reservation_search("201")
+    assert [res.reservation_id for res in results] == ["R201", "R7"]
+
+def test_reservation_search_limit(controller):
+    controller._Controller__hotel_service.get_rooms_by_partial_number.return_value = []
+    controller._Controller__reservation_service.search_reservations.return_value = [
+        make_reservation(reservation_id="R1")
+    ]
+    controller.reservation_search("R", limit=5)
+    controller._Controller__reservation_service.search_reservations.assert_called_with("R", 5)
+    controller.reservation_search("R", from_date=date(2024, 6, 1), limit=5)
+    controller._Controller__reservation_service.search_reservations.assert_called_with("R", None)
+
 def test_reservation_search_with_date_filter(controller):
     controller._Controller__hotel_service.get_rooms_by_partial_number.return_value = []
-    controller._Controller__reservation_service.get_all_reservations.return_value = [
+    controller._Controller__reservation_service.search_reservations.return_value = [
         make_reservation(check_in_date=date(2024,6,10), check_out_date=date(2024,6,15))
     ]
     results = controller.reservation_search("R1", from_date=date(2024,6,12))
@@ -79,7 +101,7 @@ def test_reservation_direct_search_by_id(controller):
 
 def test_reservation_direct_search_by_guest_name(controller):
     controller._Controller__reservation_service.get_by_reservation_id.return_value = None
-    controller._Controller__reservation_service.get_all_reservations.return_value = [
+    controller._Controller__reservation_service.get_reservations_by_partial_guest_name.return_value = [
         make_reservation(guest_name="Charlie")
     ]
     results = controller.reservation_direct_search("charlie")
@@ -88,7 +110,8 @@ def test_reservation_direct_search_by_guest_name(controller):
 
 def test_reservation_direct_search_by_room_number(controller):
     controller._Controller__reservation_service.get_by_reservation_id.return_value = None
-    controller._Controller__reservation_service.get_all_reservations.return_value = [
+    controller._Controller__reservation_service.get_reservations_by_partial_guest_name.return_value = []
+    controller._Controller__reservation_service.get_reservations_by_room_id.return_value = [
         make_reservation(room_id=3)
     ]
     room = make_room(db_id=3, number="301")
@@ -104,6 +127,40 @@ def test_get_total_reservations_income(controller):
     controller.get_all_reservations = MagicMock(return_value=[reservation])
     assert controller.get_total_reservations_income() == 3 * 150
 
+def test_income_queries_use_the_revenue_service():
+    revenue_service = MagicMock()
+    revenue_service.get_total_income.return_value = 450.0
+    revenue_service.get_income_between.return_value = 150.0
+    controller = Controller(MagicMock(), MagicMock(), revenue_service)
+    assert controller.get_total_reservations_income() == 450.0
+    assert controller.get_income_between("2024-06-01", "2024-06-02") == 150.0
+    revenue_service.get_income_between.assert_called_with(date(2024, 6, 1), date(2024, 6, 2))
+    controller._Controller__reservation_service.get_all_reservations.assert_not_called()
+
+def test_get_hotel_statistics(controller):
+    statistics_service = MagicMock()
+    statistics_service.get_floor_count.return_value = 2
+    statistics_service.get_room_count.return_value = 10
+    statistics_service.get_reservation_count.return_value = 7
+    statistics_service.get_occupancy_rate.return_value = 0.4
+    statistics_service.get_arrivals.return_value = 3
+    statistics_service.get_departures.return_value = 1
+    revenue_service = MagicMock()
+    revenue_service.get_total_income.return_value = 900.0
+    controller = Controller(MagicMock(), MagicMock(), revenue_service, statistics_service)
+
+    stats = controller.get_hotel_statistics("2024-06-01")
+    assert (stats.floors, stats.rooms, stats.reservations, stats.income) == (2, 10, 7, 900.0)
+    assert (stats.occupancy_rate, stats.arrivals, stats.departures) == (0.4, 3, 1)
+    statistics_service.get_occupancy_rate.assert_called_with(date(2024, 6, 1))
+    assert controller.get_total_rooms_count() == 10
+    controller._Controller__hotel_service.get_all_floors_sorted_by_level.assert_not_called()
+
+def test_income_reports_need_a_revenue_service(controller):
+    from src.utilities.exceptions import ControllerError
+    with pytest.raises(ControllerError):
+        controller.get_income_by_month()
+
 def test_get_room_number_of_reservations(controller):
     controller._Controller__reservation_service.get_reservations_by_room_id.return_value = [
         make_reservation(), make_reservation()
@@ -112,11 +169,25 @@ def test_get_room_number_of_reservations(controller):
 
 def test_get_available_rooms(controller):
     room = make_room(db_id=4, capacity=2)
-    controller._Controller__hotel_service.get_rooms_by_capacity.return_value = [room]
-    controller._Controller__reservation_service.get_reservations_by_room_id.return_value = []
+    controller._Controller__hotel_service.get_rooms_by_min_capacity.return_value = [room]
+    controller._Controller__reservation_service.is_room_free.return_value = True
     results = controller.get_available_rooms("2024-06-01", "2024-06-05", 2)
     assert len(results) == 1
     assert results[0].db_id == 4
+    controller._Controller__hotel_service.get_rooms_by_min_capacity.assert_called_with(2, best_fit=True)
+
+def test_get_available_rooms_skips_booked_rooms(controller):
+    controller._Controller__hotel_service.get_rooms_by_min_capacity.return_value = [make_room(db_id=4, capacity=2)]
+    controller._Controller__reservation_service.is_room_free.return_value = False
+    assert controller.get_available_rooms("2024-06-01", "2024-06-05", 2) == []
+
+def test_get_rooms_availability_for_date(controller):
+    controller._Controller__hotel_service.get_all_rooms.return_value = [make_room(db_id=1), make_room(db_id=2)]
+    controller._Controller__reservation_service.get_occupied_room_ids.return_value = {2, 7}
+    available, unavailable = controller.get_rooms_availability_for_date("2024-06-01")
+    assert available == {1}
+    assert unavailable == {2}
+    controller._Controller__reservation_service.get_occupied_room_ids.assert_called_once_with(date(2024, 6, 1))
 
 def test_get_total_rooms_count(controller):
     floor = MagicMock()
@@ -158,10 +229,222 @@ def test_dto_conversion_methods(controller):
     floor.elements = {1: room, 2: floor_element}
     reservation = make_reservation()
     controller._Controller__hotel_service.get_room_by_id.return_value = room
-    floor_dto = controller._to_floor_dto(floor)
+    floor_dto = controller._floor_dto(floor)
     assert isinstance(floor_dto, FloorDTO)
     assert isinstance(floor_dto.elements[1], RoomDTO)
     assert isinstance(floor_dto.elements[2], FloorElementDTO)
     assert isinstance(controller._to_room_dto(room), RoomDTO)
     assert isinstance(controller._to_floor_element_dto(floor_element), FloorElementDTO)
     assert isinstance(controller._to_reservation_dto(reservation), ReservationDTO)
+
+def test_make_reservations_bulk_checks_every_request(controller):
+    from src.controller.dto import MakeReservationRequest
+    from src.utilities.exceptions import ControllerError
+    controller._Controller__hotel_service.get_room_by_id.return_value = make_room(capacity=2)
+    controller._Controller__reservation_service.is_room_free.side_effect = [True, False]
+    requests = [
+        MakeReservationRequest(1, "Alice", 2, "2024-06-01", "2024-06-03"),
+        MakeReservationRequest(1, "Bob", 2, "2024-06-02", "2024-06-04"),
+    ]
+    with pytest.raises(ControllerError):
+        controller.make_reservations_bulk(requests)
+    controller._Controller__reservation_service.add_reservations_bulk.assert_not_called()
+
+    controller._Controller__reservation_service.is_room_free.side_effect = None
+    controller._Controller__reservation_service.is_room_free.return_value = True
+    controller.make_reservations_bulk(requests)
+    bookings = controller._Controller__reservation_service.add_reservations_bulk.call_args.args[0]
+    assert [b["guest_name"] for b in bookings] == ["Alice", "Bob"]
+    assert controller.can_undo()
+
+@pytest.fixture
+def real_controller():
+    import sqlite3
+    from src.model.database.database_operations import create_hotel_simulator_model
+    from src.model.repository.hotel_repository import HotelRepository
+    from src.model.repository.reservation_repository import ReservationRepository
+    from src.model.service.hotel_service import HotelService
+    from src.model.service.reservation_service import ReservationService
+
+    connection = sqlite3.connect(":memory:")
+    create_hotel_simulator_model(connection)
+    yield Controller(ReservationService(ReservationRepository(connection)), HotelService(HotelRepository(connection)))
+    connection.close()
+
+def test_subscribers_receive_dtos_of_the_changes(real_controller):
+    from src.controller.dto import FloorDTO, RoomDTO, ReservationDTO
+    from src.utilities.change_events import EntityAdded, EntityUpdated, EntityRemoved, RESERVATION
+    hotel_service = real_controller._Controller__hotel_service
+    reservation_service = real_controller._Controller__reservation_service
+    events, reservation_events = [], []
+    real_controller.subscribe(events.append)
+    real_controller.subscribe(reservation_events.append, RESERVATION)
+
+    floor_id = hotel_service.add_floor("Ground", 0)
+    room_id = hotel_service.add_element("room", floor_id, (0, 0), "001", 2, 80.0)
+    reservation_id = reservation_service.make_reservation(room_id, "Alice", 2, "2024-06-01", "2024-06-03")
+    hotel_service.edit_room(room_id, "002", 2, 80.0)
+    reservation_service.delete_reservation(reservation_id)
+
+    assert isinstance(events[0], EntityAdded) and isinstance(events[0].entity, FloorDTO)
+    assert isinstance(events[1].entity, RoomDTO)
+    assert isinstance(events[2].entity, ReservationDTO) and events[2].entity.room_number == "001"
+    assert isinstance(events[3], EntityUpdated) and events[3].entity.number == "002" and events[3].previous is None
+    assert events[4] == EntityRemoved(RESERVATION, reservation_id)
+    assert reservation_events == [events[2], events[4]]
+
+    real_controller.unsubscribe(events.append)
+    hotel_service.add_floor("First", 1)
+    assert len(events) == 5
+
+def test_dtos_are_cached_until_their_generation_changes(real_controller):
+    hotel_service = real_controller._Controller__hotel_service
+    reservation_service = real_controller._Controller__reservation_service
+    ground_id = hotel_service.add_floor("Ground", 0)
+    first_id = hotel_service.add_floor("First", 1)
+    room_id = hotel_service.add_element("room", ground_id, (0, 0), "001", 2, 80.0)
+    hotel_service.add_element("hallway", ground_id, (1, 0))
+    reservation_id = reservation_service.make_reservation(room_id, "Alice", 2, "2024-06-01", "2024-06-03")
+
+    floors = real_controller.get_all_floors()
+    first_floor = real_controller.get_floor(first_id)
+    grid = real_controller.get_floor_grid(ground_id)
+    reservation = real_controller.get_all_reservations()[0]
+    assert real_controller.get_all_floors() == floors
+    assert all(a is b for a, b in zip(real_controller.get_all_floors(), floors))
+    assert real_controller.get_floor_grid(ground_id) is grid
+    assert real_controller.get_all_reservations()[0] is reservation
+    assert grid[(0, 0)] is real_controller.get_room_by_id(room_id)
+
+    hotel_service.edit_room(room_id, "002", 2, 80.0)
+    assert real_controller.get_floor(first_id) is first_floor
+    assert real_controller.get_floor(ground_id).elements[room_id].number == "002"
+    assert real_controller.get_floor_grid(ground_id)[(0, 0)].number == "002"
+    assert real_controller.get_all_reservations()[0].room_number == "002"
+
+    reservation_service.update_reservation(reservation_id, room_id, "Bob", 2, "2024-06-01", "2024-06-03")
+    assert real_controller.get_all_reservations()[0].guest_name == "Bob"
+    hotel_service.rename_floor("First", "Upper")
+    assert real_controller.get_floor(first_id).name == "Upper"
+
+def test_apply_batch_is_undone_as_one_action(real_controller):
+    from src.controller.dto import EditRoomRequest, MakeReservationRequest, MoveElementRequest
+    hotel_service = real_controller._Controller__hotel_service
+    floor_id = hotel_service.add_floor("Ground", 0)
+    room_ids = [hotel_service.add_element("room", floor_id, (i, 0), f"00{i}", 2, 80.0) for i in range(3)]
+
+    real_controller.apply_batch(
+        [EditRoomRequest(room_id, f"00{i}", 2, 100.0) for i, room_id in enumerate(room_ids)]
+        + [MakeReservationRequest(room_id, "Group", 2, "2024-06-01", "2024-06-03") for room_id in room_ids]
+        + [MoveElementRequest(room_ids[0], floor_id, (5, 5)), MoveElementRequest(room_ids[1], floor_id, (0, 0))]
+    )
+    assert [real_controller.get_room_by_id(room_id).price_per_night for room_id in room_ids] == [100.0] * 3
+    assert len(real_controller.get_all_reservations()) == 3
+    assert real_controller.get_room_by_id(room_ids[1]).position == (0, 0)
+
+    real_controller.undo()
+    assert [real_controller.get_room_by_id(room_id).price_per_night for room_id in room_ids] == [80.0] * 3
+    assert real_controller.get_all_reservations() == []
+    assert real_controller.get_room_by_id(room_ids[0]).position == (0, 0)
+    assert not real_controller.can_undo()
+
+    real_controller.redo()
+    assert len(real_controller.get_all_reservations()) == 3
+    assert real_controller.get_room_by_id(room_ids[0]).position == (5, 5)
+
+def test_apply_batch_checks_every_request_up_front(real_controller):
+    from src.controller.dto import AddFloorRequest, EditRoomRequest, MakeReservationRequest, RemoveElementRequest
+    from src.utilities.exceptions import ControllerError
+    hotel_service = real_controller._Controller__hotel_service
+    floor_id = hotel_service.add_floor("Ground", 0)
+    room_id = hotel_service.add_element("room", floor_id, (0, 0), "001", 2, 80.0)
+
+    invalid_batches = [
+        [MakeReservationRequest(room_id, "Alice", 2, "2024-06-01", "2024-06-03"),
+         MakeReservationRequest(room_id, "Bob", 2, "2024-06-02", "2024-06-04")],
+        [AddFloorRequest("First", 1), AddFloorRequest("First", 2)],
+        [EditRoomRequest(room_id, "002", 2, 90.0), RemoveElementRequest(room_id, "room", floor_id, (0, 0))],
+        [AddFloorRequest("First", 1), EditRoomRequest(room_id + 1, "002", 2, 90.0)],
+    ]
+    for batch in invalid_batches:
+        with pytest.raises(ControllerError):
+            real_controller.apply_batch(batch)
+    assert [floor.name for floor in real_controller.get_all_floors()] == ["Ground"]
+    assert real_controller.get_all_reservations() == []
+    assert not real_controller.can_undo()
+
+def test_apply_batch_rolls_back_when_a_request_fails(real_controller, monkeypatch):
+    from src.controller.dto import EditRoomRequest
+    from src.utilities.exceptions import ActionError
+    hotel_service = real_controller._Controller__hotel_service
+    floor_id = hotel_service.add_floor("Ground", 0)
+    room_ids = [hotel_service.add_element("room", floor_id, (i, 0), f"00{i}", 2, 80.0) for i in range(2)]
+    edit_room = hotel_service.edit_room
+
+    def failing_edit_room(element_id, *args):
+        if element_id == room_ids[1]:
+            raise RuntimeError("disk full")
+        edit_room(element_id, *args)
+
+    monkeypatch.setattr(hotel_service, "edit_room", failing_edit_room)
+    with pytest.raises(ActionError):
+        real_controller.apply_batch([EditRoomRequest(room_id, "100", 2, 100.0) for room_id in room_ids])
+    assert real_controller.get_room_by_id(room_ids[0]).price_per_night == 80.0
+    assert not real_controller.can_undo()
+
+def test_apply_batch_checks_guests_against_the_capacity_set_by_the_batch(real_controller):
+    from src.controller.dto import EditRoomRequest, MakeReservationRequest
+    from src.utilities.exceptions import ControllerError
+    hotel_service = real_controller._Controller__hotel_service
+    floor_id = hotel_service.add_floor("Ground", 0)
+    room_id = hotel_service.add_element("room", floor_id, (0, 0), "001", 1, 80.0)
+    party = MakeReservationRequest(room_id, "Big party", 4, "2024-06-01", "2024-06-03")
+
+    real_controller.apply_batch([EditRoomRequest(room_id, "001", 4, 80.0), party])
+    assert real_controller.get_all_reservations()[0].number_of_guests == 4
+    real_controller.undo()
+
+    with pytest.raises(ControllerError):
+        real_controller.apply_batch([EditRoomRequest(room_id, "001", 4, 80.0),
+                                     EditRoomRequest(room_id, "001", 1, 80.0), party])
+    assert real_controller.get_room_by_id(room_id).capacity == 1
+    assert real_controller.get_all_reservations() == []
+
+def test_failed_cascading_batch_keeps_the_undo_history(real_controller, monkeypatch):
+    from src.controller.dto import AddFloorRequest, RemoveElementRequest
+    from src.utilities.exceptions import ActionError
+    hotel_service = real_controller._Controller__hotel_service
+    real_controller.add_floor(AddFloorRequest("Ground", 0))
+    floor_id = hotel_service.get_floor_id("Ground")
+    room_id = hotel_service.add_element("room", floor_id, (0, 0), "001", 2, 80.0)
+
+    def failing_remove_element(*args):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(hotel_service, "remove_element", failing_remove_element)
+    with pytest.raises(ActionError):
+        real_controller.apply_batch([RemoveElementRequest(room_id, "room", floor_id, (0, 0))])
+    assert real_controller.can_undo()
+    assert real_controller.get_room_by_id(room_id) is not None
+
+def test_apply_batch_follows_the_inclusive_stay_rule(real_controller):
+    from src.controller.dto import EditReservationRequest, MakeReservationRequest
+    from src.utilities.exceptions import ControllerError
+    hotel_service = real_controller._Controller__hotel_service
+    floor_id = hotel_service.add_floor("Ground", 0)
+    room_id = hotel_service.add_element("room", floor_id, (0, 0), "001", 2, 80.0)
+
+    with pytest.raises(ControllerError):
+        real_controller.apply_batch([MakeReservationRequest(room_id, "Alice", 2, "2024-06-01", "2024-06-03"),
+                                     MakeReservationRequest(room_id, "Bob", 2, "2024-06-03", "2024-06-05")])
+    assert real_controller.get_all_reservations() == []
+
+    real_controller.make_reservation(MakeReservationRequest(room_id, "Alice", 2, "2024-06-01", "2024-06-03"))
+    reservation_id = real_controller.get_all_reservations()[0].reservation_id
+    real_controller.apply_batch([
+        EditReservationRequest(reservation_id, room_id, "Alice", 2, "2024-06-01", "2024-06-04"),
+        EditReservationRequest(reservation_id, room_id, "Alice", 2, "2024-06-01", "2024-06-05"),
+        MakeReservationRequest(room_id, "Bob", 2, "2024-06-07", "2024-06-09"),
+    ])
+    assert [r.check_out_date for r in real_controller.get_all_reservations()
+            if r.reservation_id == reservation_id] == [date(2024, 6, 5)]
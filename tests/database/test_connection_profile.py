@@ -0,0 +1,56 @@
+import pytest
+import sqlite3
+
+from src.model.database.connection_profile import (ConnectionProfile, PROFILES, get_profile,
+                                                   apply_connection_profile)
+from src.model.database.database_manager import DatabaseManager
+from src.utilities.exceptions import DatabaseError
+
+
+def test_presets_are_valid():
+    assert {"durable", "balanced", "bulk-load"} <= set(PROFILES)
+    for profile in PROFILES.values():
+        assert profile.validate() == []
+
+def test_get_profile_by_name_and_instance():
+    assert get_profile("durable") is PROFILES["durable"]
+    custom = ConnectionProfile(synchronous="FULL", busy_timeout=100)
+    assert get_profile(custom) is custom
+
+def test_get_profile_rejects_unknown_and_invalid():
+    with pytest.raises(DatabaseError):
+        get_profile("turbo")
+    with pytest.raises(DatabaseError):
+        get_profile(ConnectionProfile(synchronous="NORMAL; DROP TABLE floors"))
+    assert len(ConnectionProfile(journal_mode=None, synchronous=1, temp_store=2).validate()) == 3
+
+def test_apply_profile_on_file_database(tmp_path):
+    conn = sqlite3.connect(tmp_path / "test.db")
+    apply_connection_profile(conn, PROFILES["durable"])
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5_000
+    apply_connection_profile(conn, PROFILES["bulk-load"])
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 0
+    assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+    conn.close()
+
+def test_apply_profile_inside_transaction_raises(in_memory_db):
+    in_memory_db.execute("CREATE TABLE t (x INTEGER)")
+    in_memory_db.execute("INSERT INTO t VALUES (1)")
+    with pytest.raises(DatabaseError):
+        apply_connection_profile(in_memory_db, PROFILES["balanced"])
+
+def test_manager_profile_from_argument_and_environment(tmp_path, monkeypatch):
+    manager = DatabaseManager(str(tmp_path / "a.db"), profile="durable")
+    assert manager.profile is PROFILES["durable"]
+    manager.set_profile("bulk-load")
+    assert manager.conn.execute("PRAGMA synchronous").fetchone()[0] == 0
+
+    monkeypatch.setenv("HOTEL_SIMULATOR_DB_PROFILE", "bulk-load")
+    assert DatabaseManager(str(tmp_path / "b.db")).profile is PROFILES["bulk-load"]
+    monkeypatch.delenv("HOTEL_SIMULATOR_DB_PROFILE")
+    default = DatabaseManager(str(tmp_path / "c.db"))
+    assert default.profile is None
+    assert default.conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    assert default.conn.execute("PRAGMA synchronous").fetchone()[0] == 2
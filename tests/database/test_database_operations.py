@@ -1,6 +1,7 @@
 import pytest
 from src.model.database.database_operations import *
 from src.utilities.exceptions import DatabaseError
+from src.utilities.date_codec import iso_to_day
 
 
 def test_create_hotel_simulator_model(in_memory_db):
@@ -9,7 +10,7 @@ def test_create_hotel_simulator_model(in_memory_db):
 
     # Verify tables were created
     cursor = in_memory_db.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")
     tables = [row[0] for row in cursor.fetchall()]
 
     # Assert expected tables exist based on actual schema
@@ -91,7 +92,7 @@ def test_reservation_operations(in_memory_db):
 
     # Test insert_reservation
     reservation_id = "RES-001"
-    insert_reservation(in_memory_db, reservation_id, room_id, "John Doe", 2, "2023-05-01", "2023-05-05")
+    insert_reservation(in_memory_db, reservation_id, room_id, "John Doe", 2, iso_to_day("2023-05-01"), iso_to_day("2023-05-05"))
 
     # Test select_all_reservations
     reservations = select_all_reservations(in_memory_db)
@@ -106,7 +107,7 @@ def test_reservation_operations(in_memory_db):
 
     # Test update_reservation
     db_id = reservation[0]
-    update_reservation(in_memory_db, db_id, "RES-001", room_id, "Jane Doe", 3, "2023-06-01", "2023-06-05")
+    update_reservation(in_memory_db, db_id, "RES-001", room_id, "Jane Doe", 3, iso_to_day("2023-06-01"), iso_to_day("2023-06-05"))
     updated_res = select_reservation_by_reservation_id(in_memory_db, reservation_id)
     assert updated_res[3] == "Jane Doe"  # guest_name
     assert updated_res[4] == 3  # number_of_guests
@@ -124,3 +125,56 @@ def test_error_handling(in_memory_db):
     floor_id = insert_floor(in_memory_db, "Unique Floor", 1)
     with pytest.raises(DatabaseError):
         insert_floor(in_memory_db, "Unique Floor", 2)  # Duplicate name
+
+def test_insert_reservations_bulk(in_memory_db):
+    create_hotel_simulator_model(in_memory_db)
+    rows = [(f"RES-{i:03d}", 1, "Guest", 2, iso_to_day("2023-05-01"), iso_to_day("2023-05-05")) for i in range(1500)]
+    db_ids = insert_reservations_bulk(in_memory_db, rows)
+    assert len(db_ids) == 1500
+    stored = select_reservation_by_reservation_id(in_memory_db, "RES-1499")
+    assert stored[0] == db_ids[-1]
+
+def test_insert_reservations_bulk_is_atomic(in_memory_db):
+    create_hotel_simulator_model(in_memory_db)
+    insert_reservation(in_memory_db, "RES-001", 1, "Guest", 2, iso_to_day("2023-05-01"), iso_to_day("2023-05-05"))
+    rows = [("RES-100", 1, "Guest", 2, iso_to_day("2023-06-01"), iso_to_day("2023-06-05")),
+            ("RES-001", 1, "Guest", 2, iso_to_day("2023-07-01"), iso_to_day("2023-07-05"))]
+    with pytest.raises(DatabaseError):
+        insert_reservations_bulk(in_memory_db, rows)
+    assert select_reservation_by_reservation_id(in_memory_db, "RES-100") is None
+    assert len(select_all_reservations(in_memory_db)) == 1
+
+def test_reservation_range_queries(in_memory_db):
+    create_hotel_simulator_model(in_memory_db)
+    insert_reservation(in_memory_db, "RES-001", 1, "Alice", 2, iso_to_day("2020-01-01"), iso_to_day("2020-01-05"))
+    insert_reservation(in_memory_db, "RES-002", 1, "Bob", 2, iso_to_day("2023-05-01"), iso_to_day("2023-05-05"))
+    insert_reservation(in_memory_db, "RES-003", 2, "Alice", 2, iso_to_day("2023-05-04"), iso_to_day("2023-05-08"))
+    assert [row[1] for row in select_reservations_in_window(in_memory_db, iso_to_day("2023-05-05"), iso_to_day("2023-06-01"))] \
+        == ["RES-002", "RES-003"]
+    assert [row[1] for row in select_reservations_by_room_id(in_memory_db, 1)] == ["RES-001", "RES-002"]
+    assert [row[1] for row in select_reservations_by_guest_name(in_memory_db, "Alice")] == ["RES-001", "RES-003"]
+    assert [row[1] for row in select_overlapping_reservations(in_memory_db, 1, iso_to_day("2019-12-01"), iso_to_day("2020-01-01"))] \
+        == ["RES-001"]
+    assert sorted(select_occupied_room_ids(in_memory_db, iso_to_day("2023-05-04"))) == [1, 2]
+    assert select_occupied_room_ids(in_memory_db, iso_to_day("2023-05-05")) == [2]
+
+def test_reservation_aggregates(in_memory_db):
+    create_hotel_simulator_model(in_memory_db)
+    insert_reservation(in_memory_db, "RES-001", 1, "Alice", 2, iso_to_day("2023-05-01"), iso_to_day("2023-05-05"))
+    insert_reservation(in_memory_db, "RES-002", 1, "Bob", 2, iso_to_day("2023-05-05"), iso_to_day("2023-05-07"))
+    insert_reservation(in_memory_db, "RES-003", 2, "Alice", 2, iso_to_day("2023-05-04"), iso_to_day("2023-05-08"))
+    assert [row[1] for row in select_reservations_active_on(in_memory_db, iso_to_day("2023-05-05"))] \
+        == ["RES-002", "RES-003"]
+    assert [row[1] for row in select_reservations_overlapping_range(
+        in_memory_db, iso_to_day("2023-05-05"), iso_to_day("2023-05-05"))] == ["RES-001", "RES-002", "RES-003"]
+    assert count_reservations_by_room(in_memory_db) == {1: 2, 2: 1}
+    assert sum_room_nights_by_room(in_memory_db, iso_to_day("2023-05-03"), iso_to_day("2023-05-06")) == {1: 3, 2: 2}
+
+def test_select_reservations_matching(in_memory_db):
+    create_hotel_simulator_model(in_memory_db)
+    insert_reservation(in_memory_db, "RES-001", 1, "Alice", 2, iso_to_day("2023-05-01"), iso_to_day("2023-05-05"))
+    insert_reservation(in_memory_db, "RES_002", 1, "Bob 100%", 2, iso_to_day("2023-05-05"), iso_to_day("2023-05-07"))
+    assert [row[1] for row in select_reservations_matching(in_memory_db, "res")] == ["RES-001", "RES_002"]
+    assert [row[1] for row in select_reservations_matching(in_memory_db, "ALI")] == ["RES-001"]
+    assert [row[1] for row in select_reservations_matching(in_memory_db, "_")] == ["RES_002"]
+    assert [row[1] for row in select_reservations_matching(in_memory_db, "0%")] == ["RES_002"]
@@ -0,0 +1,79 @@
+import pytest
+from datetime import date
+
+from src.model.database.migrations import MIGRATIONS, LATEST_VERSION, get_schema_version, migrate
+from src.model.database.database_operations import create_hotel_simulator_model
+from src.utilities.exceptions import DatabaseError
+
+
+def index_names(connection):
+    rows = connection.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'")
+    return {row[0] for row in rows}
+
+def test_fresh_database_reaches_latest_version(in_memory_db):
+    create_hotel_simulator_model(in_memory_db)
+    assert get_schema_version(in_memory_db) == LATEST_VERSION
+    assert {"idx_elements_floor_id", "idx_reservation_stays_guest_name"} <= index_names(in_memory_db)
+
+def test_migrations_are_idempotent(in_memory_db):
+    create_hotel_simulator_model(in_memory_db)
+    create_hotel_simulator_model(in_memory_db)
+    assert get_schema_version(in_memory_db) == LATEST_VERSION
+
+def test_legacy_database_is_upgraded_in_place(in_memory_db):
+    # A database created before versioning: tables present, user_version 0, no indexes
+    in_memory_db.executescript(MIGRATIONS[0].script)
+    in_memory_db.execute("INSERT INTO floors (name, level) VALUES ('Lobby', 0)")
+    in_memory_db.commit()
+    assert get_schema_version(in_memory_db) == 0
+
+    assert migrate(in_memory_db) == LATEST_VERSION
+    assert "idx_elements_floor_id" in index_names(in_memory_db)
+    assert in_memory_db.execute("SELECT name FROM floors").fetchone()[0] == "Lobby"
+
+def test_query_plan_uses_floor_index(in_memory_db):
+    create_hotel_simulator_model(in_memory_db)
+    plan = in_memory_db.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM elements WHERE floor_id = ?", (1,)
+    ).fetchall()
+    assert any("idx_elements_floor_id" in row[-1] for row in plan)
+
+def test_query_plan_uses_room_index(in_memory_db):
+    create_hotel_simulator_model(in_memory_db)
+    plan = in_memory_db.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM reservation_stays WHERE room_id = ? AND check_in_day <= ?", (1, 100)
+    ).fetchall()
+    assert any("idx_reservation_stays_room_id_check_in" in row[-1] for row in plan)
+
+def test_newer_database_is_rejected(in_memory_db):
+    in_memory_db.execute(f"PRAGMA user_version = {LATEST_VERSION + 1}")
+    with pytest.raises(DatabaseError):
+        migrate(in_memory_db)
+
+def test_failed_migration_keeps_previous_version(in_memory_db, monkeypatch):
+    migrate(in_memory_db, target_version=1)
+    broken = MIGRATIONS[:1] + [type(MIGRATIONS[1])(2, "broken", "CREATE INDEX idx_x ON missing_table(x);")]
+    monkeypatch.setattr("src.model.database.migrations.MIGRATIONS", broken)
+    with pytest.raises(DatabaseError):
+        migrate(in_memory_db)
+    assert get_schema_version(in_memory_db) == 1
+
+def test_reservation_dates_become_day_ordinals(in_memory_db):
+    migrate(in_memory_db, target_version=2)
+    in_memory_db.execute("""
+        INSERT INTO reservations (reservation_id, room_id, guest_name, number_of_guests, check_in_date, check_out_date)
+        VALUES ('RES-001', 1, 'Alice', 2, '2024-07-01', '2024-07-05')
+    """)
+    in_memory_db.commit()
+    migrate(in_memory_db)
+
+    stored = in_memory_db.execute("SELECT check_in_day, check_out_day FROM reservation_stays").fetchone()
+    assert stored == (date(2024, 7, 1).toordinal(), date(2024, 7, 5).toordinal())
+    view = in_memory_db.execute("SELECT check_in_date, check_out_date FROM reservations").fetchone()
+    assert view == ("2024-07-01", "2024-07-05")
+
+    in_memory_db.execute("UPDATE reservations SET check_out_date = '2024-07-09' WHERE reservation_id = 'RES-001'")
+    assert in_memory_db.execute("SELECT check_out_day FROM reservation_stays").fetchone()[0] \
+        == date(2024, 7, 9).toordinal()
+    in_memory_db.execute("DELETE FROM reservations WHERE reservation_id = 'RES-001'")
+    assert in_memory_db.execute("SELECT COUNT(*) FROM reservation_stays").fetchone()[0] == 0
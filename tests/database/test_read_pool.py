@@ -0,0 +1,91 @@
+import pytest
+import threading
+from datetime import date
+
+from src.model.database.database_manager import DatabaseManager
+from src.model.database.read_pool import ReadOnlyPool
+from src.model.database import database_operations as db
+from src.model.repository.reservation_repository import ReservationRepository
+from src.model.domain.reservation import Reservation
+from src.utilities.exceptions import DatabaseError
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "hotel.db"), profile="durable", read_workers=2)
+    manager.initialize_database()
+    yield manager
+    manager.close()
+
+def test_pool_runs_database_operations(manager):
+    db.insert_floor(manager.conn, "First", 1)
+    assert [row[1] for row in manager.submit_read(db.select_all_floors).result()] == ["First"]
+
+def test_pool_uses_one_connection_per_worker(manager):
+    barrier = threading.Barrier(2)
+
+    def connection_of_thread(connection):
+        barrier.wait(timeout=5)
+        return threading.current_thread().name, id(connection)
+
+    futures = [manager.submit_read(connection_of_thread) for _ in range(2)]
+    results = [future.result() for future in futures]
+    assert len({name for name, _ in results}) == 2
+    assert len({connection for _, connection in results}) == 2
+
+def test_pool_connections_are_read_only(manager):
+    with pytest.raises(DatabaseError):
+        manager.read_pool().run(db.insert_floor, "First", 1)
+
+def test_pool_sees_only_committed_data(manager):
+    with manager.transaction():
+        db.insert_floor(manager.conn, "First", 1)
+        assert manager.read_pool().run(db.select_all_floors) == []
+    assert len(manager.read_pool().run(db.select_all_floors)) == 1
+
+def test_pool_needs_a_database_file(tmp_path):
+    with pytest.raises(DatabaseError):
+        ReadOnlyPool(":memory:")
+    with pytest.raises(DatabaseError):
+        ReadOnlyPool(str(tmp_path / "missing.db"))
+
+def test_pool_needs_wal_mode(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "hotel.db"))
+    manager.initialize_database()
+    with pytest.raises(DatabaseError):
+        manager.read_pool()
+    manager.close()
+
+def test_background_read_does_not_block_writes(manager):
+    for level in range(3):
+        db.insert_floor(manager.conn, f"Floor {level}", level)
+    reading, written = threading.Event(), threading.Event()
+
+    def hold_a_read(connection):
+        cursor = connection.execute("SELECT * FROM floors")
+        cursor.fetchone()
+        reading.set()
+        written.wait(timeout=5)
+        return cursor.fetchall()
+
+    future = manager.submit_read(hold_a_read)
+    assert reading.wait(timeout=5)
+    # Fail fast instead of waiting for the reader to give up its lock
+    manager.conn.execute("PRAGMA busy_timeout = 100")
+    db.insert_floor(manager.conn, "Roof", 3)
+    written.set()
+    future.result()
+
+def test_closed_pool_rejects_work(manager):
+    pool = manager.read_pool()
+    pool.close()
+    with pytest.raises(DatabaseError):
+        pool.submit(db.select_all_floors)
+
+def test_repository_reads_in_the_background(manager):
+    repository = ReservationRepository(manager.conn, read_pool=manager.read_pool())
+    repository.add_reservation(Reservation(reservation_id="RES1", room_id=1, guest_name="Alice", number_of_guests=2,
+                                           check_in_date=date(2024, 7, 1), check_out_date=date(2024, 7, 5)))
+    reservations = repository.get_all_reservations_async().result()
+    assert [r.reservation_id for r in reservations] == ["RES1"]
+    assert reservations[0].check_out_date == date(2024, 7, 5)
@@ -0,0 +1,101 @@
+import pytest
+import sqlite3
+from datetime import date
+
+from src.model.database.database_operations import create_hotel_simulator_model, insert_floor, select_all_floors
+from src.model.database.unit_of_work import unit_of_work, in_unit_of_work
+from src.model.repository.hotel_repository import HotelRepository
+from src.model.repository.reservation_repository import ReservationRepository
+from src.model.service.hotel_service import HotelService
+from src.model.service.reservation_service import ReservationService
+from src.controller.action import RemoveFloorAction
+from src.controller.dto import RemoveFloorRequest
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    conn = sqlite3.connect(tmp_path / "hotel.db")
+    create_hotel_simulator_model(conn)
+    yield conn
+    conn.close()
+
+def floor_names(connection):
+    return sorted(row[1] for row in select_all_floors(connection))
+
+def test_unit_of_work_commits_once_at_the_end(file_db, tmp_path):
+    observer = sqlite3.connect(tmp_path / "hotel.db")
+    with unit_of_work(file_db):
+        assert in_unit_of_work(file_db)
+        insert_floor(file_db, "First", 1)
+        insert_floor(file_db, "Second", 2)
+        assert floor_names(observer) == []
+    assert not in_unit_of_work(file_db)
+    assert floor_names(observer) == ["First", "Second"]
+    observer.close()
+
+def test_unit_of_work_rolls_back_on_error(file_db):
+    with pytest.raises(RuntimeError):
+        with unit_of_work(file_db):
+            insert_floor(file_db, "First", 1)
+            raise RuntimeError("boom")
+    assert floor_names(file_db) == []
+    assert not in_unit_of_work(file_db)
+
+def test_nested_unit_of_work_is_a_savepoint(file_db):
+    with unit_of_work(file_db):
+        insert_floor(file_db, "First", 1)
+        with pytest.raises(RuntimeError):
+            with unit_of_work(file_db):
+                insert_floor(file_db, "Second", 2)
+                raise RuntimeError("boom")
+        insert_floor(file_db, "Third", 3)
+    assert floor_names(file_db) == ["First", "Third"]
+
+def test_database_manager_transaction(db_manager):
+    db_manager.initialize_database()
+    with pytest.raises(RuntimeError):
+        with db_manager.transaction():
+            insert_floor(db_manager.conn, "First", 1)
+            raise RuntimeError("boom")
+    assert floor_names(db_manager.conn) == []
+
+def test_rollback_reloads_the_repository_caches(file_db):
+    hotel_repository = HotelRepository(file_db)
+    reservation_repository = ReservationRepository(file_db)
+    hotel_service = HotelService(hotel_repository)
+    reservation_service = ReservationService(reservation_repository)
+    floor_id = hotel_service.add_floor("First", 1)
+    room_id = hotel_service.add_element("room", floor_id, (0, 0), "101", 2, 100.0)
+    reservation_service.make_reservation(room_id, "Alice", 2, "2024-07-01", "2024-07-05", reservation_id="RES1")
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("boom")
+    action = RemoveFloorAction(hotel_service, reservation_service, RemoveFloorRequest(floor_id=floor_id))
+    hotel_service.remove_floor = fail
+    with pytest.raises(RuntimeError):
+        action.redo()
+
+    assert hotel_repository.get_floor_by_id(floor_id) is not None
+    assert hotel_repository.get_room_by_id(room_id).number == "101"
+    assert reservation_repository.get_by_reservation_id("RES1").check_in_date == date(2024, 7, 1)
+    assert not reservation_repository.is_room_free(room_id, date(2024, 7, 2), date(2024, 7, 3))
+    assert floor_names(file_db) == ["First"]
+
+def test_remove_floor_action_is_one_unit(file_db):
+    hotel_repository = HotelRepository(file_db)
+    reservation_repository = ReservationRepository(file_db)
+    hotel_service = HotelService(hotel_repository)
+    reservation_service = ReservationService(reservation_repository)
+    floor_id = hotel_service.add_floor("First", 1)
+    room_id = hotel_service.add_element("room", floor_id, (0, 0), "101", 2, 100.0)
+    reservation_service.make_reservation(room_id, "Alice", 2, "2024-07-01", "2024-07-05", reservation_id="RES1")
+
+    action = RemoveFloorAction(hotel_service, reservation_service, RemoveFloorRequest(floor_id=floor_id))
+    action.redo()
+    assert floor_names(file_db) == []
+    assert reservation_repository.get_all_reservations() == []
+
+    action.undo()
+    assert floor_names(file_db) == ["First"]
+    restored = reservation_repository.get_by_reservation_id("RES1")
+    assert hotel_repository.get_room_by_id(restored.room_id).number == "101"
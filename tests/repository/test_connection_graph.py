@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from src.model.repository.connection_graph import AdjacencyGraph, ConnectionGraph, NetworkXGraph, create_graph
+from src.utilities.exceptions import RepositoryError
+
+
+def normalized(edges):
+    return sorted(tuple(sorted(edge)) for edge in edges)
+
+def test_create_graph():
+    assert isinstance(create_graph("adjacency"), AdjacencyGraph)
+    assert isinstance(create_graph("networkx"), NetworkXGraph)
+    with pytest.raises(RepositoryError):
+        create_graph("unknown")
+
+def test_incomplete_backend_cannot_be_created():
+    class NodesOnly(ConnectionGraph):
+        def __contains__(self, node):
+            return False
+
+        def add_node(self, node):
+            pass
+
+    with pytest.raises(TypeError):
+        NodesOnly()
+
+def test_adjacency_graph_basics():
+    graph = AdjacencyGraph()
+    graph.add_nodes_from([1, 2, 3])
+    graph.add_edges_from([(1, 2), (2, 3)])
+    assert 3 in graph and 4 not in graph
+    assert graph.degree(2) == 2
+    assert normalized(graph.edges()) == [(1, 2), (2, 3)]
+    assert sorted(graph.edges(2)) == [(2, 1), (2, 3)]
+    graph.remove_edge(1, 3)
+    graph.remove_node(2)
+    assert graph.degree(1) == 0
+    assert graph.edges() == []
+
+def test_backends_agree():
+    rng = random.Random(7)
+    graphs = [AdjacencyGraph(), NetworkXGraph()]
+    for _ in range(2_000):
+        operation = rng.random()
+        u, v = rng.randrange(40), rng.randrange(40)
+        for graph in graphs:
+            if operation < 0.5:
+                graph.add_edge(u, v)
+            elif operation < 0.7:
+                graph.remove_edge(u, v)
+            elif operation < 0.8:
+                graph.remove_node(u)
+            elif operation < 0.9:
+                graph.add_node(u)
+            elif u in graph:
+                graph.remove_edges_from(list(graph.edges(u)))
+    adjacency, networkx = graphs
+    assert normalized(adjacency.edges()) == normalized(networkx.edges())
+    for node in range(40):
+        assert (node in adjacency) == (node in networkx)
+        if node in adjacency:
+            assert adjacency.degree(node) == networkx.degree(node)
+            assert sorted(adjacency.neighbors(node)) == sorted(networkx.neighbors(node))
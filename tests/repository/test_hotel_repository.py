@@ -1,11 +1,12 @@
 import pytest
+import random
 import sqlite3
 
 from src.model.repository.hotel_repository import HotelRepository
 from src.model.domain.floor import Floor
 from src.model.domain.floor_element import FloorElement
 from src.model.domain.room import Room
-from src.utilities.exceptions import FloorAlreadyExistsError, FloorNotFoundError, ElementNotFoundError
+from src.utilities.exceptions import FloorAlreadyExistsError, FloorNotFoundError, ElementNotFoundError, RepositoryError
 
 
 @pytest.fixture
@@ -16,9 +17,9 @@ def in_memory_db():
     yield conn
     conn.close()
 
-@pytest.fixture
-def repo(in_memory_db):
-    return HotelRepository(in_memory_db)
+@pytest.fixture(params=["networkx", "adjacency"])
+def repo(in_memory_db, request):
+    return HotelRepository(in_memory_db, graph_backend=request.param)
 
 def test_add_and_get_floor(repo):
     floor = Floor(db_id=None, name="First", level=1)
@@ -52,6 +53,26 @@ def test_add_and_get_room(repo):
     assert repo.get_room_by_number("101").db_id == room_id
     assert room in repo.get_rooms_by_capacity(2)
 
+def test_get_rooms_by_min_capacity(repo):
+    floor_id = repo.add_floor(Floor(db_id=None, name="First", level=1))
+    specs = [("101", 4, 90.0), ("102", 2, 120.0), ("103", 2, 80.0), ("104", 6, 50.0), ("105", 4, 70.0)]
+    ids = {}
+    for position, (number, capacity, price) in enumerate(specs):
+        ids[number] = repo.add_element(Room(db_id=None, type="room", floor_id=floor_id, position=(0, position),
+                                            number=number, capacity=capacity, price_per_night=price))
+
+    def numbers(rooms):
+        return [room.number for room in rooms]
+    assert numbers(repo.get_rooms_by_min_capacity(3)) == ["101", "105", "104"]
+    assert numbers(repo.get_rooms_by_min_capacity(1, best_fit=True)) == ["103", "102", "105", "101", "104"]
+    assert repo.get_rooms_by_min_capacity(7) == []
+
+    repo.edit_room(ids["104"], "104", 3, 50.0)
+    repo.remove_element(ids["102"], "room", floor_id)
+    repo.remove_element(ids["103"], "room", floor_id)
+    assert numbers(repo.get_rooms_by_min_capacity(0, best_fit=True)) == ["104", "105", "101"]
+    assert repo.get_rooms_by_capacity(2) == []
+
 def test_add_and_remove_element(repo):
     floor = Floor(db_id=None, name="First", level=1)
     floor_id = repo.add_floor(floor)
@@ -61,6 +82,28 @@ def test_add_and_remove_element(repo):
     with pytest.raises(ElementNotFoundError):
         repo.get_room_by_id(element_id)
 
+def test_get_element_by_id(repo):
+    first_id = repo.add_floor(Floor(db_id=None, name="First", level=1))
+    second_id = repo.add_floor(Floor(db_id=None, name="Second", level=2))
+    hallway_id = repo.add_element(FloorElement(db_id=None, type="hallway", floor_id=first_id, position=(1, 1)))
+    room_id = repo.add_element(Room(db_id=None, type="room", floor_id=second_id, position=(0, 0),
+                                    number="201", capacity=2, price_per_night=100.0))
+    assert repo.get_element_by_id(hallway_id).type == "hallway"
+    assert repo.get_element_by_id(room_id) is repo.get_room_by_id(room_id)
+
+    repo.move_element(hallway_id, (2, 1))
+    repo.edit_room(room_id, "202", 3, 90.0)
+    repo.reload()
+    assert repo.get_element_by_id(hallway_id).position == (2, 1)
+    assert repo.get_element_by_id(room_id).number == "202"
+
+    repo.remove_element(hallway_id, "hallway", first_id)
+    with pytest.raises(ElementNotFoundError):
+        repo.get_element_by_id(hallway_id)
+    repo.remove_floor(second_id)
+    with pytest.raises(ElementNotFoundError):
+        repo.get_element_by_id(room_id)
+
 def test_move_and_rename_floor(repo):
     floor = Floor(db_id=None, name="First", level=1)
     floor_id = repo.add_floor(floor)
@@ -70,3 +113,121 @@ def test_move_and_rename_floor(repo):
     assert repo.get_floor_id("Ground") == floor_id
     with pytest.raises(FloorNotFoundError):
         repo.get_floor_id("First")
+
+def normalized(connections):
+    return sorted(tuple(sorted(edge)) for edge in connections)
+
+def test_unknown_graph_backend(in_memory_db):
+    with pytest.raises(RepositoryError):
+        HotelRepository(in_memory_db, graph_backend="igraph")
+
+def test_load_from_db_rebuilds_connections(repo, in_memory_db):
+    ground_id = repo.add_floor(Floor(db_id=None, name="Ground", level=0))
+    first_id = repo.add_floor(Floor(db_id=None, name="First", level=1))
+    hallway_id = repo.add_element(FloorElement(db_id=None, type="hallway", floor_id=ground_id, position=(0, 0)))
+    room_id = repo.add_element(Room(db_id=None, type="room", floor_id=ground_id, position=(1, 0),
+                                    number="001", capacity=2, price_per_night=80.0))
+    stairs_ground_id = repo.add_element(FloorElement(db_id=None, type="staircase", floor_id=ground_id, position=(0, 1)))
+    stairs_first_id = repo.add_element(FloorElement(db_id=None, type="staircase", floor_id=first_id, position=(0, 1)))
+    hallway_first_id = repo.add_element(FloorElement(db_id=None, type="hallway", floor_id=first_id, position=(0, 0)))
+
+    reloaded = HotelRepository(in_memory_db)
+    assert normalized(reloaded.get_all_connections()) == normalized([
+        (hallway_id, room_id), (hallway_id, stairs_ground_id),
+        (stairs_ground_id, stairs_first_id), (stairs_first_id, hallway_first_id),
+    ])
+    assert reloaded.get_room_by_number("001").db_id == room_id
+    assert reloaded.get_floor_grid(first_id)[(0, 1)].db_id == stairs_first_id
+
+def test_per_floor_connections(repo, in_memory_db):
+    ground_id = repo.add_floor(Floor(db_id=None, name="Ground", level=0))
+    first_id = repo.add_floor(Floor(db_id=None, name="First", level=1))
+    hallway_id = repo.add_element(FloorElement(db_id=None, type="hallway", floor_id=ground_id, position=(0, 0)))
+    stairs_ground_id = repo.add_element(FloorElement(db_id=None, type="staircase", floor_id=ground_id, position=(0, 1)))
+    hallway_first_id = repo.add_element(FloorElement(db_id=None, type="hallway", floor_id=first_id, position=(1, 1)))
+    stairs_first_id = repo.add_element(FloorElement(db_id=None, type="staircase", floor_id=first_id, position=(0, 1)))
+
+    for current in (repo, HotelRepository(in_memory_db)):
+        assert normalized(current.get_connections_by_floor_id(ground_id)) == [(hallway_id, stairs_ground_id)]
+        assert normalized(current.get_connections_by_floor_id(first_id)) == [(hallway_first_id, stairs_first_id)]
+        assert current.get_inter_floor_connections_by_floor_id(ground_id) == [(stairs_ground_id, stairs_first_id)]
+        assert current.get_inter_floor_connections_by_floor_id(first_id) == [(stairs_ground_id, stairs_first_id)]
+
+    repo.move_element(hallway_first_id, (2, 2))
+    assert repo.get_connections_by_floor_id(first_id) == []
+    repo.remove_element(stairs_first_id, "staircase", first_id)
+    assert repo.get_inter_floor_connections_by_floor_id(ground_id) == []
+    with pytest.raises(FloorNotFoundError):
+        repo.get_connections_by_floor_id(first_id + 100)
+
+def test_floor_changes_relink_only_matching_staircases(repo, in_memory_db):
+    rng = random.Random(11)
+    floor_ids = [repo.add_floor(Floor(db_id=None, name=f"Floor {level}", level=level)) for level in range(6)]
+    staircases = {}
+    for floor_id in floor_ids:
+        for position in rng.sample([(0, 0), (0, 2), (2, 0), (2, 2)], 2):
+            staircases[repo.add_element(FloorElement(db_id=None, type="staircase", floor_id=floor_id,
+                                                     position=position))] = floor_id
+
+    def expected_links(current):
+        levels = {floor.db_id: floor.level for floor in current.get_all_floors()}
+        live = {element_id: floor_id for element_id, floor_id in staircases.items() if floor_id in levels}
+        return sorted((a, b) for a in live for b in live
+                      if a < b and abs(levels[live[a]] - levels[live[b]]) == 1
+                      and current.get_element_by_id(a).position == current.get_element_by_id(b).position)
+
+    def inter_floor_links(current):
+        return sorted({edge for floor in current.get_all_floors()
+                       for edge in current.get_inter_floor_connections_by_floor_id(floor.db_id)})
+
+    for _ in range(20):
+        repo.move_floor(rng.choice(floor_ids), rng.randrange(-2, 8))
+        assert inter_floor_links(repo) == expected_links(repo)
+    repo.move_element(next(iter(staircases)), (4, 4))
+    repo.remove_floor(floor_ids[2])
+    assert inter_floor_links(repo) == expected_links(repo)
+    assert inter_floor_links(HotelRepository(in_memory_db)) == expected_links(repo)
+
+def test_room_number_indexes_follow_edits(repo):
+    floor_id = repo.add_floor(Floor(db_id=None, name="First", level=1))
+    first = repo.add_element(Room(db_id=None, type="room", floor_id=floor_id, position=(0, 0),
+                                  number="101", capacity=2, price_per_night=100.0))
+    second = repo.add_element(Room(db_id=None, type="room", floor_id=floor_id, position=(0, 1),
+                                   number="A102", capacity=2, price_per_night=100.0))
+    assert [room.db_id for room in repo.get_rooms_by_partial_number("10")] == [first, second]
+    assert [room.db_id for room in repo.get_rooms_by_partial_number("a1")] == [second]
+
+    repo.edit_room(first, "201", 3, 120.0)
+    assert repo.get_room_by_number("201").db_id == first
+    with pytest.raises(ElementNotFoundError):
+        repo.get_room_by_number("101")
+    assert [room.db_id for room in repo.get_rooms_by_partial_number("20")] == [first]
+
+    repo.remove_element(second, "room", floor_id)
+    assert repo.get_rooms_by_partial_number("102") == []
+    with pytest.raises(ElementNotFoundError):
+        repo.get_room_by_number("A102")
+
+def test_changes_are_published_on_the_events_bus(repo):
+    from src.utilities.change_events import EntityAdded, EntityUpdated, EntityRemoved, FLOOR, ELEMENT
+    floor_events, element_events, all_events = [], [], []
+    repo.events.subscribe(floor_events.append, FLOOR)
+    repo.events.subscribe(element_events.append, ELEMENT)
+    repo.events.subscribe(all_events.append)
+    floor_id = repo.add_floor(Floor(db_id=None, name="First", level=1))
+    room_id = repo.add_element(Room(db_id=None, type="room", floor_id=floor_id, position=(0, 0),
+                                    number="101", capacity=2, price_per_night=100.0))
+    hallway_id = repo.add_element(FloorElement(db_id=None, type="hallway", floor_id=floor_id, position=(1, 0)))
+    repo.edit_room(room_id, "101", 2, 120.0)
+    repo.rename_floor("First", "Second")
+    repo.remove_floor(floor_id)
+
+    assert [(type(event), event.entity_id) for event in floor_events] == [
+        (EntityAdded, floor_id), (EntityUpdated, floor_id), (EntityRemoved, floor_id)]
+    assert [(type(event), event.entity_id) for event in element_events] == [
+        (EntityAdded, room_id), (EntityAdded, hallway_id), (EntityUpdated, room_id),
+        (EntityRemoved, room_id), (EntityRemoved, hallway_id)]
+    assert element_events[2].previous.price_per_night == 100.0
+    assert element_events[2].entity.price_per_night == 120.0
+    assert len(all_events) == len(floor_events) + len(element_events)
+    assert all_events[-1] == floor_events[-1]
@@ -0,0 +1,36 @@
+from datetime import date
+
+from src.model.repository.interval_index import IntervalIndex
+
+
+def test_empty_key_is_free():
+    index = IntervalIndex()
+    assert index.is_free(1, date(2024, 7, 1), date(2024, 7, 5))
+    assert index.overlapping(1, date(2024, 7, 1), date(2024, 7, 5)) == []
+
+def test_overlap_is_inclusive():
+    index = IntervalIndex()
+    index.add(1, date(2024, 7, 1), date(2024, 7, 5), "res1")
+    assert not index.is_free(1, date(2024, 7, 5), date(2024, 7, 8))
+    assert not index.is_free(1, date(2024, 6, 28), date(2024, 7, 1))
+    assert index.is_free(1, date(2024, 7, 6), date(2024, 7, 8))
+    assert index.is_free(1, date(2024, 6, 20), date(2024, 6, 30))
+    assert index.is_free(2, date(2024, 7, 1), date(2024, 7, 5))
+
+def test_overlapping_finds_long_stays():
+    index = IntervalIndex()
+    index.add(1, date(2024, 1, 1), date(2024, 12, 31), "long")
+    index.add(1, date(2024, 7, 1), date(2024, 7, 3), "short")
+    index.add(1, date(2024, 8, 1), date(2024, 8, 3), "later")
+    assert index.overlapping(1, date(2024, 7, 2), date(2024, 7, 10)) == ["long", "short"]
+    assert index.count_overlapping(1, date(2024, 7, 2), date(2024, 7, 10)) == 2
+
+def test_remove():
+    index = IntervalIndex()
+    index.add(1, date(2024, 7, 1), date(2024, 7, 5), "res1")
+    index.add(1, date(2024, 7, 1), date(2024, 7, 2), "res2")
+    index.remove(1, date(2024, 7, 1), date(2024, 7, 5), "res1")
+    assert index.overlapping(1, date(2024, 7, 1), date(2024, 7, 10)) == ["res2"]
+    index.remove(1, date(2024, 7, 1), date(2024, 7, 2), "res2")
+    assert 1 not in index
+    assert index.is_free(1, date(2024, 7, 1), date(2024, 7, 10))
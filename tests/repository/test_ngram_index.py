@@ -0,0 +1,37 @@
+import random
+
+from src.model.repository.ngram_index import NgramIndex
+
+
+def test_search_short_and_long_queries():
+    index = NgramIndex()
+    index.add(1, "101")
+    index.add(2, "102")
+    index.add(3, "A1012")
+    assert index.search("1") == {1, 2, 3}
+    assert index.search("01") == {1, 3}
+    assert index.search("a") == {3}
+    assert index.search("1012") == {3}
+    assert index.search("a10") == {3}
+    assert index.search("999") == set()
+    assert index.search("") == {1, 2, 3}
+
+def test_add_replaces_and_remove_cleans_up():
+    index = NgramIndex()
+    index.add(1, "101")
+    index.add(1, "205")
+    assert index.search("101") == set()
+    assert index.search("205") == {1}
+    index.remove(1)
+    index.remove(1)
+    assert len(index) == 0
+    assert index.search("2") == set()
+
+def test_matches_a_substring_scan():
+    rng = random.Random(3)
+    texts = {key: "".join(rng.choice("0123ab") for _ in range(rng.randrange(1, 8))) for key in range(500)}
+    index = NgramIndex()
+    for key, text in texts.items():
+        index.add(key, text)
+    for query in ["0", "1a", "b12", "a0b1", "0123", "33b"]:
+        assert index.search(query) == {key for key, text in texts.items() if query.casefold() in text.casefold()}
@@ -0,0 +1,58 @@
+from datetime import date, timedelta
+
+from src.model.repository.occupancy_matrix import OccupancyMatrix
+
+
+def test_checkout_day_is_not_occupied():
+    matrix = OccupancyMatrix()
+    matrix.add(1, date(2024, 7, 1), date(2024, 7, 4))
+    assert matrix.occupied_room_ids(date(2024, 7, 1)) == {1}
+    assert matrix.occupied_room_ids(date(2024, 7, 3)) == {1}
+    assert matrix.occupied_room_ids(date(2024, 7, 4)) == set()
+    assert matrix.occupied_room_ids(date(2024, 6, 30)) == set()
+
+def test_remove_keeps_overlapping_stays():
+    matrix = OccupancyMatrix()
+    matrix.add(1, date(2024, 7, 1), date(2024, 7, 4))
+    matrix.add(1, date(2024, 7, 3), date(2024, 7, 6))
+    matrix.remove(1, date(2024, 7, 1), date(2024, 7, 4))
+    assert not matrix.is_occupied(1, date(2024, 7, 2))
+    assert matrix.is_occupied(1, date(2024, 7, 3))
+
+def test_grows_in_both_directions():
+    matrix = OccupancyMatrix()
+    start = date(2024, 1, 1)
+    matrix.add(1, start, start + timedelta(days=2))
+    matrix.add(2, start - timedelta(days=1000), start - timedelta(days=998))
+    matrix.add(3, start + timedelta(days=2000), start + timedelta(days=2001))
+    for room_id in range(4, 40):
+        matrix.add(room_id, start, start + timedelta(days=1))
+    assert matrix.occupied_room_ids(start - timedelta(days=999)) == {2}
+    assert matrix.occupied_room_ids(start + timedelta(days=2000)) == {3}
+    assert matrix.occupied_room_ids(start) == {1} | set(range(4, 40))
+    assert matrix.shape[0] == 39
+
+def test_remove_outside_the_matrix_or_never_added_does_not_underflow():
+    matrix = OccupancyMatrix()
+    matrix.add(1, date(2024, 7, 1), date(2024, 7, 4))
+    matrix.remove(1, date(2024, 6, 1), date(2024, 6, 5))
+    matrix.remove(1, date(2024, 6, 28), date(2024, 7, 2))
+    matrix.remove(1, date(2024, 7, 10), date(2024, 7, 12))
+    assert not matrix.is_occupied(1, date(2024, 7, 1))
+    assert matrix.is_occupied(1, date(2024, 7, 2))
+    assert matrix.occupied_room_ids(date(2024, 7, 10)) == set()
+    assert matrix.occupied_room_ids(date(2024, 6, 2)) == set()
+
+def test_span_is_capped_and_dropped_nights_are_not_covered():
+    matrix = OccupancyMatrix(max_days=1000)
+    start = date(2024, 1, 1)
+    matrix.add(1, start, start + timedelta(days=2))
+    matrix.add(2, start + timedelta(days=900), start + timedelta(days=1100))
+    matrix.add(3, date(9999, 1, 1), date(9999, 1, 3))
+    assert matrix.shape[1] == 1000
+    assert matrix.occupied_room_ids(start) == {1}
+    assert matrix.occupied_room_ids(start + timedelta(days=999)) == {2}
+    assert matrix.covers(start + timedelta(days=999))
+    assert not matrix.covers(start + timedelta(days=1050))
+    assert not matrix.covers(date(9999, 1, 2))
+    assert matrix.covers(start - timedelta(days=10))
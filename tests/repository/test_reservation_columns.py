@@ -0,0 +1,46 @@
+import random
+
+from src.model.repository.reservation_columns import ReservationColumns
+
+
+def test_queries_follow_the_overlap_rules():
+    columns = ReservationColumns()
+    columns.add("a", 1, 10, 14)
+    columns.add("b", 1, 14, 16)
+    columns.add("c", 2, 12, 20)
+    assert columns.active_on(14) == ["b", "c"]
+    assert sorted(columns.overlapping(14, 14)) == ["a", "b", "c"]
+    assert columns.overlapping(14, 15, room_id=1) == ["a", "b"]
+    assert columns.count_by_room() == {1: 2, 2: 1}
+    assert columns.room_nights(12, 15) == 2 + 1 + 3
+    assert columns.room_nights(12, 15, room_id=2) == 3
+    assert columns.room_nights_by_room(0, 100) == {1: 6, 2: 8}
+
+def test_remove_keeps_rows_dense():
+    columns = ReservationColumns()
+    for i in range(5):
+        columns.add(f"r{i}", i, 10 + i, 12 + i)
+    columns.remove("r1")
+    columns.remove("missing")
+    assert len(columns) == 4
+    assert "r1" not in columns
+    assert sorted(columns.overlapping(0, 100)) == ["r0", "r2", "r3", "r4"]
+    columns.remove("r4")
+    assert columns.count_by_room() == {0: 1, 2: 1, 3: 1}
+
+def test_matches_a_brute_force_scan():
+    rng = random.Random(7)
+    columns = ReservationColumns()
+    stays = {}
+    for i in range(3000):
+        check_in = rng.randrange(0, 400)
+        stays[f"r{i}"] = (rng.randrange(20), check_in, check_in + rng.randrange(1, 15))
+        columns.add(f"r{i}", *stays[f"r{i}"])
+    for reservation_id in rng.sample(sorted(stays), 1000):
+        columns.remove(reservation_id)
+        del stays[reservation_id]
+
+    day = 200
+    assert sorted(columns.active_on(day)) == sorted(r for r, (_, ci, co) in stays.items() if ci <= day < co)
+    expected = sum(max(0, min(co, 250) - max(ci, 150)) for _, ci, co in stays.values())
+    assert columns.room_nights(150, 250) == expected
@@ -4,7 +4,8 @@ from datetime import date
 
 from src.model.repository.reservation_repository import ReservationRepository
 from src.model.domain.reservation import Reservation
-from src.utilities.exceptions import ReservationAlreadyExistsError, ReservationNotFoundError
+from src.utilities.exceptions import (ReservationAlreadyExistsError, ReservationNotFoundError,
+                                      ReservationConflictError)
 
 
 @pytest.fixture
@@ -75,3 +76,180 @@ def test_get_all_reservations(repo):
     assert len(all_res) == 2
     ids = {r.reservation_id for r in all_res}
     assert ids == {"res1", "res2"}
+
+def test_is_room_free(repo):
+    repo.add_reservation(make_reservation("res1", 101, "Alice"))
+    assert not repo.is_room_free(101, date(2024, 7, 4), date(2024, 7, 8))
+    assert repo.is_room_free(101, date(2024, 7, 6), date(2024, 7, 8))
+    assert repo.is_room_free(102, date(2024, 7, 1), date(2024, 7, 5))
+    assert repo.is_room_free(101, date(2024, 7, 2), date(2024, 7, 3), exclude_reservation_id="res1")
+
+def test_overlapping_reservations_follow_updates(repo):
+    repo.add_reservation(make_reservation("res1", 101, "Alice"))
+    repo.update_reservation("res1", check_in_date=date(2024, 8, 1), check_out_date=date(2024, 8, 3))
+    assert repo.get_overlapping_reservations(101, date(2024, 7, 1), date(2024, 7, 5)) == []
+    overlapping = repo.get_overlapping_reservations(101, date(2024, 8, 2), date(2024, 8, 9))
+    assert [r.reservation_id for r in overlapping] == ["res1"]
+    repo.delete_reservation("res1")
+    assert repo.is_room_free(101, date(2024, 8, 1), date(2024, 8, 3))
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_updates_move_only_changed_index_entries(in_memory_db, columnar):
+    repo = ReservationRepository(in_memory_db, columnar=columnar)
+    for res_id in ["res1", "res2", "res3"]:
+        repo.add_reservation(make_reservation(res_id, int(res_id[-1]) + 100, "Alice"))
+    repo.update_reservation("res2", number_of_guests=3)
+    assert [r.reservation_id for r in repo.get_reservations_by_guest_name("Alice")] == ["res1", "res2", "res3"]
+
+    repo.update_reservation("res1", guest_name="Bob", room_id=102, check_in_date=date(2024, 7, 5),
+                            check_out_date=date(2024, 7, 7))
+    assert [r.reservation_id for r in repo.get_reservations_by_guest_name("Alice")] == ["res2", "res3"]
+    assert [r.reservation_id for r in repo.get_reservations_by_room_id(102)] == ["res2", "res1"]
+    assert repo.get_reservations_by_room_id(101) == []
+    assert [r.reservation_id for r in repo.search_reservations("bob")] == ["res1"]
+    assert repo.get_occupied_room_ids(date(2024, 7, 1)) == {102, 103}
+    assert repo.count_room_nights(date(2024, 7, 1), date(2024, 7, 31), room_id=102) == 4 + 2
+    assert not repo.is_room_free(102, date(2024, 7, 6), date(2024, 7, 6))
+
+def test_get_occupied_room_ids(repo):
+    repo.add_reservation(make_reservation("res1", 101, "Alice"))
+    repo.add_reservation(make_reservation("res2", 102, "Bob"))
+    assert repo.get_occupied_room_ids(date(2024, 7, 2)) == {101, 102}
+    repo.delete_reservation("res2")
+    assert repo.get_occupied_room_ids(date(2024, 7, 2)) == {101}
+    assert repo.get_occupied_room_ids(date(2024, 7, 5)) == set()
+
+def make_stay(res_id, room_id, check_in, check_out):
+    return Reservation(reservation_id=res_id, room_id=room_id, guest_name="Guest", number_of_guests=1,
+                       check_in_date=check_in, check_out_date=check_out)
+
+def test_add_reservations_bulk(repo, in_memory_db):
+    repo.add_reservations_bulk([
+        make_stay("b1", 101, date(2024, 7, 1), date(2024, 7, 3)),
+        make_stay("b2", 101, date(2024, 7, 4), date(2024, 7, 6)),
+        make_stay("b3", 102, date(2024, 7, 1), date(2024, 7, 6)),
+    ])
+    assert [r.reservation_id for r in repo.get_reservations_by_room_id(101)] == ["b1", "b2"]
+    assert repo.get_by_reservation_id("b3").db_id is not None
+    assert len(ReservationRepository(in_memory_db).get_all_reservations()) == 3
+
+def test_add_reservations_bulk_rejects_conflicts(repo):
+    repo.add_reservation(make_reservation("res1", 101, "Alice"))
+    with pytest.raises(ReservationConflictError):
+        repo.add_reservations_bulk([
+            make_stay("b1", 102, date(2024, 7, 1), date(2024, 7, 3)),
+            make_stay("b2", 101, date(2024, 7, 5), date(2024, 7, 6)),
+        ])
+    with pytest.raises(ReservationConflictError):
+        repo.add_reservations_bulk([
+            make_stay("b1", 102, date(2024, 7, 1), date(2024, 7, 3)),
+            make_stay("b2", 102, date(2024, 7, 2), date(2024, 7, 6)),
+        ])
+    with pytest.raises(ReservationAlreadyExistsError):
+        repo.add_reservations_bulk([make_stay("res1", 103, date(2024, 7, 1), date(2024, 7, 3))])
+    assert repo.get_by_reservation_id("b1") is None
+    assert len(repo.get_all_reservations()) == 1
+
+@pytest.fixture
+def windowed_db(in_memory_db):
+    seed = ReservationRepository(in_memory_db)
+    seed.add_reservations_bulk([
+        make_stay("old", 101, date(2020, 3, 1), date(2020, 3, 4)),
+        make_stay("now", 101, date(2024, 7, 1), date(2024, 7, 5)),
+        make_stay("far", 102, date(2026, 1, 1), date(2026, 1, 3)),
+    ])
+    return in_memory_db
+
+def test_windowed_repository_loads_only_the_horizon(windowed_db):
+    repo = ReservationRepository(windowed_db, horizon_days=30, today=date(2024, 7, 10))
+    assert repo.window == (date(2024, 6, 10), date(2024, 8, 9))
+    assert repo.get_by_reservation_id("old").check_in_date == date(2020, 3, 1)
+    assert repo.get_by_reservation_id("old") is repo.get_by_reservation_id("old")
+    assert repo.get_by_reservation_id("missing") is None
+    assert [r.reservation_id for r in repo.get_reservations_by_room_id(101)] == ["old", "now"]
+    assert len(repo.get_reservations_by_guest_name("Guest")) == 3
+    assert sorted(r.reservation_id for r in repo.get_all_reservations()) == ["far", "now", "old"]
+
+def test_windowed_repository_checks_cold_ranges_in_the_database(windowed_db):
+    repo = ReservationRepository(windowed_db, horizon_days=30, today=date(2024, 7, 10))
+    assert not repo.is_room_free(101, date(2020, 3, 2), date(2020, 3, 6))
+    assert repo.is_room_free(101, date(2020, 3, 2), date(2020, 3, 6), exclude_reservation_id="old")
+    assert repo.get_occupied_room_ids(date(2026, 1, 1)) == {102}
+    assert repo.get_occupied_room_ids(date(2024, 7, 2)) == {101}
+    assert [r.reservation_id for r in repo.get_overlapping_reservations(101, date(2020, 1, 1), date(2024, 7, 2))] \
+        == ["old", "now"]
+
+def test_windowed_repository_mutations_outside_the_horizon(windowed_db):
+    repo = ReservationRepository(windowed_db, horizon_days=30, today=date(2024, 7, 10))
+    assert len(repo.get_reservations_by_room_id(103)) == 0
+    repo.add_reservation(make_stay("cold", 103, date(2019, 1, 1), date(2019, 1, 2)))
+    assert [r.reservation_id for r in repo.get_reservations_by_room_id(103)] == ["cold"]
+    with pytest.raises(ReservationAlreadyExistsError):
+        repo.add_reservation(make_stay("old", 104, date(2024, 7, 1), date(2024, 7, 2)))
+
+    repo.update_reservation("old", check_in_date=date(2024, 7, 20), check_out_date=date(2024, 7, 22))
+    assert repo.get_occupied_room_ids(date(2024, 7, 21)) == {101}
+    assert [r.reservation_id for r in repo.get_reservations_by_room_id(101)] == ["now", "old"]
+
+    repo.delete_reservation("far")
+    assert repo.get_by_reservation_id("far") is None
+    assert repo.get_occupied_room_ids(date(2026, 1, 1)) == set()
+
+def test_search_reservations(windowed_db):
+    repo = ReservationRepository(windowed_db)
+    repo.add_reservation(make_stay("Guest-1", 103, date(2024, 8, 1), date(2024, 8, 2)))
+    assert [r.reservation_id for r in repo.search_reservations("guest")] == ["Guest-1", "far", "now", "old"]
+    assert [r.reservation_id for r in repo.search_reservations("O", limit=2)] == ["old", "now"]
+    repo.delete_reservation("Guest-1")
+    assert [r.reservation_id for r in repo.get_reservations_by_partial_guest_name("UES")] == ["far", "now", "old"]
+
+def test_windowed_repository_searches_cold_reservations(windowed_db):
+    repo = ReservationRepository(windowed_db, horizon_days=30, today=date(2024, 7, 10))
+    assert [r.reservation_id for r in repo.search_reservations("o")] == ["old", "now"]
+    assert [r.reservation_id for r in repo.search_reservations("guest", limit=2)] == ["far", "now"]
+    assert sorted(r.reservation_id for r in repo.get_reservations_by_partial_guest_name("uest")) \
+        == ["far", "now", "old"]
+
+@pytest.mark.parametrize("options", [{}, {"columnar": True},
+                                     {"columnar": True, "horizon_days": 30, "today": date(2024, 7, 10)}])
+def test_analytics_getters(windowed_db, options):
+    repo = ReservationRepository(windowed_db, **options)
+    assert [r.reservation_id for r in repo.get_reservations_active_on(date(2024, 7, 4))] == ["now"]
+    assert repo.get_reservations_active_on(date(2024, 7, 5)) == []
+    assert sorted(r.reservation_id for r in repo.get_reservations_in_range(date(2020, 3, 4), date(2024, 7, 1))) \
+        == ["now", "old"]
+    assert repo.count_reservations_by_room() == {101: 2, 102: 1}
+    assert repo.count_room_nights(date(2024, 7, 3), date(2024, 8, 1)) == 2
+    assert repo.count_room_nights(date(2020, 1, 1), date(2027, 1, 1)) == 3 + 4 + 2
+    assert repo.count_room_nights(date(2020, 1, 1), date(2027, 1, 1), room_id=102) == 2
+    assert repo.count_room_nights_by_room(date(2020, 1, 1), date(2027, 1, 1)) == {101: 7, 102: 2}
+
+def test_columnar_analytics_follow_updates(in_memory_db):
+    repo = ReservationRepository(in_memory_db, columnar=True)
+    repo.add_reservation(make_reservation("res1", 101, "Alice"))
+    repo.add_reservation(make_reservation("res2", 102, "Bob"))
+    repo.update_reservation("res1", check_in_date=date(2024, 7, 3))
+    repo.delete_reservation("res2")
+    assert repo.count_room_nights(date(2024, 7, 1), date(2024, 7, 31)) == 2
+    assert repo.count_reservations_by_room() == {101: 1}
+
+def test_changes_are_published_on_the_events_bus(repo):
+    from src.utilities.change_events import EntityAdded, EntityUpdated, EntityRemoved, EntitiesReloaded
+    events = []
+    repo.events.subscribe(events.append)
+    repo.add_reservation(make_reservation("res1", 101, "Alice"))
+    repo.update_reservation("res1", number_of_guests=3)
+    repo.delete_reservation("res1")
+    repo.reload()
+
+    assert [type(event) for event in events] == [EntityAdded, EntityUpdated, EntityRemoved, EntitiesReloaded]
+    assert events[1].previous.number_of_guests == 2 and events[1].entity.number_of_guests == 3
+    assert events[2].entity_id == "res1"
+
+def test_occupied_rooms_beyond_the_occupancy_matrix_come_from_the_database(repo):
+    repo.add_reservation(make_reservation("res1", 101, "Alice"))
+    far = make_reservation("res2", 102, "Bob")
+    far.check_in_date, far.check_out_date = date(2090, 1, 1), date(2090, 1, 3)
+    repo.add_reservation(far)
+    assert repo.get_occupied_room_ids(date(2024, 7, 2)) == {101}
+    assert repo.get_occupied_room_ids(date(2090, 1, 2)) == {102}
@@ -0,0 +1,40 @@
+import random
+
+from src.model.repository.reservation_search_index import ReservationSearchIndex
+
+
+def test_search_ranks_exact_prefix_and_substring_matches():
+    index = ReservationSearchIndex()
+    index.add("RES-010", "Ann Lee")
+    index.add("RES-100", "Bob")
+    index.add("ANN-001", "Carol")
+    index.add("RES-011", "Joanna")
+    assert index.search("res-010") == ["RES-010"]
+    assert index.search("ann") == ["ANN-001", "RES-010", "RES-011"]
+    assert index.search("lee") == ["RES-010"]
+    assert index.search("01") == ["ANN-001", "RES-010", "RES-011"]
+    assert index.search("ann", limit=2) == ["ANN-001", "RES-010"]
+    assert index.search("zzz") == []
+
+def test_remove_keeps_shared_guest_names():
+    index = ReservationSearchIndex()
+    index.add("R1", "Alice")
+    index.add("R2", "alice")
+    index.remove("R1", "Alice")
+    assert index.match_guest_name("ALI") == {"R2"}
+    index.remove("R2", "alice")
+    index.remove("R2", "alice")
+    assert index.match_guest_name("ali") == set()
+    assert len(index) == 0
+
+def test_matches_a_substring_scan():
+    rng = random.Random(5)
+    reservations = {f"R{number:04d}": rng.choice(["Ann", "Bo Ng", "Anna", "Nils"]) for number in range(300)}
+    index = ReservationSearchIndex()
+    for reservation_id, guest_name in reservations.items():
+        index.add(reservation_id, guest_name)
+    for query in ["r", "01", "r02", "0042", "nn", "NG", "s"]:
+        expected = sorted((ReservationSearchIndex.rank(query, reservation_id, guest_name), reservation_id)
+                          for reservation_id, guest_name in reservations.items()
+                          if query.casefold() in reservation_id.casefold() + "\n" + guest_name.casefold())
+        assert index.search(query) == [reservation_id for _, reservation_id in expected]
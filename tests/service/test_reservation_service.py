@@ -75,3 +75,25 @@ def test_parse_iso_date_valid(service):
 def test_parse_iso_date_invalid(service):
     with pytest.raises(ValueError):
         service._parse_iso_date("invalid-date")
+    for value in ("2024-6-1", "20240601", "2024-W22-6", "2024-02-30"):
+        with pytest.raises(ValueError):
+            service._parse_iso_date(value)
+
+def test_add_reservations_bulk(service, mock_repository):
+    reservation_ids = service.add_reservations_bulk([
+        dict(room_id=1, guest_name="Bob", number_of_guests=2, check_in_date="2024-06-01", check_out_date="2024-06-05"),
+        dict(room_id=2, guest_name="Ann", number_of_guests=1, check_in_date="2024-06-01", check_out_date="2024-06-02",
+             reservation_id="R-FIXED"),
+    ])
+    assert reservation_ids[0].startswith("R001")
+    assert reservation_ids[1] == "R-FIXED"
+    reservations = mock_repository.add_reservations_bulk.call_args.args[0]
+    assert [r.room_id for r in reservations] == [1, 2]
+
+def test_add_reservations_bulk_validates_whole_batch(service, mock_repository):
+    with pytest.raises(ValidationError):
+        service.add_reservations_bulk([
+            dict(room_id=1, guest_name="Bob", number_of_guests=2, check_in_date="2024-06-01", check_out_date="2024-06-05"),
+            dict(room_id=1, guest_name="", number_of_guests=2, check_in_date="2024-06-01", check_out_date="2024-06-05"),
+        ])
+    mock_repository.add_reservations_bulk.assert_not_called()
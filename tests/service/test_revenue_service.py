@@ -0,0 +1,176 @@
+import random
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from src.model.database.database_operations import create_hotel_simulator_model
+from src.model.domain.reservation import Reservation
+from src.model.repository.hotel_repository import HotelRepository
+from src.model.repository.reservation_repository import ReservationRepository
+from src.model.service.hotel_service import HotelService
+from src.model.service.reservation_service import ReservationService
+from src.model.service.revenue_service import RevenueService
+
+
+@pytest.fixture
+def repositories():
+    connection = sqlite3.connect(":memory:")
+    create_hotel_simulator_model(connection)
+    yield ReservationRepository(connection), HotelRepository(connection, graph_backend="adjacency")
+    connection.close()
+
+@pytest.fixture
+def services(repositories):
+    reservation_repository, hotel_repository = repositories
+    return (ReservationService(reservation_repository), HotelService(hotel_repository),
+            RevenueService(reservation_repository, hotel_repository))
+
+def brute_force(reservation_repository, hotel_repository):
+    """Totals in cents computed from scratch, night by night."""
+    total, by_room, by_floor, by_month = 0, {}, {}, {}
+    for reservation in reservation_repository.get_all_reservations():
+        room = hotel_repository.get_room_by_id(reservation.room_id)
+        if room is None:
+            continue
+        price = round(room.price_per_night * 100)
+        day = reservation.check_in_date
+        while day < reservation.check_out_date:
+            total += price
+            by_room[room.db_id] = by_room.get(room.db_id, 0) + price
+            by_floor[room.floor_id] = by_floor.get(room.floor_id, 0) + price
+            by_month[(day.year, day.month)] = by_month.get((day.year, day.month), 0) + price
+            day += timedelta(days=1)
+    return total, by_room, by_floor, by_month
+
+def assert_matches(revenue, reservation_repository, hotel_repository):
+    total, by_room, by_floor, by_month = brute_force(reservation_repository, hotel_repository)
+    assert revenue.get_total_income() == total / 100
+    for room in hotel_repository.get_all_rooms():
+        assert revenue.get_room_income(room.db_id) == by_room.get(room.db_id, 0) / 100
+    for floor in hotel_repository.get_all_floors():
+        assert revenue.get_floor_income(floor.db_id) == by_floor.get(floor.db_id, 0) / 100
+    assert revenue.get_income_by_month() == {month: income / 100 for month, income in by_month.items() if income}
+
+def test_initial_totals_are_loaded_from_the_repositories(repositories):
+    reservation_repository, hotel_repository = repositories
+    hotel_service = HotelService(hotel_repository)
+    floor_id = hotel_service.add_floor("Ground", 0)
+    room_id = hotel_service.add_element("room", floor_id, (0, 0), "001", 2, 100.0)
+    ReservationService(reservation_repository).make_reservation(room_id, "Alice", 2, "2024-01-30", "2024-02-02")
+
+    revenue = RevenueService(reservation_repository, hotel_repository)
+    assert revenue.get_total_income() == 300.0
+    assert revenue.get_floor_income(floor_id) == 300.0
+    assert revenue.get_income_by_month() == {(2024, 1): 200.0, (2024, 2): 100.0}
+
+def test_reservation_changes_update_the_totals(services):
+    reservation_service, hotel_service, revenue = services
+    floor_id = hotel_service.add_floor("Ground", 0)
+    room_id = hotel_service.add_element("room", floor_id, (0, 0), "001", 2, 100.0)
+    other_id = hotel_service.add_element("room", floor_id, (1, 0), "002", 2, 50.0)
+
+    reservation_id = reservation_service.make_reservation(room_id, "Alice", 2, "2024-06-01", "2024-06-04")
+    assert revenue.get_total_income() == 300.0
+    assert revenue.get_room_income(room_id) == 300.0
+
+    reservation_service.update_reservation(reservation_id, other_id, "Alice", 2, "2024-06-01", "2024-06-03")
+    assert revenue.get_room_income(room_id) == 0
+    assert revenue.get_room_income(other_id) == 100.0
+    assert revenue.get_monthly_income(2024, 6) == 100.0
+
+    reservation_service.delete_reservation(reservation_id)
+    assert revenue.get_total_income() == 0
+    assert revenue.get_income_by_month() == {}
+
+def test_room_changes_move_only_that_room_income(services):
+    reservation_service, hotel_service, revenue = services
+    floor_id = hotel_service.add_floor("Ground", 0)
+    room_id = hotel_service.add_element("room", floor_id, (0, 0), "001", 2, 100.0)
+    other_id = hotel_service.add_element("room", floor_id, (1, 0), "002", 2, 50.0)
+    reservation_service.make_reservation(room_id, "Alice", 2, "2024-06-29", "2024-07-02")
+    reservation_service.make_reservation(other_id, "Bob", 2, "2024-06-01", "2024-06-02")
+
+    hotel_service.edit_room(room_id, "001", 2, 120.0)
+    assert revenue.get_total_income() == 410.0
+    assert revenue.get_income_by_month() == {(2024, 6): 290.0, (2024, 7): 120.0}
+
+    hotel_service.remove_element(room_id, "room", floor_id)
+    assert revenue.get_total_income() == 50.0
+    assert revenue.get_floor_income(floor_id) == 50.0
+
+def test_income_between_counts_nights_inside_the_range(services):
+    reservation_service, hotel_service, revenue = services
+    floor_id = hotel_service.add_floor("Ground", 0)
+    room_id = hotel_service.add_element("room", floor_id, (0, 0), "001", 2, 100.0)
+    reservation_service.make_reservation(room_id, "Alice", 2, "2024-06-01", "2024-06-05")
+
+    assert revenue.get_income_between(date(2024, 6, 2), date(2024, 6, 4)) == 200.0
+    assert revenue.get_income_between(date(2024, 6, 5), date(2024, 6, 10)) == 0
+
+def test_rolled_back_changes_are_resynchronized(services):
+    reservation_service, hotel_service, revenue = services
+    floor_id = hotel_service.add_floor("Ground", 0)
+    room_id = hotel_service.add_element("room", floor_id, (0, 0), "001", 2, 100.0)
+
+    with pytest.raises(RuntimeError):
+        with reservation_service.transaction():
+            reservation_service.make_reservation(room_id, "Alice", 2, "2024-06-01", "2024-06-05")
+            raise RuntimeError
+    assert revenue.get_total_income() == 0
+
+def test_random_changes_match_a_brute_force_computation(services, repositories):
+    reservation_service, hotel_service, revenue = services
+    reservation_repository, hotel_repository = repositories
+    rng = random.Random(7)
+    floor_ids = [hotel_service.add_floor(f"Floor {level}", level) for level in range(3)]
+    room_ids = [hotel_service.add_element("room", floor_ids[i % 3], (i, 0), f"{i:03}", 4, float(rng.randint(50, 200)))
+                for i in range(9)]
+    reservation_ids = []
+    start = date(2024, 1, 1)
+
+    for step in range(300):
+        action = rng.random()
+        if action < 0.5 or not reservation_ids:
+            check_in = start + timedelta(days=rng.randint(0, 400))
+            check_out = check_in + timedelta(days=rng.randint(1, 45))
+            room_id = rng.choice(room_ids)
+            if reservation_repository.is_room_free(room_id, check_in, check_out):
+                reservation_repository.add_reservation(Reservation(
+                    reservation_id=f"R{step}", room_id=room_id, guest_name="Guest", number_of_guests=1,
+                    check_in_date=check_in, check_out_date=check_out))
+                reservation_ids.append(f"R{step}")
+        elif action < 0.7:
+            reservation_id = reservation_ids.pop(rng.randrange(len(reservation_ids)))
+            reservation_repository.delete_reservation(reservation_id)
+        elif action < 0.85:
+            reservation = reservation_repository.get_by_reservation_id(rng.choice(reservation_ids))
+            check_out = reservation.check_in_date + timedelta(days=rng.randint(1, 10))
+            if reservation_repository.is_room_free(reservation.room_id, reservation.check_in_date, check_out,
+                                                   reservation.reservation_id):
+                reservation_repository.update_reservation(reservation.reservation_id, check_out_date=check_out)
+        else:
+            room = hotel_repository.get_room_by_id(rng.choice(room_ids))
+            hotel_repository.edit_room(room.db_id, room.number, room.capacity, rng.randint(5000, 20000) / 100)
+    assert_matches(revenue, reservation_repository, hotel_repository)
+
+def test_totals_return_exactly_to_zero(services, repositories):
+    reservation_service, hotel_service, revenue = services
+    reservation_repository, hotel_repository = repositories
+    rng = random.Random(3)
+    floor_id = hotel_service.add_floor("Ground", 0)
+    room_ids = [hotel_service.add_element("room", floor_id, (i, 0), f"{i:03}", 4, 10.1 * (i + 1)) for i in range(5)]
+    for step in range(300):
+        check_in = date(2024, 1, 1) + timedelta(days=rng.randint(0, 150))
+        reservation_repository.add_reservation(Reservation(
+            reservation_id=f"R{step}", room_id=rng.choice(room_ids), guest_name="Guest", number_of_guests=1,
+            check_in_date=check_in, check_out_date=check_in + timedelta(days=rng.randint(1, 20))))
+
+    for room_id in room_ids:
+        hotel_service.edit_room(room_id, hotel_repository.get_room_by_id(room_id).number, 4, 55.55)
+    assert_matches(revenue, reservation_repository, hotel_repository)
+    for step in range(300):
+        reservation_repository.delete_reservation(f"R{step}")
+    assert revenue.get_total_income() == 0
+    assert revenue.get_income_by_month() == {}
+    assert revenue.get_floor_income(floor_id) == 0
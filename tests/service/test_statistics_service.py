@@ -0,0 +1,98 @@
+import random
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from src.model.database.database_operations import create_hotel_simulator_model
+from src.model.domain.reservation import Reservation
+from src.model.repository.hotel_repository import HotelRepository
+from src.model.repository.reservation_repository import ReservationRepository
+from src.model.service.hotel_service import HotelService
+from src.model.service.reservation_service import ReservationService
+from src.model.service.statistics_service import StatisticsService
+
+
+@pytest.fixture
+def repositories():
+    connection = sqlite3.connect(":memory:")
+    create_hotel_simulator_model(connection)
+    yield ReservationRepository(connection), HotelRepository(connection, graph_backend="adjacency")
+    connection.close()
+
+@pytest.fixture
+def services(repositories):
+    reservation_repository, hotel_repository = repositories
+    return (ReservationService(reservation_repository), HotelService(hotel_repository),
+            StatisticsService(reservation_repository, hotel_repository))
+
+def test_counts_follow_the_repositories(services):
+    reservation_service, hotel_service, statistics = services
+    floor_id = hotel_service.add_floor("Ground", 0)
+    hotel_service.add_floor("First", 1)
+    room_id = hotel_service.add_element("room", floor_id, (0, 0), "001", 2, 100.0)
+    other_id = hotel_service.add_element("room", floor_id, (1, 0), "002", 2, 100.0)
+    hotel_service.add_element("hallway", floor_id, (2, 0))
+    assert (statistics.get_floor_count(), statistics.get_room_count()) == (2, 2)
+
+    reservation_id = reservation_service.make_reservation(room_id, "Alice", 2, "2024-06-01", "2024-06-03")
+    reservation_service.make_reservation(other_id, "Bob", 2, "2024-06-02", "2024-06-03")
+    assert statistics.get_reservation_count() == 2
+    assert statistics.get_arrivals(date(2024, 6, 2)) == 1
+    assert statistics.get_departures(date(2024, 6, 3)) == 2
+    assert statistics.get_occupancy_rate(date(2024, 6, 2)) == 1.0
+    assert statistics.get_occupancy_rate(date(2024, 6, 3)) == 0.0
+
+    reservation_service.update_reservation(reservation_id, room_id, "Alice", 2, "2024-06-05", "2024-06-06")
+    assert statistics.get_occupied_rooms(date(2024, 6, 1)) == 0
+    assert statistics.get_arrivals(date(2024, 6, 5)) == 1
+
+    hotel_service.remove_element(other_id, "room", floor_id)
+    assert statistics.get_room_count() == 1
+    reservation_service.delete_reservation(reservation_id)
+    assert statistics.get_reservation_count() == 1
+    assert statistics.get_arrivals(date(2024, 6, 5)) == 0
+
+def test_rolled_back_changes_are_recounted(services):
+    reservation_service, hotel_service, statistics = services
+    floor_id = hotel_service.add_floor("Ground", 0)
+    room_id = hotel_service.add_element("room", floor_id, (0, 0), "001", 2, 100.0)
+
+    with pytest.raises(RuntimeError):
+        with hotel_service.transaction():
+            hotel_service.add_element("room", floor_id, (1, 0), "002", 2, 100.0)
+            reservation_service.make_reservation(room_id, "Alice", 2, "2024-06-01", "2024-06-03")
+            raise RuntimeError
+    assert statistics.get_room_count() == 1
+    assert statistics.get_reservation_count() == 0
+    assert statistics.get_occupied_rooms(date(2024, 6, 1)) == 0
+
+def test_random_changes_match_a_recount(services, repositories):
+    reservation_service, hotel_service, statistics = services
+    reservation_repository, hotel_repository = repositories
+    rng = random.Random(11)
+    floor_id = hotel_service.add_floor("Ground", 0)
+    room_ids = [hotel_service.add_element("room", floor_id, (i, 0), f"{i:03}", 4, 100.0) for i in range(6)]
+    reservation_ids = []
+    start = date(2024, 1, 1)
+
+    for step in range(300):
+        if rng.random() < 0.6 or not reservation_ids:
+            check_in = start + timedelta(days=rng.randint(0, 90))
+            check_out = check_in + timedelta(days=rng.randint(1, 10))
+            room_id = rng.choice(room_ids)
+            if reservation_repository.is_room_free(room_id, check_in, check_out):
+                reservation_repository.add_reservation(Reservation(
+                    reservation_id=f"R{step}", room_id=room_id, guest_name="Guest", number_of_guests=1,
+                    check_in_date=check_in, check_out_date=check_out))
+                reservation_ids.append(f"R{step}")
+        else:
+            reservation_repository.delete_reservation(reservation_ids.pop(rng.randrange(len(reservation_ids))))
+
+    reservations = reservation_repository.get_all_reservations()
+    assert statistics.get_reservation_count() == len(reservations)
+    for offset in range(100):
+        day = start + timedelta(days=offset)
+        assert statistics.get_arrivals(day) == sum(r.check_in_date == day for r in reservations)
+        assert statistics.get_departures(day) == sum(r.check_out_date == day for r in reservations)
+        assert statistics.get_occupied_rooms(day) == len(reservation_repository.get_occupied_room_ids(day))